@@ -0,0 +1,153 @@
+import random
+
+
+__all__ = [
+    'KINDS',
+    'generate_document',
+    'generate_corpus'
+]
+
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore '
+    'et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip '
+    'ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla'
+).split()
+
+ENTITIES = ('&amp;', '&lt;', '&gt;', '&quot;', '&nbsp;', '&#8212;', '&#x2019;', '&copy;', '&hellip;')
+
+
+def _sentence(rand, words=12):
+    sentence = ' '.join(rand.choice(WORDS) for _ in range(rand.randint(words // 2, words * 2)))
+
+    return sentence.capitalize() + rand.choice('.,!?;:') + ' '
+
+
+def _paragraph(rand, sentences=5):
+    return ''.join(_sentence(rand) for _ in range(rand.randint(1, sentences * 2)))
+
+
+def _navigation(rand, links=30):
+    items = ''.join(
+        '<li><a href="/page/{0}">{1}</a></li>'.format(number, rand.choice(WORDS).title())
+        for number in range(links)
+    )
+
+    return '<div class="nav"><ul>{0}</ul></div>'.format(items)
+
+
+def _page(rand, title, body, head=''):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>{0}</title>{1}</head>'
+        '<body>{2}</body></html>'
+    ).format(title, head, body)
+
+
+def _deep_nesting(rand, size):
+    parts = []
+
+    while sum(map(len, parts)) < size:
+        depth = rand.randint(20, 60)
+        parts.append('<div class="level">' * depth)
+        parts.append('<span><b>{0}</b> {1}</span>'.format(rand.choice(WORDS), _sentence(rand)))
+        parts.append('</div>' * depth)
+
+    return _page(rand, 'Deep nesting', ''.join(parts))
+
+
+def _link_heavy(rand, size):
+    parts = []
+
+    while sum(map(len, parts)) < size:
+        parts.append(_navigation(rand, rand.randint(10, 60)))
+        parts.append('<p>{0}</p>'.format(_sentence(rand)))
+
+    return _page(rand, 'Link heavy navigation', ''.join(parts))
+
+
+def _long_article(rand, size):
+    parts = [_navigation(rand), '<div class="content"><h1>{0}</h1>'.format(_sentence(rand))]
+
+    while sum(map(len, parts)) < size:
+        if rand.random() < 0.1:
+            parts.append('<h2>{0}</h2>'.format(_sentence(rand)))
+
+        parts.append('<p>{0}<a href="#">{1}</a> {2}</p>'.format(
+            _paragraph(rand), rand.choice(WORDS), _paragraph(rand)
+        ))
+
+    parts.append('</div>')
+    parts.append(_navigation(rand))
+
+    return _page(rand, 'Long article', ''.join(parts))
+
+
+def _inline_script(rand, size):
+    script = []
+
+    while sum(map(len, script)) < size:
+        script.append('var item{0} = {{"name": "{1}", "html": "<div><p>{2}</p></div>"}};\n'.format(
+            len(script), rand.choice(WORDS), _sentence(rand)
+        ))
+
+    head = '<script>{0}</script><style>p {{ color: red; }}</style>'.format(''.join(script))
+    body = '<p>{0}</p><script type="application/ld+json">{{"@type": "Article"}}</script>'.format(_paragraph(rand))
+
+    return _page(rand, 'Inline script', body, head)
+
+
+def _entity_heavy(rand, size):
+    parts = []
+
+    while sum(map(len, parts)) < size:
+        words = (
+            rand.choice(ENTITIES) if rand.random() < 0.3 else rand.choice(WORDS)
+            for _ in range(rand.randint(20, 60))
+        )
+        parts.append('<p>{0}.</p>'.format(' '.join(words)))
+
+    return _page(rand, 'Entities &amp; references', ''.join(parts))
+
+
+KINDS = {
+    'deep_nesting': _deep_nesting,
+    'link_heavy': _link_heavy,
+    'long_article': _long_article,
+    'inline_script': _inline_script,
+    'entity_heavy': _entity_heavy
+}
+
+
+def generate_document(kind, size=50000, seed=0):
+    """Generates synthetic html document.
+
+    Args:
+        kind: Kind of document (key of KINDS).
+        size: Approximate size of document body in characters.
+        seed: Seed of random generator, the same seed gives the same document.
+
+    Returns:
+        Html document.
+    """
+    return KINDS[kind](random.Random('{0}:{1}:{2}'.format(kind, size, seed)), size)
+
+
+def generate_corpus(kinds=None, documents=10, size=50000, seed=0):
+    """Generates synthetic corpus of html documents.
+
+    Args:
+        kinds: Kinds of documents (all kinds by default).
+        documents: Number of documents of every kind.
+        size: Approximate size of document body in characters.
+        seed: Seed of random generator.
+
+    Returns:
+        Dictionary {kind: [document, ...]}.
+    """
+    if kinds is None:
+        kinds = sorted(KINDS)
+
+    return {
+        kind: [generate_document(kind, size, seed + number) for number in range(documents)]
+        for kind in kinds
+    }
@@ -0,0 +1,231 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+
+from concurrent import futures
+
+from html_to_text import parser
+
+from .corpus import KINDS, generate_corpus
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# parser_split and parser_weights are times of splitting and calculating weights inside Parser.feed
+# (from ParserStats of a parser which collects statistics)
+STAGES = (
+    'cleaner_feed', 'splitter_feed', 'parser_feed', 'parser_split', 'parser_weights', 'fast_parser_feed',
+    'regex_parser_feed'
+)
+
+PARSER_KWARGS = {
+    'tags_to_save': {'title', 'h1', 'h2'},
+    'tags_to_remove': {'head', 'script', 'style', 'pre', 'code'},
+    'punctuation': '.,!?:;',
+    'min_allowed_weight': 2.3
+}
+
+CLEANER_KWARGS = {
+    'remove_without_content': {'b', 's', 'span', 'i'},
+    'remove_with_content': {'script', 'style'}
+}
+
+
+def benchmark_documents(documents, repeat=3):
+    """Measures time of every stage of extraction for the documents.
+
+    Every stage is run 'repeat' times for every document, the best time is used.
+
+    Args:
+        documents: List of html documents.
+        repeat: Number of runs.
+
+    Returns:
+        Dictionary with results.
+    """
+    cleaner = parser.get_html_cleaner(**CLEANER_KWARGS)
+
+    splitter = parser.get_html_splitter(
+        tags_to_save=PARSER_KWARGS['tags_to_save'],
+        tags_to_remove=PARSER_KWARGS['tags_to_remove'],
+        tag_wrapper=parser.get_tag_wrapper(False, parser.Tag),
+        chunks_wrapper=parser.get_chunks_wrapper(parser.Chunk),
+        save_chunks_wrapper=parser.get_save_chunks_wrapper()
+    )
+
+    html_parser = parser.get_parser(**PARSER_KWARGS)
+    stats_parser = parser.get_parser(**PARSER_KWARGS, collect_stats=True)
+    fast_parser = parser.get_parser(**PARSER_KWARGS, fast=True)
+    regex_parser = parser.get_parser(**PARSER_KWARGS, fast=True, backend='regex')
+
+    def parser_split(document):
+        stats_parser.feed(document)
+
+        return stats_parser.stats.split_time
+
+    stages = {
+        'cleaner_feed': timed(cleaner.feed),
+        'splitter_feed': timed(splitter.feed),
+        'parser_feed': timed(html_parser.feed),
+        'parser_split': parser_split,
+        'parser_weights': lambda document: stats_parser.stats.weights_time,
+        'fast_parser_feed': timed(fast_parser.feed),
+        'regex_parser_feed': timed(regex_parser.feed)
+    }
+
+    times = dict.fromkeys(STAGES, 0.0)
+
+    for document in documents:
+        best = dict.fromkeys(STAGES, float('inf'))
+
+        for _ in range(repeat):
+            # stages of one run depend on each other: parser_weights is taken from statistics of parser_split
+            for stage in STAGES:
+                best[stage] = min(best[stage], stages[stage](document))
+
+        for stage in STAGES:
+            times[stage] += best[stage]
+
+    size = sum(len(document.encode('utf-8')) for document in documents)
+    total = times['parser_feed']
+
+    return {
+        'documents': len(documents),
+        'bytes': size,
+        'seconds': times,
+        'mb_per_second': size / 2 ** 20 / total if total else None,
+        'documents_per_second': len(documents) / total if total else None
+    }
+
+
+def benchmark_kind(kind, documents=10, size=50000, repeat=3, seed=0):
+    """Generates documents of one kind and measures them (see benchmark_documents).
+
+    Returns:
+        Dictionary with results and peak resident set size of the process ('peak_rss').
+    """
+    result = benchmark_documents(generate_corpus([kind], documents, size, seed)[kind], repeat)
+    result['peak_rss'] = peak_rss()
+
+    return result
+
+
+def timed(function):
+    """Returns function which calls the given function and returns time of the call in seconds."""
+    def measure(document):
+        start = time.perf_counter()
+        function(document)
+
+        return time.perf_counter() - start
+
+    return measure
+
+
+def peak_rss():
+    """Returns peak resident set size of the process in bytes (None if it is unknown)."""
+    if resource is None:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def get_commit():
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.stdout.strip()
+
+
+def run(kinds=None, documents=10, size=50000, repeat=3, seed=0):
+    """Generates corpus and runs benchmarks for every kind of documents.
+
+    Every kind is measured in a new process, so peak RSS of a kind doesn't include memory
+    used by other kinds.
+
+    Returns:
+        Dictionary with settings and results, which can be saved as json.
+    """
+    if kinds is None:
+        kinds = sorted(KINDS)
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+
+    for kind in kinds:
+        with futures.ProcessPoolExecutor(1, mp_context=context) as executor:
+            results[kind] = executor.submit(benchmark_kind, kind, documents, size, repeat, seed).result()
+
+    return {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'kinds': sorted(kinds),
+            'documents': documents,
+            'size': size,
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def format_report(report):
+    lines = [
+        '{0:<15} {1:>8} {2:>10} {3:>10} {4:>10}  {5}'.format(
+            'kind', 'MB/s', 'docs/s', 'MB', 'RSS MB', '  '.join(STAGES)
+        )
+    ]
+
+    for kind, result in report['results'].items():
+        stages = '  '.join(
+            '{0:>{1}.4f}'.format(result['seconds'][stage], len(stage)) for stage in STAGES
+        )
+        rss = result['peak_rss'] / 2 ** 20 if result['peak_rss'] is not None else float('nan')
+
+        lines.append('{0:<15} {1:>8.2f} {2:>10.1f} {3:>10.2f} {4:>10.1f}  {5}'.format(
+            kind, result['mb_per_second'], result['documents_per_second'], result['bytes'] / 2 ** 20, rss, stages
+        ))
+
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    argument_parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Measures throughput of html_to_text on synthetic documents.'
+    )
+    argument_parser.add_argument('--kinds', nargs='+', choices=sorted(KINDS), help='kinds of documents')
+    argument_parser.add_argument('--documents', type=int, default=10, help='number of documents of every kind')
+    argument_parser.add_argument('--size', type=int, default=50000, help='approximate size of documents')
+    argument_parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best time is used')
+    argument_parser.add_argument('--seed', type=int, default=0, help='seed of corpus generator')
+    argument_parser.add_argument('--json', metavar='PATH', help='save results to json file')
+
+    arguments = argument_parser.parse_args(args)
+
+    report = run(arguments.kinds, arguments.documents, arguments.size, arguments.repeat, arguments.seed)
+
+    print(format_report(report))
+
+    if arguments.json:
+        with open(arguments.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
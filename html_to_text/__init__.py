@@ -1,4 +1,14 @@
 from .parser import *
+from .batch import *
+from .pool import *
+from .aio import *
+from .charset import *
+from .files import *
+from .scoring import *
+from .selector import *
+from .tokenizer import *
+from .boilerplate import *
+from .cache import *
 
 
 __all__ = [
@@ -10,5 +20,27 @@ __all__ = [
     'get_chunks_wrapper',
     'get_save_chunks_wrapper',
     'get_html_splitter',
-    'get_parser'
+    'get_fast_html_splitter',
+    'get_parser',
+    'get_extractor',
+    'ExtractorConfig',
+    'parse_many',
+    'ParserPool',
+    'extract',
+    'AsyncExtractor',
+    'detect_encoding',
+    'extract_file',
+    'extract_paths',
+    'iter_paths',
+    'write_results',
+    'calculate_weights',
+    'get_punctuation_counter',
+    'PunctuationCounter',
+    'BoilerplateIndex',
+    'SelectorMatcher',
+    'get_tokenizer',
+    'RegexTokenizer',
+    'get_cache_key',
+    'ExtractionCache',
+    'CachedParser'
 ]
@@ -0,0 +1,160 @@
+import asyncio
+import collections
+import threading
+
+from concurrent import futures
+
+from .pool import ParserPool
+
+
+__all__ = [
+    'extract',
+    'AsyncExtractor'
+]
+
+
+# parsers of the current thread (or worker process), they are created once for every configuration
+_local = threading.local()
+
+# maximum number of configurations with parsers in every thread, parsers of the least recently
+# used configurations are dropped
+MAX_LOCAL_PARSERS = 8
+
+
+async def extract(html_document, config, executor=None):
+    """Extracts useful text and saved tags from html document in executor without blocking event loop.
+
+    Usage:
+        data, saved_tags = await extract(html, config)
+
+    Args:
+        html_document: Html document (str or bytes).
+        config: ExtractorConfig object.
+        executor: concurrent.futures.Executor (ThreadPoolExecutor or ProcessPoolExecutor).
+            Default executor of the event loop is used if it is None.
+
+    Returns:
+        Tuple (data, saved_tags).
+    """
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, _extract, config, html_document)
+
+
+class AsyncExtractor:
+    """Creates object for extracting useful text from html documents in asyncio applications.
+
+    Documents are parsed in executor, the number of documents processed at the same time is limited,
+    so coroutines wait for their turn when there are too many documents (and don't read new ones).
+
+    Usage:
+        extractor = AsyncExtractor(config, max_concurrency=8)
+
+        data, saved_tags = await extractor.extract(html)
+
+        async with session.get(url) as response:
+            data, saved_tags = await extractor.extract_stream(response.content.iter_chunked(8192))
+
+    Args:
+        config: ExtractorConfig object.
+        executor: concurrent.futures.Executor (ThreadPoolExecutor or ProcessPoolExecutor).
+            Default executor of the event loop is used if it is None.
+        max_concurrency: Maximum number of documents which are processed at the same time.
+
+    Returns:
+        AsyncExtractor object.
+
+    Methods defined here:
+        extract(self, html_document)
+            Extract useful text and saved tags from html document.
+
+        extract_stream(self, stream)
+            Extract useful text and saved tags from html document, which is read from async iterable.
+    """
+    def __init__(self, config, executor=None, max_concurrency=4):
+        self._config = config
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # parsers for documents fed by parts in threads of executor
+        self._stream_parsers = None
+
+        if not isinstance(executor, futures.ProcessPoolExecutor):
+            self._stream_parsers = ParserPool(config.replace(incremental=True), size=max_concurrency)
+
+    async def extract(self, html_document):
+        async with self._semaphore:
+            return await extract(html_document, self._config, self._executor)
+
+    async def extract_stream(self, stream):
+        """Extracts useful text and saved tags from html document, which is read from async iterable.
+
+        If executor is a thread pool, parts of the document are fed to the parser as soon as they
+        are read. Parts are joined and the whole document is sent to the process pool in another case.
+
+        Args:
+            stream: Async iterable with parts of the document (str or bytes).
+
+        Returns:
+            Tuple (data, saved_tags).
+        """
+        async with self._semaphore:
+            if self._stream_parsers is None:
+                parts = [part async for part in stream]
+                html_document = parts[0][:0].join(parts) if parts else ''
+
+                return await extract(html_document, self._config, self._executor)
+
+            loop = asyncio.get_running_loop()
+            parser = self._stream_parsers.checkout()
+            pending = None
+
+            try:
+                # if the coroutine is cancelled, thread of executor still uses the parser, so
+                # calls are shielded and the parser is returned to the pool when the call is over
+                async for part in stream:
+                    pending = loop.run_in_executor(self._executor, parser.feed, part)
+                    await asyncio.shield(pending)
+
+                pending = loop.run_in_executor(self._executor, parser.close)
+                await asyncio.shield(pending)
+
+                return parser.result
+            finally:
+                if pending is None or pending.done():
+                    self._stream_parsers.checkin(parser)
+                else:
+                    pending.add_done_callback(lambda future: self._checkin_later(parser, future))
+
+    def _checkin_later(self, parser, future):
+        # exception of the cancelled call is not interesting anymore
+        if not future.cancelled():
+            future.exception()
+
+        self._stream_parsers.checkin(parser)
+
+    @property
+    def config(self):
+        return self._config
+
+
+def _extract(config, html_document):
+    parsers = getattr(_local, 'parsers', None)
+
+    if parsers is None:
+        parsers = _local.parsers = collections.OrderedDict()
+
+    parser = parsers.get(config)
+
+    if parser is None:
+        # the parser is used for whole documents, incremental parser would keep the previous ones
+        parser = parsers[config] = config.replace(incremental=False).build()
+
+        while len(parsers) > MAX_LOCAL_PARSERS:
+            parsers.popitem(last=False)
+    else:
+        parsers.move_to_end(config)
+
+    parser.feed(html_document)
+
+    return parser.result
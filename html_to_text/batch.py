@@ -0,0 +1,116 @@
+import functools
+import multiprocessing
+
+from .parser import ExtractorConfig
+
+
+__all__ = [
+    'parse_many'
+]
+
+
+# parser of the worker process, it is created once by _init_worker (only in worker processes)
+_worker_parser = None
+
+
+def parse_many(documents, config=None, workers=None, chunksize=1, ordered=True, **parser_kwargs):
+    """Extracts useful text from many html documents in parallel processes.
+
+    Usage:
+        for data, saved_tags in parse_many(documents, workers=4, tags_to_save={'title'},
+                                           tags_to_remove={'script', 'style'}):
+            ...
+
+    Every worker process creates one parser with config.build() and uses it for all its documents.
+    With ordered=False results are yielded as soon as they are ready together with indexes of their
+    documents:
+
+        for index, (data, saved_tags) in parse_many(documents, workers=4, ordered=False, ...):
+            ...
+
+    Args:
+        documents: Iterable with html documents (str or bytes), it is consumed lazily.
+        config: ExtractorConfig object. If it is None, it is created from parser_kwargs.
+        workers: Number of worker processes (os.cpu_count() by default). If it is 1, documents
+            are parsed in the current process.
+        chunksize: Number of documents sent to a worker at once.
+        ordered: If it is True, results are yielded in order of documents, and as soon as
+            they are ready in another case.
+        parser_kwargs: Parameters of ExtractorConfig.
+
+    Yields:
+        Tuples (data, saved_tags) for every document, or tuples (index of the document,
+        (data, saved_tags)) if ordered is False.
+    """
+    if config is None:
+        config = ExtractorConfig(**parser_kwargs)
+
+    if ordered:
+        return imap_with_parser(_parse, documents, config, workers, chunksize)
+
+    return imap_with_parser(_parse_indexed, enumerate(documents), config, workers, chunksize, ordered=False)
+
+
+def imap_with_parser(function, items, config, workers=None, chunksize=1, ordered=True):
+    """Calls function(parser, item) for every item in worker processes.
+
+    Every worker process creates one parser with config.build() and passes it to all calls. Every
+    item is a whole document, so the parser is not incremental (incremental=False is set in config).
+    If items are processed in the current process, every call of this function creates its own
+    parser, so results of generators which are iterated at the same time don't mix.
+
+    Args:
+        function: Function defined at module level (it is pickled).
+        items: Iterable with picklable items, it is consumed lazily.
+        config: ExtractorConfig object.
+        workers: Number of worker processes (os.cpu_count() by default). If it is 1, function
+            is called in the current process.
+        chunksize: Number of items sent to a worker at once.
+        ordered: If it is True, results are yielded in order of items, and as soon as
+            they are ready in another case (results must identify their items then).
+
+    Yields:
+        Results of function.
+    """
+    # incremental parser would keep text of the previous documents until it is reset
+    config = config.replace(incremental=False)
+
+    if workers == 1:
+        parser = config.build()
+
+        for item in items:
+            yield function(parser, item)
+
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(config,)) as pool:
+        task = functools.partial(_call, function)
+
+        if ordered:
+            results = pool.imap(task, items, chunksize)
+        else:
+            results = pool.imap_unordered(task, items, chunksize)
+
+        yield from results
+
+
+def _init_worker(config):
+    global _worker_parser
+
+    _worker_parser = config.build()
+
+
+def _call(function, item):
+    return function(_worker_parser, item)
+
+
+def _parse(parser, document):
+    parser.feed(document)
+
+    return parser.result
+
+
+def _parse_indexed(parser, item):
+    index, document = item
+
+    return index, _parse(parser, document)
@@ -0,0 +1,213 @@
+import collections
+import hashlib
+import threading
+
+from urllib import parse
+
+
+__all__ = [
+    'get_host',
+    'BoilerplateIndex'
+]
+
+
+class BoilerplateIndex:
+    """Creates index of chunks which are repeated on pages of the same site (navigation, footers, sidebars).
+
+    Fingerprints of text of chunks are counted for every host. Chunks which were seen on 'min_pages'
+    different pages of the host are boilerplate, parser drops them on the next pages as soon as
+    they are closed, without cleaning and calculating weights. Every host keeps the most recently
+    seen 'max_fingerprints' fingerprints, the least recently seen hosts are removed when there are
+    more than 'max_hosts' of them. Index can be shared by parsers in many threads.
+
+    Usage:
+        index = BoilerplateIndex(min_pages=3)
+        parser = get_parser(tags_to_save={'title'}, tags_to_remove={'script'}, boilerplate_index=index)
+
+        for url, html in pages:
+            parser.feed(html, url=url)
+
+    Args:
+        min_pages: Number of pages of the host which a chunk must be seen on to be dropped.
+        max_hosts: Maximum number of hosts in the index.
+        max_fingerprints: Maximum number of fingerprints of one host.
+
+    Returns:
+        BoilerplateIndex object.
+
+    Methods defined here:
+        get_filter(self, host)
+            Return PageFilter for the next page of the host.
+
+        is_boilerplate(self, host, text)
+            Return True if text of chunk is boilerplate on the host.
+
+        clear(self)
+            Remove all hosts from the index.
+
+    Properties:
+        min_pages: Return number of pages which a chunk must be seen on to be dropped.
+        max_hosts: Return maximum number of hosts.
+        max_fingerprints: Return maximum number of fingerprints of one host.
+    """
+    def __init__(self, min_pages=3, max_hosts=1024, max_fingerprints=4096):
+        self._min_pages = min_pages
+        self._max_hosts = max_hosts
+        self._max_fingerprints = max_fingerprints
+
+        self._sites = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_filter(self, host):
+        with self._lock:
+            site = self._sites.get(host)
+
+            if site is None:
+                site = self._sites[host] = SiteIndex()
+
+                while len(self._sites) > self._max_hosts:
+                    self._sites.popitem(last=False)
+            else:
+                self._sites.move_to_end(host)
+
+        return PageFilter(self, site)
+
+    def is_boilerplate(self, host, text):
+        site = self._sites.get(host)
+
+        return site is not None and site.counts.get(get_fingerprint(text), 0) >= self._min_pages
+
+    def clear(self):
+        with self._lock:
+            self._sites.clear()
+
+    def _add_page(self, site, fingerprints):
+        with self._lock:
+            # the same page fetched again does not make its chunks boilerplate, the key doesn't
+            # depend on hash randomization, so it is the same in other processes (index can be pickled)
+            page = hashlib.blake2b(b''.join(sorted(fingerprints)), digest_size=16).digest()
+
+            if page in site.pages:
+                site.pages.move_to_end(page)
+                return
+
+            site.pages[page] = None
+
+            if len(site.pages) > self._max_fingerprints:
+                site.pages.popitem(last=False)
+
+            counts = site.counts
+
+            for fingerprint in fingerprints:
+                counts[fingerprint] = counts.get(fingerprint, 0) + 1
+                counts.move_to_end(fingerprint)
+
+            while len(counts) > self._max_fingerprints:
+                counts.popitem(last=False)
+
+    def __getstate__(self):
+        # lock can't be pickled, the copy gets its own lock
+        state = self.__dict__.copy()
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sites)
+
+    @property
+    def min_pages(self):
+        return self._min_pages
+
+    @property
+    def max_hosts(self):
+        return self._max_hosts
+
+    @property
+    def max_fingerprints(self):
+        return self._max_fingerprints
+
+
+class SiteIndex:
+    """Creates fingerprints of chunks of one host.
+
+    Properties:
+        counts: Number of pages for every fingerprint, the most recently seen are the last.
+        pages: Fingerprints of the most recently seen pages.
+    """
+    __slots__ = (
+        'counts',
+        'pages'
+    )
+
+    def __init__(self):
+        self.counts = collections.OrderedDict()
+        self.pages = collections.OrderedDict()
+
+
+class PageFilter:
+    """Creates filter of chunks of one page.
+
+    The filter is called with text of every chunk of the page and returns True if the chunk is
+    boilerplate. Fingerprints of all chunks are added to the index by method finish, after
+    the page is finished.
+
+    Args:
+        index: BoilerplateIndex object.
+        site: SiteIndex object of the host.
+
+    Returns:
+        PageFilter object.
+
+    Methods defined here:
+        finish(self)
+            Add chunks of the page to the index.
+
+    Properties:
+        dropped: Return number of dropped chunks.
+    """
+    __slots__ = (
+        '_index',
+        '_site',
+        '_fingerprints',
+        '_dropped'
+    )
+
+    def __init__(self, index, site):
+        self._index = index
+        self._site = site
+        self._fingerprints = set()
+        self._dropped = 0
+
+    def __call__(self, text):
+        fingerprint = get_fingerprint(text)
+        self._fingerprints.add(fingerprint)
+
+        if self._site.counts.get(fingerprint, 0) >= self._index.min_pages:
+            self._dropped += 1
+            return True
+
+        return False
+
+    def finish(self):
+        if self._fingerprints:
+            self._index._add_page(self._site, self._fingerprints)
+            self._fingerprints = set()
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+
+def get_host(url):
+    """Returns host of url in lower case ('' if there is no host)."""
+    return parse.urlsplit(url).hostname or ''
+
+
+def get_fingerprint(text):
+    """Returns fingerprint of text of chunk, excess spaces are not taken into account."""
+    return hashlib.blake2b(' '.join(text.split()).encode('utf-8', 'surrogatepass'), digest_size=8).digest()
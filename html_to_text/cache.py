@@ -0,0 +1,317 @@
+import collections
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+
+from .parser import ExtractorConfig, Stats
+
+
+__all__ = [
+    'get_cache_key',
+    'ExtractionCache',
+    'CachedParser'
+]
+
+
+# parameters of ExtractorConfig which don't change results
+IGNORED_FIELDS = ('incremental', 'collect_stats', 'backend')
+
+
+class CacheStats(Stats):
+    """Creates statistics of extraction cache.
+
+    Properties:
+        hits: Number of results which were found in the cache.
+        disk_hits: Number of results which were found on disk only (they are counted in hits too).
+        misses: Number of results which were not found.
+        evictions: Number of results which were removed from memory to keep its size.
+    """
+    __slots__ = (
+        'hits',
+        'disk_hits',
+        'misses',
+        'evictions'
+    )
+
+
+class ExtractionCache:
+    """Creates cache of extraction results with LRU eviction and optional SQLite database on disk.
+
+    The most recently used results are kept in memory, the least recently used ones are removed
+    when there are more than maxsize of them. If path is given, all results are written to
+    SQLite database too, results which are not in memory are read from it (and remembered in
+    memory again). Methods can be called from any thread.
+
+    Usage:
+        cache = ExtractionCache(maxsize=10000, path='results.sqlite')
+        key = get_cache_key(html, config)
+
+        result = cache.get(key)
+        if result is None:
+            result = extract(html, config)
+            cache.put(key, result)
+
+    Args:
+        maxsize: Maximum number of results in memory.
+        path: Path to SQLite database (None - results are kept in memory only).
+
+    Returns:
+        ExtractionCache object.
+
+    Methods defined here:
+        get(self, key)
+            Return tuple (data, saved_tags) for key (None if there is no result).
+
+        put(self, key, result)
+            Save tuple (data, saved_tags) for key.
+
+        clear(self)
+            Remove all results from memory and disk.
+
+        close(self)
+            Close the database.
+
+    Properties:
+        maxsize: Return maximum number of results in memory.
+        path: Return path to the database.
+        stats: Return statistics of the cache (see CacheStats).
+    """
+    def __init__(self, maxsize=1024, path=None):
+        self._maxsize = maxsize
+        self._path = path
+
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+        self._connection = None
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data TEXT, saved_tags TEXT)'
+            )
+            self._connection.commit()
+
+    def get(self, key):
+        with self._lock:
+            result = self._results.get(key)
+
+            if result is not None:
+                self._results.move_to_end(key)
+            elif self._connection is not None:
+                row = self._connection.execute(
+                    'SELECT data, saved_tags FROM results WHERE key = ?', (key,)
+                ).fetchone()
+
+                if row is not None:
+                    result = (row[0], json.loads(row[1]))
+                    self._remember(key, result)
+                    self._stats.disk_hits += 1
+
+            if result is None:
+                self._stats.misses += 1
+
+                return None
+
+            self._stats.hits += 1
+
+        return _copy_result(result)
+
+    def put(self, key, result):
+        result = _copy_result(result)
+
+        with self._lock:
+            self._remember(key, result)
+
+            if self._connection is not None:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                    (key, result[0], json.dumps(result[1], ensure_ascii=False))
+                )
+                self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+            if self._connection is not None:
+                self._connection.execute('DELETE FROM results')
+                self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self._maxsize:
+            self._results.popitem(last=False)
+            self._stats.evictions += 1
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def stats(self):
+        return self._stats
+
+
+class CachedParser:
+    """Creates parser which doesn't parse documents again if they are in the cache.
+
+    Results are found by hash of the document and configuration of the parser (see get_cache_key),
+    so byte-identical documents (mirrors, copies, documents which are fetched again) are parsed
+    once. The whole document is fed at once.
+
+    Usage:
+        cached_parser = CachedParser(config, ExtractionCache(maxsize=10000))
+        cached_parser.feed(html)
+        data, saved_tags = cached_parser.result
+
+    Args:
+        config: ExtractorConfig object (without boilerplate_pages). If it is None, it is created
+            from parser_kwargs.
+        cache: ExtractionCache object (new cache in memory by default). It can be shared by
+            parsers with different configurations.
+        parser_kwargs: Parameters of ExtractorConfig.
+
+    Returns:
+        CachedParser object.
+
+    Methods defined here:
+        feed(self, data, encoding=None)
+            Take result of the document from the cache or parse it.
+
+    Properties:
+        data: Return useful text of the last document.
+        saved_tags: Return saved tags of the last document.
+        result: Return tuple (data, saved_tags).
+        hit: Return True if the result of the last document was found in the cache.
+        config: Return configuration of the parser.
+        cache: Return the cache.
+    """
+    def __init__(self, config=None, cache=None, **parser_kwargs):
+        if config is None:
+            config = ExtractorConfig(**parser_kwargs)
+
+        if config.boilerplate_pages:
+            raise ValueError('Results depend on previous pages if boilerplate_pages is set, they can\'t be cached')
+
+        self._config = config.replace(incremental=False)
+        self._cache = ExtractionCache() if cache is None else cache
+
+        # parser is created only when the first document is not found in the cache
+        self._parser = None
+
+        self._result = ('', {})
+        self._hit = False
+
+    def feed(self, data, encoding=None):
+        """Takes result of the document from the cache or parses it.
+
+        Args:
+            data: Html document (str or bytes).
+            encoding: Encoding of the document fed as bytes (see Parser.feed).
+        """
+        key = get_cache_key(data, self._config, encoding)
+        result = self._cache.get(key)
+        self._hit = result is not None
+
+        if result is None:
+            if self._parser is None:
+                self._parser = self._config.build()
+
+            self._parser.feed(data, encoding)
+            result = self._parser.result
+            self._cache.put(key, result)
+
+        self._result = result
+
+    @property
+    def data(self):
+        return self._result[0]
+
+    @property
+    def saved_tags(self):
+        return self._result[1]
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def hit(self):
+        return self._hit
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def cache(self):
+        return self._cache
+
+
+def get_cache_key(document, config, encoding=None):
+    """Returns key of extraction result in the cache.
+
+    Key is hash of the document and parameters of config which change results, sets are sorted,
+    so the key is the same in all processes and after restart.
+
+    Args:
+        document: Html document (str or bytes).
+        config: ExtractorConfig object.
+        encoding: Encoding of the document fed as bytes.
+
+    Returns:
+        Hexadecimal string.
+    """
+    digest = hashlib.sha256(_get_config_key(config))
+
+    if isinstance(document, str):
+        digest.update(b'\x00str\x00')
+        digest.update(document.encode('utf-8', 'surrogatepass'))
+    else:
+        digest.update(b'\x00bytes\x00' + str(encoding).encode('ascii', 'replace') + b'\x00')
+        digest.update(document)
+
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _get_config_key(config):
+    parameters = {}
+
+    for name, value in config.as_dict().items():
+        if name in IGNORED_FIELDS:
+            continue
+
+        if isinstance(value, frozenset):
+            value = sorted(value)
+        elif isinstance(value, type):
+            value = '{0}.{1}'.format(value.__module__, value.__qualname__)
+
+        parameters[name] = value
+
+    return json.dumps(parameters, sort_keys=True).encode('utf-8')
+
+
+def _copy_result(result):
+    data, saved_tags = result
+
+    return data, {tag: list(texts) for tag, texts in saved_tags.items()}
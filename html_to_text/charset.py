@@ -0,0 +1,69 @@
+import codecs
+import re
+
+
+__all__ = [
+    'detect_encoding'
+]
+
+
+# number of bytes at the start of document which are searched for <meta charset>
+PRESCAN_SIZE = 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.+-]+)', re.IGNORECASE)
+
+# declared encodings, which are decoded differently by browsers
+REPLACED_ENCODINGS = {
+    'utf-16': 'utf-8',
+    'utf-16-le': 'utf-8',
+    'utf-16-be': 'utf-8',
+    'ascii': 'cp1252',
+    'iso8859-1': 'cp1252'
+}
+
+
+def detect_encoding(data, hint=None, default='utf-8'):
+    """Detects encoding of html document.
+
+    Byte order mark is used first, then the hint (for example, charset from Content-Type header),
+    then <meta charset> or <meta http-equiv="Content-Type"> from the first PRESCAN_SIZE bytes.
+    Unknown encodings are skipped.
+
+    Args:
+        data: Start of the document (bytes).
+        hint: Encoding known from other sources.
+        default: Encoding which is used if nothing else is found.
+
+    Returns:
+        Name of encoding.
+    """
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+
+    if hint is not None and lookup_encoding(hint) is not None:
+        return lookup_encoding(hint)
+
+    match = META_CHARSET.search(data, 0, PRESCAN_SIZE)
+
+    if match is not None:
+        encoding = lookup_encoding(match.group(1).decode('ascii'))
+
+        if encoding is not None:
+            return REPLACED_ENCODINGS.get(encoding, encoding)
+
+    return default
+
+
+def lookup_encoding(name):
+    """Returns normalized name of encoding (None if encoding is unknown)."""
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
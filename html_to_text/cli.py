@@ -0,0 +1,181 @@
+import argparse
+import sys
+
+from . import files
+from .parser import ExtractorConfig
+from .tokenizer import BACKENDS
+
+
+__all__ = [
+    'main'
+]
+
+
+def get_argument_parser():
+    """Returns argparse.ArgumentParser for html-to-text command."""
+    argument_parser = argparse.ArgumentParser(
+        prog='html-to-text',
+        description='Extracts useful text from html files, directories with html files or WARC archives '
+                    'and writes results as soon as they are ready.'
+    )
+    argument_parser.add_argument(
+        'paths', nargs='*', metavar='PATH',
+        help='html files, directories or WARC archives (standard input if none or "-")'
+    )
+
+    # lists are comma-separated (and options can be repeated), so they don't take paths after them
+    extraction = argument_parser.add_argument_group('extraction')
+    extraction.add_argument(
+        '--save', type=_split_list, action='extend', default=[], metavar='TAG[,TAG...]',
+        help='tags for saving (title,h1,...)'
+    )
+    extraction.add_argument(
+        '--save-attributes', type=_split_list, action='extend', default=[], metavar='TAG[ATTRIBUTE][,...]',
+        help='attributes for saving (a[href],meta[content],...)'
+    )
+    extraction.add_argument(
+        '--max-per-tag', type=int, default=0, metavar='NUMBER',
+        help='maximum number of saved texts of every tag'
+    )
+    extraction.add_argument(
+        '--first-only', type=_split_list, action='extend', default=[], metavar='TAG[,TAG...]',
+        help='saved tags which only the first text is kept for (title)'
+    )
+    extraction.add_argument(
+        '--remove', type=_split_list, action='extend', default=[], metavar='TAG[,TAG...]', help='tags for removing'
+    )
+    extraction.add_argument(
+        '--remove-without-content', type=_split_list, action='extend', default=[], metavar='TAG[,TAG...]',
+        help='tags which are removed without their content'
+    )
+    extraction.add_argument(
+        '--remove-with-content', type=_split_list, action='extend', default=[], metavar='TAG[,TAG...]',
+        help='tags which are removed with their content'
+    )
+    extraction.add_argument(
+        '--remove-selectors', type=_split_list, action='extend', default=[], metavar='SELECTOR[,...]',
+        help='elements which are removed with their content (div.sidebar,#menu,[role=navigation],...)'
+    )
+    extraction.add_argument('--min-weight', type=float, default=0.0, help='minimum allowed weight of chunk')
+    extraction.add_argument('--punctuation', default='.,!?:;', help='punctuation marks')
+    extraction.add_argument(
+        '--punctuation-categories', type=_split_list, action='extend', default=[], metavar='CATEGORY[,...]',
+        help='unicode categories of punctuation marks (Po,Pd,... or P for all of them)'
+    )
+    extraction.add_argument('--tag-link', default='a', help='tag of links')
+    extraction.add_argument('--encoding', help='encoding of documents (detected by default)')
+    extraction.add_argument('--warc', action='store_true', help='read files as WARC archives')
+    extraction.add_argument(
+        '--vectorized', action='store_true', help='calculate weights of chunks at once (with NumPy if installed)'
+    )
+    extraction.add_argument(
+        '--skip-removed', action='store_true', help='skip content of removed tags without parsing it'
+    )
+    extraction.add_argument('--fast', action='store_true', help='use splitter which does not build html of chunks')
+    extraction.add_argument(
+        '--backend', choices=sorted(BACKENDS), default='html.parser',
+        help='tokenizer of documents (regex is faster and gives the same results)'
+    )
+    extraction.add_argument(
+        '--columnar', action='store_true', help='keep chunks in arrays (less memory for pages with many blocks)'
+    )
+    extraction.add_argument(
+        '--boilerplate-pages', type=int, default=0, metavar='PAGES',
+        help='drop blocks which were seen on this number of pages of the same site (WARC archives only)'
+    )
+
+    output = argument_parser.add_argument_group('output')
+    output.add_argument('-o', '--output', default='-', help='output file (standard output by default)')
+    output.add_argument('--format', choices=files.FORMATS, default='jsonl', help='format of results')
+    output.add_argument(
+        '--no-stats', dest='stats', action='store_false',
+        help="don't add statistics and timings of every document to results"
+    )
+
+    processing = argument_parser.add_argument_group('processing')
+    processing.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes')
+    processing.add_argument('--chunksize', type=int, default=16, help='number of files sent to a worker at once')
+    processing.add_argument(
+        '--unordered', dest='ordered', action='store_false',
+        help='write results as soon as they are ready, not in order of files'
+    )
+
+    return argument_parser
+
+
+def get_config(arguments):
+    """Returns ExtractorConfig for parsed arguments of html-to-text command."""
+    return ExtractorConfig(
+        tags_to_save=arguments.save,
+        attributes_to_save=arguments.save_attributes,
+        max_per_tag=arguments.max_per_tag,
+        first_only=arguments.first_only,
+        tags_to_remove=arguments.remove,
+        punctuation=arguments.punctuation,
+        punctuation_categories=arguments.punctuation_categories,
+        min_allowed_weight=arguments.min_weight,
+        tag_link=arguments.tag_link,
+        remove_without_content=arguments.remove_without_content,
+        remove_with_content=arguments.remove_with_content,
+        remove_selectors=arguments.remove_selectors,
+        encoding=arguments.encoding,
+        collect_stats=arguments.stats,
+        vectorized=arguments.vectorized,
+        columnar=arguments.columnar,
+        fast=arguments.fast,
+        skip_removed=arguments.skip_removed,
+        boilerplate_pages=arguments.boilerplate_pages,
+        backend=arguments.backend
+    )
+
+
+def main(args=None):
+    """Runs html-to-text command.
+
+    Args:
+        args: List of arguments (sys.argv[1:] by default).
+
+    Returns:
+        Exit status: 0 if all files are processed, 1 if some files can't be read.
+    """
+    arguments = get_argument_parser().parse_args(args)
+    config = get_config(arguments)
+
+    if not arguments.paths or arguments.paths == ['-']:
+        results = _iter_stdin(config)
+    else:
+        results = files.iter_paths(
+            arguments.paths, config, arguments.jobs, arguments.chunksize, arguments.ordered, arguments.warc
+        )
+
+    errors = []
+
+    def check_errors(results):
+        for result in results:
+            if 'error' in result:
+                errors.append(result)
+                print('{0}: {1}'.format(result['path'], result['error']), file=sys.stderr)
+
+            yield result
+
+    if arguments.output == '-':
+        sink = sys.stdout
+        # results are streamed, so every line is written at once even if output is a pipe
+        sink.reconfigure(encoding='utf-8', line_buffering=True)
+        files.write_results(check_errors(results), sink, arguments.format)
+    else:
+        with open(arguments.output, 'w', encoding='utf-8', buffering=1) as sink:
+            files.write_results(check_errors(results), sink, arguments.format)
+
+    return 1 if errors else 0
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _iter_stdin(config):
+    parser = config.build()
+    parser.feed_file(sys.stdin.buffer)
+
+    yield files._get_result(parser, '-', None)
@@ -0,0 +1,343 @@
+import gzip
+import json
+import os
+import re
+import zlib
+
+from .batch import imap_with_parser
+from .parser import ExtractorConfig
+
+
+__all__ = [
+    'extract_file',
+    'extract_paths',
+    'iter_paths',
+    'write_results'
+]
+
+
+FORMATS = ('jsonl', 'tsv')
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+CHARSET = re.compile(r'charset\s*=\s*["\']?([a-zA-Z0-9_:.+-]+)', re.IGNORECASE)
+
+
+def extract_file(path, config=None, encoding=None, **parser_kwargs):
+    """Extracts useful text and saved tags from html file.
+
+    File is read and decoded by parts, encoding is detected from byte order mark or <meta charset>
+    if it is not given.
+
+    Args:
+        path: Path to file or binary file object.
+        config: ExtractorConfig object. If it is None, it is created from parser_kwargs.
+        encoding: Encoding of the file.
+        parser_kwargs: Parameters of ExtractorConfig.
+
+    Returns:
+        Tuple (data, saved_tags).
+    """
+    if config is None:
+        config = ExtractorConfig(**parser_kwargs)
+
+    parser = config.build()
+    parser.feed_file(path, encoding)
+
+    return parser.result
+
+
+def iter_paths(paths, config=None, workers=None, chunksize=16, ordered=True, warc=False, **parser_kwargs):
+    """Extracts useful text from html files (or WARC files) in worker processes.
+
+    Files are memory-mapped and fed to parser by parts, every worker uses one parser for all its files.
+    Directories are searched for files recursively. WARC archives are read record by record in the
+    current process, html responses are sent to workers, and results are yielded for every record.
+
+    Args:
+        paths: Iterable with paths to files and directories.
+        config: ExtractorConfig object. If it is None, it is created from parser_kwargs.
+        workers: Number of worker processes (os.cpu_count() if it is None).
+        chunksize: Number of files (or WARC records) sent to a worker at once.
+        ordered: If it is True, results are yielded in order of files, and as soon as
+            they are ready in another case.
+        warc: If it is True, files are read as WARC archives (uncompressed or .gz), and html
+            responses from them are parsed (compressed with gzip or deflate content encoding too).
+        parser_kwargs: Parameters of ExtractorConfig.
+
+    Yields:
+        Dictionaries with keys 'path', 'url' (target URI of WARC record, None for html files), 'data',
+        'saved_tags', 'stats' (if config.collect_stats is True) or 'path', 'url', 'error' if file
+        can't be read.
+    """
+    if config is None:
+        config = ExtractorConfig(**parser_kwargs)
+
+    if warc:
+        results = imap_with_parser(_extract_record, _read_warc_paths(_walk(paths)), config, workers, chunksize, ordered)
+    else:
+        results = imap_with_parser(_extract_path, _walk(paths), config, workers, chunksize, ordered)
+
+    yield from results
+
+
+def extract_paths(paths, sink, format='jsonl', **kwargs):
+    """Extracts useful text from html files (or WARC files) and writes results to sink.
+
+    Args:
+        paths: Iterable with paths to files and directories.
+        sink: Text file object.
+        format: Format of results ('jsonl' or 'tsv', see write_results).
+        kwargs: Parameters of iter_paths function.
+
+    Returns:
+        Number of written results.
+    """
+    return write_results(iter_paths(paths, **kwargs), sink, format)
+
+
+def write_results(results, sink, format='jsonl'):
+    """Writes results of iter_paths to sink as soon as they are ready.
+
+    In 'jsonl' format every result is written as json object on separate line. In 'tsv' format
+    every result is written as line with columns: path, url, data, saved_tags (json), errors
+    are skipped.
+
+    Args:
+        results: Iterable with results.
+        sink: Text file object.
+        format: Format of results ('jsonl' or 'tsv').
+
+    Returns:
+        Number of written results.
+    """
+    if format not in FORMATS:
+        raise ValueError('Format must be one of: {0}'.format(', '.join(FORMATS)))
+
+    count = 0
+
+    for result in results:
+        if format == 'jsonl':
+            sink.write(json.dumps(result, ensure_ascii=False) + '\n')
+        elif 'error' not in result:
+            columns = (
+                result['path'],
+                result['url'] or '',
+                result['data'],
+                json.dumps(result['saved_tags'], ensure_ascii=False)
+            )
+            sink.write('\t'.join(' '.join(column.split()) for column in columns) + '\n')
+        else:
+            continue
+
+        count += 1
+
+    return count
+
+
+def _walk(paths):
+    for path in map(os.fspath, paths):
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, directories, files in os.walk(path):
+            directories.sort()
+
+            for file in sorted(files):
+                yield os.path.join(directory, file)
+
+
+def _extract_path(parser, path):
+    try:
+        parser.feed_file(path)
+    except OSError as exception:
+        return {'path': path, 'url': None, 'error': str(exception)}
+
+    return _get_result(parser, path, None)
+
+
+def _extract_record(parser, record):
+    path, url, payload, encoding, error = record
+
+    if error is not None:
+        return {'path': path, 'url': url, 'error': error}
+
+    parser.feed_buffer(payload, encoding, url=url)
+
+    return _get_result(parser, path, url)
+
+
+def _get_result(parser, path, url):
+    data, saved_tags = parser.result
+    result = {'path': path, 'url': url, 'data': data, 'saved_tags': saved_tags}
+
+    if parser.stats is not None:
+        result['stats'] = parser.stats.as_dict()
+
+    return result
+
+
+def _read_warc_paths(paths):
+    """Reads html responses of WARC archives one by one.
+
+    Args:
+        paths: Iterable with paths to WARC archives (uncompressed or .gz).
+
+    Yields:
+        Tuples (path, url, payload, encoding, error) for every html response, error is a message
+        and other items are None (except path) if archive can't be read further.
+    """
+    for path in paths:
+        try:
+            with (gzip.open if path.endswith('.gz') else open)(path, 'rb') as file:
+                for url, payload, encoding in _read_warc_records(file):
+                    yield path, url, payload, encoding, None
+        except (OSError, EOFError, ValueError) as exception:
+            yield path, None, None, None, str(exception)
+
+
+def _read_warc_records(file):
+    """Reads html responses of WARC archive one by one.
+
+    Only the current record is kept in memory, contents of other records are skipped.
+
+    Args:
+        file: Binary file object with uncompressed WARC archive (or gzip.GzipFile).
+
+    Yields:
+        Tuples (url, payload, encoding) for every html response.
+    """
+    while True:
+        line = file.readline()
+
+        if not line:
+            return
+        if not line.startswith(b'WARC/'):
+            # empty lines between records
+            continue
+
+        position = file.tell()
+        lines = []
+
+        while line.strip():
+            line = file.readline()
+
+            if not line:
+                raise ValueError('Incomplete WARC record at {0}'.format(position))
+
+            lines.append(line)
+
+        headers = _parse_headers(b''.join(lines))
+        length = int(headers.get('content-length', 0))
+
+        record_type = headers.get('warc-type')
+        content_type = headers.get('content-type', '')
+
+        url = headers.get('warc-target-uri')
+
+        if record_type == 'response' and content_type.startswith('application/http'):
+            html = _get_http_payload(_read_content(file, length, position))
+        elif record_type in ('response', 'resource') and content_type.startswith(HTML_CONTENT_TYPES):
+            html = _read_content(file, length, position), _get_charset(content_type)
+        else:
+            file.seek(length, os.SEEK_CUR)
+            continue
+
+        if html is not None:
+            yield (url,) + html
+
+
+def _read_content(file, length, position):
+    content = file.read(length)
+
+    if len(content) < length:
+        raise ValueError('Incomplete WARC record at {0}'.format(position))
+
+    return content
+
+
+def _get_http_payload(content):
+    """Returns (payload, encoding) for html body of http response (None for other responses)."""
+    headers_end = content.find(b'\r\n\r\n')
+
+    if headers_end < 0:
+        return None
+
+    # the first line is status line
+    headers = _parse_headers(content[:headers_end].split(b'\r\n', 1)[-1])
+    content_type = headers.get('content-type', 'text/html')
+
+    if not content_type.startswith(HTML_CONTENT_TYPES):
+        return None
+
+    payload = content[headers_end + 4:]
+
+    if 'chunked' in headers.get('transfer-encoding', ''):
+        payload = _dechunk(payload)
+
+    payload = _decode_content(payload, headers.get('content-encoding', 'identity').lower())
+
+    if payload is None:
+        return None
+
+    return payload, _get_charset(content_type)
+
+
+def _decode_content(payload, content_encoding):
+    """Returns payload decoded from content encoding (None if it can't be decoded)."""
+    if content_encoding in ('', 'identity'):
+        return payload
+
+    if content_encoding not in ('gzip', 'x-gzip', 'deflate'):
+        return None
+
+    try:
+        # gzip and zlib headers are detected, raw deflate is used without header
+        return zlib.decompress(payload, 47)
+    except zlib.error:
+        pass
+
+    try:
+        return zlib.decompress(payload, -15)
+    except zlib.error:
+        return None
+
+
+def _parse_headers(data):
+    headers = {}
+
+    for line in data.decode('latin-1').splitlines():
+        name, separator, value = line.partition(':')
+
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+
+    return headers
+
+
+def _get_charset(content_type):
+    match = CHARSET.search(content_type)
+
+    return match.group(1) if match else None
+
+
+def _dechunk(data):
+    parts = []
+    position = 0
+
+    while position < len(data):
+        line_end = data.find(b'\r\n', position)
+
+        if line_end < 0:
+            break
+
+        size = int(data[position:line_end].split(b';', 1)[0] or b'0', 16)
+
+        if size == 0:
+            break
+
+        parts.append(data[line_end + 2:line_end + 2 + size])
+        position = line_end + 4 + size
+
+    return b''.join(parts)
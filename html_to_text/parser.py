@@ -1,5 +1,26 @@
+import array
+import codecs
+import collections
+import collections.abc
+import dataclasses
+import functools
+import io
+import itertools
+import mmap
+import os
+import re
+import time
+
 from html import parser
 
+from .boilerplate import BoilerplateIndex, get_host
+from .charset import PRESCAN_SIZE, detect_encoding
+from .scoring import (
+    PunctuationCounter, calculate_weight, calculate_weights, count_punctuation_marks, get_punctuation_counter
+)
+from .selector import get_selector_matcher
+from .tokenizer import can_skip_content, get_tokenizer
+
 
 __all__ = [
     'normalize_string',
@@ -10,10 +31,66 @@ __all__ = [
     'get_chunks_wrapper',
     'get_save_chunks_wrapper',
     'get_html_splitter',
-    'get_parser'
+    'get_fast_html_splitter',
+    'get_parser',
+    'get_extractor',
+    'ExtractorConfig'
 ]
 
 
+# elements which have no content and no end tag
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'meta', 'param',
+    'source', 'track', 'wbr'
+})
+
+HEADINGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# saved tags which a document has one text of (value of first_only parameter, <title> elements of
+# svg images in the body are not saved with it)
+FIRST_ONLY_TAGS = frozenset({'title'})
+
+# attribute to save: tag name and attribute ('a[href]', 'meta[content]')
+ATTRIBUTE_TO_SAVE = re.compile(r'([a-zA-Z][\w-]*)\[\s*([^\s\]=]+)\s*\]')
+
+# open <p> is not closed by other elements behind these ones
+PARAGRAPH_SCOPE = frozenset({
+    'applet', 'button', 'caption', 'html', 'marquee', 'object', 'table', 'td', 'th', 'template'
+})
+
+# start tag -> (open elements which are closed by it, elements which stop searching for them)
+IMPLIED_END_TAGS = dict.fromkeys(
+    (
+        'address', 'article', 'aside', 'blockquote', 'center', 'details', 'dialog', 'dir', 'div', 'dl',
+        'fieldset', 'figcaption', 'figure', 'footer', 'form', 'header', 'hgroup', 'hr', 'main', 'menu',
+        'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'ul'
+    ),
+    (frozenset({'p'}), PARAGRAPH_SCOPE)
+)
+IMPLIED_END_TAGS.update(dict.fromkeys(HEADINGS, (HEADINGS | {'p'}, PARAGRAPH_SCOPE)))
+IMPLIED_END_TAGS.update({
+    'li': (frozenset({'li', 'p'}), PARAGRAPH_SCOPE | {'ul', 'ol', 'menu'}),
+    'dt': (frozenset({'dt', 'dd', 'p'}), PARAGRAPH_SCOPE | {'dl'}),
+    'dd': (frozenset({'dt', 'dd', 'p'}), PARAGRAPH_SCOPE | {'dl'}),
+    'a': (frozenset({'a'}), PARAGRAPH_SCOPE),
+    'tr': (frozenset({'tr', 'td', 'th'}), frozenset({'table', 'thead', 'tbody', 'tfoot'})),
+    'td': (frozenset({'td', 'th'}), frozenset({'table', 'tr'})),
+    'th': (frozenset({'td', 'th'}), frozenset({'table', 'tr'})),
+    'thead': (frozenset({'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'}), frozenset({'table'})),
+    'tbody': (frozenset({'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'}), frozenset({'table'})),
+    'tfoot': (frozenset({'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'}), frozenset({'table'})),
+    'option': (frozenset({'option'}), frozenset({'select', 'datalist', 'optgroup'})),
+    'optgroup': (frozenset({'option', 'optgroup'}), frozenset({'select', 'datalist'}))
+})
+
+# element -> start tags which close it (content of removed elements is not skipped if they can close
+# the removed element or its parents)
+CLOSING_START_TAGS = {
+    name: frozenset(tag for tag, (closed, boundaries) in IMPLIED_END_TAGS.items() if name in closed)
+    for name in frozenset().union(*(closed for closed, boundaries in IMPLIED_END_TAGS.values()))
+}
+
+
 class ChunkProcedureException(Exception):
     pass
 
@@ -137,6 +214,13 @@ class Chunk:
 
     Args:
         chunk: Block with html code.
+        text: Text of the block, if it was already extracted by the splitter (the same text as
+            HTMLChunksCleaner gets from normalized html of the block). In this case the block
+            is not parsed again while calculating the weight, and excess spaces are removed
+            from the text only when it is read.
+        links_length: Length of links in the block, used together with 'text'.
+        length_with_tags: Length of the block without excess spaces, if it was calculated by
+            the splitter. In this case 'chunk' can be empty.
 
     Returns:
         A chunk object.
@@ -147,9 +231,19 @@ class Chunk:
             Calculate weight of this chunk. The greater the weight,
             the greater the likelihood that the block contains useful text.
 
+        calculate_features(self, cleaner, punctuation):
+            Calculate lengths and number of punctuation marks of this chunk without weight
+            (weights of many chunks can be calculated at once).
+
+        set_text(self, text, links_length=0, length_with_tags=None):
+            Set text and lengths of this chunk extracted by the splitter (the same as
+            parameters of constructor).
+
     Properties:
         chunk: Return chunk (string).
         weight: Return weight of the chunk.
+        features: Return tuple (length_with_tags, length_without_tags, length_of_links,
+            count_of_punctuation_marks).
         length_with_tags: Return length with html tags of the chunk.
         length_without_tags: Return length without html tags of the chunk.
         length_of_links: Return length of links in chunk.
@@ -162,41 +256,70 @@ class Chunk:
         '_length_without_tags',
         '_count_of_punctuation_marks',
         '_links_length',
-        '_cleaned'
+        '_text',
+        '_cleaned',
+        '_normalized',
+        '_html_length'
     )
 
-    def __init__(self, chunk=''):
+    def __init__(self, chunk='', text=None, links_length=0, length_with_tags=None):
         self._chunk = chunk
+        self._text = text
+        self._html_length = length_with_tags
 
         self._weight = 0
         self._length_with_tags = 0
         self._length_without_tags = 0
         self._count_of_punctuation_marks = 0
-        self._links_length = 0
+        self._links_length = links_length
 
         self._cleaned = False
+        self._normalized = True
 
     def make_calculations(self, cleaner, punctuation):
         """Calculates weight of the chunk.
 
         Args:
             cleaner: Object which have method 'feed(data)', removes tags from chunk
-                and calculate length of links in the chunk.
-            punctuation: Punctuation marks.
+                and calculate length of links in the chunk. It is not used if the text
+                of the chunk was extracted by the splitter.
+            punctuation: Punctuation marks (string) or PunctuationCounter object.
         """
-        self._calculate_length_with_tags()
-        self._calculate_links_length_and_clean_chunk(cleaner)
-        self._calculate_length_without_tags()
-        self._calculate_count_of_punctuation_marks(punctuation)
+        self.calculate_features(cleaner, punctuation)
+
+        self._weight = calculate_weight(*self.features)
+
+    def set_text(self, text, links_length=0, length_with_tags=None):
+        """Sets text of the chunk extracted by the splitter, so the chunk is not parsed again.
+
+        Subclasses which constructor accepts only html of the chunk get the text by this method.
+
+        Args:
+            text: Text of the chunk.
+            links_length: Length of links in the chunk.
+            length_with_tags: Length of html of the chunk without excess spaces (None - it is
+                calculated from html of the chunk).
+        """
+        self._text = text
+        self._links_length = links_length
+        self._html_length = length_with_tags
 
-        text_density = self._length_without_tags / self._length_with_tags
-        links_density = self._links_length / max(self._length_without_tags, 1)
+    def calculate_features(self, cleaner, punctuation):
+        """Calculates lengths and number of punctuation marks of the chunk, but not its weight.
 
-        self._weight = (text_density + self._count_of_punctuation_marks / 100) + (1 - links_density)
-        self._weight += (1 - (self._count_of_punctuation_marks / self._length_without_tags))
+        Args:
+            cleaner: The same as in make_calculations.
+            punctuation: Punctuation marks (string) or PunctuationCounter object.
+        """
+        self._calculate_length_with_tags()
+
+        if self._text is None:
+            self._calculate_links_length_and_clean_chunk(cleaner)
+        else:
+            self._use_extracted_text()
 
-        if self._count_of_punctuation_marks == 0:
-            self._weight *= self._count_of_punctuation_marks
+        self._calculate_length_without_tags()
+        self._calculate_count_of_punctuation_marks(punctuation)
 
     def _calculate_length_with_tags(self):
         if self._length_without_tags > 0:
@@ -204,7 +327,12 @@ class Chunk:
                 'Parameter length_with_tags must be calculated before length_without_tags'
             )
 
-        self._length_with_tags = len(self._chunk)
+        if self._html_length is not None:
+            self._length_with_tags = self._html_length
+        elif self._text is None:
+            self._length_with_tags = len(self._chunk)
+        else:
+            self._length_with_tags = normalized_length(self._chunk)
 
     def _calculate_length_without_tags(self):
         if self._length_with_tags == 0 or not self._cleaned:
@@ -221,7 +349,7 @@ class Chunk:
                 'Parameter count_of_punctuation_marks must be calculated after removing tags from chunk'
             )
 
-        self._count_of_punctuation_marks = sum([self._chunk.count(mark) for mark in punctuation])
+        self._count_of_punctuation_marks = count_punctuation_marks(self._chunk, punctuation)
 
     def _calculate_links_length_and_clean_chunk(self, cleaner):
         if self._length_with_tags == 0:
@@ -235,14 +363,44 @@ class Chunk:
         self._links_length = cleaner.links_length
         self._chunk = cleaner.data
 
+    def _use_extracted_text(self):
+        if self._length_with_tags == 0:
+            raise ChunkProcedureException(
+                'Method must be call only after calculating a length_with_tag parameter'
+            )
+
+        self._cleaned = True
+        self._chunk = self._text
+        self._normalized = False
+
     @property
     def chunk(self):
+        if not self._normalized:
+            self._chunk = normalize_string(self._chunk)
+            self._normalized = True
+
         return self._chunk
 
     @property
     def weight(self):
         return self._weight
 
+    @weight.setter
+    def weight(self, value):
+        if not isinstance(value, (int, float)):
+            raise AttributeError('Type of value must be float')
+
+        self._weight = value
+
+    @property
+    def features(self):
+        return (
+            self._length_with_tags,
+            self._length_without_tags,
+            self._links_length,
+            self._count_of_punctuation_marks
+        )
+
     @property
     def length_with_tags(self):
         return self._length_with_tags
@@ -260,326 +418,1549 @@ class Chunk:
         return self._count_of_punctuation_marks
 
 
-class Cleaner(parser.HTMLParser):
-    """Creates object for remove tags from html documents
+class TagWrapper:
+    """Creates wrapper for tags, which creates tag objects and their string representations.
 
     Args:
-        remove_without_data: A set of tags which will be removed without their content.
-        remove_with_data: A set of tags which will be removed with content.
-        convert_charrefs: If it is True, all character references are
-            automatically converted to the corresponding Unicode characters.
+        save_attrs: If parameter is true, attributes of tag will be save.
+        tag_class: Tag class.
 
     Returns:
-        Cleaner object.
+        TagWrapper object.
     """
-    first_run = False
+    def __init__(self, save_attrs=False, tag_class=Tag):
+        self._tag = tag_class
+        self._save_attrs = save_attrs
 
-    def __init__(self, remove_without_data=set(), remove_with_data=set(), convert_charrefs=True):
-        self._remove_without_data = remove_without_data
-        self._remove_with_data = remove_with_data
+    def starttag_string(self, tag):
+        return tag.starttag_string(save_attrs=self._save_attrs)
 
-        self._remove = 0
+    def endtag_string(self, tag):
+        return tag.endtag_string()
 
-        self._data = []
+    def create(self, name, attrs):
+        return self._tag(name, attrs)
 
-        super(Cleaner, self).__init__(convert_charrefs=convert_charrefs)
 
-    def feed(self, data):
-        if not self.first_run:
-            self.first_run = True
-        else:
-            self.clear()
+class ChunksWrapper:
+    """Creates wrapper for html chunks (blocks with html), which keeps chunks of the document
+    and calculates their weights.
 
-        super(Cleaner, self).feed(data)
+    Chunk objects are created with html of the chunk only (Chunk subclasses can keep the constructor
+    of the base class), text extracted by the splitter is passed to them by method set_text. Chunk
+    classes without this method get normalized html instead and clean it with the chunks cleaner,
+    so they are not used with FastHTMLSplitter, which doesn't keep html of chunks.
 
-    def handle_starttag(self, name, attrs):
-        if name in self._remove_with_data:
-            self._remove += 1
+    Args:
+        chunk_class: Chunk class.
+        vectorized: If it is True, features of new chunks are collected first and their weights
+            are calculated at once (with NumPy if it is installed).
 
-        if name not in self._remove_without_data and self._remove == 0:
-            self._data.append(get_starttag_string(name, attrs))
+    Returns:
+        ChunksWrapper object.
+    """
+    def __init__(self, chunk_class=Chunk, vectorized=False):
+        self._chunk_class = chunk_class
+        self._vectorized = vectorized
+        self._chunks = []
+        self._calculated = 0
 
-    def handle_endtag(self, name):
-        if name not in self._remove_without_data and self._remove == 0:
-            self._data.append(get_endtag_string(name))
+    def create(self, chunk, text=None, links_length=0, length_with_tags=None):
+        if text is None or not hasattr(self._chunk_class, 'set_text'):
+            # html is cleaned by the chunks cleaner, which expects normalized html
+            self._chunks.append(self._chunk_class(normalize_string(chunk)))
+            return
 
-        if name in self._remove_with_data:
-            self._remove -= 1
+        # extracted text is normalized only if the chunk is accepted (see Chunk.chunk)
+        chunk_object = self._chunk_class(chunk)
+        chunk_object.set_text(text, links_length, length_with_tags)
 
-    def handle_data(self, data):
-        if self._remove == 0:
-            self._data.append(data)
+        self._chunks.append(chunk_object)
 
     def clear(self):
-        self._remove = 0
-        self._data.clear()
+        self._chunks.clear()
+        self._calculated = 0
+
+    def calculate_weights(self, cleaner, punctuation):
+        # only chunks created after the previous call (document can be fed by parts)
+        chunks = self._chunks[self._calculated:]
+        self._calculated = len(self._chunks)
+
+        if not self._vectorized or not chunks:
+            for chunk in chunks:
+                chunk.make_calculations(cleaner, punctuation)
+
+            return
+
+        for chunk in chunks:
+            chunk.calculate_features(cleaner, punctuation)
+
+        features = zip(*(chunk.features for chunk in chunks))
+
+        for chunk, weight in zip(chunks, calculate_weights(*features)):
+            chunk.weight = weight
+
+    def iter_useful_text(self, min_allowed_weight):
+        """Yields text of chunks which weight is not less than min_allowed_weight."""
+        for chunk in self._chunks:
+            if chunk.weight >= min_allowed_weight:
+                yield chunk.chunk.strip()
+
+    def measure_useful_text(self, min_allowed_weight, start=0):
+        """Returns number of chunks (from start) which weight is not less than min_allowed_weight
+        and total length of their text, without joining it.
+        """
+        count = length = 0
+
+        for chunk in itertools.islice(self._chunks, start, self._calculated):
+            if chunk.weight >= min_allowed_weight:
+                count += 1
+                length += len(chunk.chunk.strip())
+
+        return count, length
+
+    def pop_calculated(self):
+        chunks = self._chunks[:self._calculated]
+
+        del self._chunks[:self._calculated]
+        self._calculated = 0
+
+        return chunks
 
     @property
     def data(self):
-        return ''.join(self._data)
+        return self._chunks
 
+    @property
+    def calculated(self):
+        return self._calculated
 
-class HTMLChunksCleaner(parser.HTMLParser):
-    """Creates object that can remove html tags from chunks
-    and calculate length of links in the chunk if needed
 
-    Usage:
-        cleaner = HTMLChunksCleaner()
-        cleaner.feed(data)
+ChunkRecord = collections.namedtuple(
+    'ChunkRecord',
+    ('chunk', 'weight', 'length_with_tags', 'length_without_tags', 'length_of_links', 'count_of_punctuation_marks')
+)
 
-    Args:
-        tag_link: Tag link.
-        need_calculate_length: It identifies the need to calculate length of links
+
+class ColumnarChunksWrapper:
+    """Creates wrapper for html chunks, which keeps them in columns instead of Chunk objects.
+
+    Text of a new chunk (or html, if the text was not extracted by the splitter) is written to
+    a text buffer of new chunks, and its lengths are written to arrays, so no objects are kept for
+    chunks until their weights are calculated. Then text of new chunks is moved to one text buffer
+    of the document, and their numbers of punctuation marks and weights are written to arrays too,
+    so memory depends on size of text rather than on number of chunks. Weights of new chunks are
+    calculated at once (see scoring.calculate_weights). Excess spaces are removed from text of
+    a chunk only when it is read.
+
+    Property 'data' returns sequence of ChunkRecord tuples, which have the same properties as
+    Chunk objects. Unlike ChunksWrapper, only chunks with calculated weights are in 'data'.
 
     Returns:
-        HTMLChunksCleaner object.
+        ColumnarChunksWrapper object.
+    """
+    def __init__(self):
+        # new chunks: text (or html) and end of every chunk in it, links length is -1 for html
+        self._new_buffer = io.StringIO()
+        self._new_ends = array.array('q')
+        self._new_lengths_with_tags = array.array('i')
+        self._new_links_lengths = array.array('i')
+
+        self._buffer = io.StringIO()
+        self._buffer_value = None
+
+        # end of text of every chunk in the buffer
+        self._ends = array.array('q')
+        self._lengths_with_tags = array.array('i')
+        self._lengths_without_tags = array.array('i')
+        self._links_lengths = array.array('i')
+        self._counts_of_punctuation_marks = array.array('i')
+        self._weights = array.array('d')
+
+    def create(self, chunk, text=None, links_length=0, length_with_tags=None):
+        if text is not None:
+            if length_with_tags is None:
+                length_with_tags = normalized_length(chunk)
+
+            # html is not needed if the text was extracted by the splitter
+            self._new_buffer.write(text)
+        else:
+            chunk = normalize_string(chunk)
+            length_with_tags = len(chunk)
+            links_length = -1
 
-        HTMLChunksCleaner(tag_link='a', need_calculate_length=False) -> html cleaner
+            self._new_buffer.write(chunk)
 
-    Methods defined here:
-        feed(self, data)
-            Feed data to the cleaner.
+        self._new_ends.append(self._new_buffer.tell())
+        self._new_lengths_with_tags.append(length_with_tags)
+        self._new_links_lengths.append(links_length)
 
-        clear(self)
-            Reset this instance.
+    def clear(self):
+        self._clear_new_chunks()
+        self._clear_columns()
+
+    def calculate_weights(self, cleaner, punctuation):
+        if not self._new_ends:
+            return
+
+        start = len(self._weights)
+        new_chunks = self._new_buffer.getvalue()
+        position = 0
+
+        for end, links_length in zip(self._new_ends, self._new_links_lengths):
+            text = new_chunks[position:end]
+            position = end
+
+            if links_length < 0:
+                cleaner.feed(text)
+                text = cleaner.data
+                links_length = cleaner.links_length
+
+            self._buffer.write(text)
+            self._ends.append(self._buffer.tell())
+
+            self._lengths_without_tags.append(len(text))
+            self._links_lengths.append(links_length)
+            self._counts_of_punctuation_marks.append(count_punctuation_marks(text, punctuation))
+
+        self._lengths_with_tags.extend(self._new_lengths_with_tags)
+        self._clear_new_chunks()
+        self._buffer_value = None
+
+        self._weights.extend(calculate_weights(
+            self._lengths_with_tags[start:],
+            self._lengths_without_tags[start:],
+            self._links_lengths[start:],
+            self._counts_of_punctuation_marks[start:]
+        ))
+
+    def iter_useful_text(self, min_allowed_weight):
+        """Yields text of chunks which weight is not less than min_allowed_weight."""
+        # weights are checked first, so text of rejected chunks is not read from the buffer
+        for index, weight in enumerate(self._weights):
+            if weight >= min_allowed_weight:
+                yield self._get_record(index).chunk
+
+    def measure_useful_text(self, min_allowed_weight, start=0):
+        """Returns number of chunks (from start) which weight is not less than min_allowed_weight
+        and total length of their text, without creating records and joining the buffer.
+        """
+        count = length = 0
 
-    Properties:
-        data: Return cleaned data.
-        links_length: Return length of links.
-        tag_link: Return tag link.
-    """
-    _first_run = False
+        for index in range(start, len(self._weights)):
+            if self._weights[index] >= min_allowed_weight:
+                count += 1
+                length += normalized_length(self._read_text(index))
 
-    def __init__(self, tag_link='a', need_calculate_length=True):
-        self._tag_link = tag_link
-        self._need_calculate_length = need_calculate_length
+        return count, length
 
-        self._links_length = 0
-        self._calculate_links_length = 0
+    def pop_calculated(self):
+        chunks = list(self.data)
+        self._clear_columns()
 
-        self._data = []
+        return chunks
 
-        super(HTMLChunksCleaner, self).__init__(convert_charrefs=True)
+    def _clear_new_chunks(self):
+        self._new_buffer = io.StringIO()
 
-    def feed(self, data):
-        if self._first_run:
-            self.clear()
-        else:
-            self._first_run = True
+        for column in (self._new_ends, self._new_lengths_with_tags, self._new_links_lengths):
+            del column[:]
 
-        super(HTMLChunksCleaner, self).feed(data)
+    def _clear_columns(self):
+        self._buffer = io.StringIO()
+        self._buffer_value = None
 
-    def handle_starttag(self, name, attrs):
-        if self._need_calculate_length and name == self._tag_link:
-            self._calculate_links_length += 1
+        for column in (self._ends, self._lengths_with_tags, self._lengths_without_tags,
+                       self._links_lengths, self._counts_of_punctuation_marks, self._weights):
+            del column[:]
 
-    def handle_endtag(self, name):
-        if self._need_calculate_length and name == self._tag_link:
-            self._calculate_links_length -= 1
+    def _read_text(self, index):
+        start = self._ends[index - 1] if index > 0 else 0
 
-    def handle_data(self, data):
-        if self._need_calculate_length and self._calculate_links_length > 0:
-            self._links_length += len(data)
+        if self._buffer_value is not None:
+            return self._buffer_value[start:self._ends[index]]
 
-        self._data.append(data)
+        # text of one chunk is read, new text is written to the end of the buffer
+        self._buffer.seek(start)
+        text = self._buffer.read(self._ends[index] - start)
+        self._buffer.seek(0, io.SEEK_END)
 
-    def clear(self):
-        self._links_length = 0
-        self._calculate_links_length = 0
-        self._data.clear()
+        return text
+
+    def _get_record(self, index):
+        if self._buffer_value is None:
+            self._buffer_value = self._buffer.getvalue()
+
+        start = self._ends[index - 1] if index > 0 else 0
+
+        return ChunkRecord(
+            normalize_string(self._buffer_value[start:self._ends[index]]),
+            self._weights[index],
+            self._lengths_with_tags[index],
+            self._lengths_without_tags[index],
+            self._links_lengths[index],
+            self._counts_of_punctuation_marks[index]
+        )
 
     @property
     def data(self):
-        return ''.join(self._data)
+        return ColumnarChunksView(self)
 
     @property
-    def links_length(self):
-        return self._links_length
+    def calculated(self):
+        return len(self._weights)
 
-    @property
-    def tag_link(self):
-        return self._tag_link
 
-    @tag_link.setter
-    def tag_link(self, value):
-        if not isinstance(value, str):
-            raise TypeError('This parameter can only be a str type')
+class ColumnarChunksView(collections.abc.Sequence):
+    """Sequence of ChunkRecord tuples of ColumnarChunksWrapper, tuples are created on access."""
+    def __init__(self, chunks_wrapper, indexes=None):
+        self._chunks_wrapper = chunks_wrapper
+        self._indexes = range(chunks_wrapper.calculated) if indexes is None else indexes
 
-        self._tag_link = value
+    def __len__(self):
+        return len(self._indexes)
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarChunksView(self._chunks_wrapper, self._indexes[index])
 
-class HTMLSplitter(parser.HTMLParser):
-    """Creates object that can split html document on little blocks.
+        return self._chunks_wrapper._get_record(self._indexes[index])
 
-    Usage:
-        splitter = HTMLSplitter(
-            tags_to_save={'title'},
-            tags_to_remove={'head', 'script', 'style', 'pre', 'code'},
-            tag_wrapper=get_tag_wrapper(...),
-            cunks_wrapper=get_chunks_wrapper(...),
-            save_chunks_wrapper=get_save_chunks_wrapper(...)
-        )
-        splitter.feed(html)
+
+class SaveChunksWrapper:
+    """Creates wrapper for 'save' chunks, which keeps text of tags from 'tags_to_save' set.
+
+    Splitters pass plain text of saved elements (without tags), empty texts are not kept. When
+    a tag has the maximum number of texts, splitters stop collecting its text.
 
     Args:
-        tags_to_save: A set of tags for saving.
-        tags_to_remove: A set of tags for removing.
-        tag_wrapper: A wrapper for tags.
-        chunks_wrapper: A wrapper for html blocks.
-        save_chunks_wrapper: A wrapper for tags from 'tags_to_save' set.
+        max_per_tag: Maximum number of texts of every tag (0 - unlimited).
+        first_only: Tags which only the first text is kept for (FIRST_ONLY_TAGS - only the title
+            of the document, <title> elements of svg images in the body are not saved).
 
     Returns:
-        HTMLSplitter object.
+        SaveChunksWrapper object.
 
     Methods defined here:
-        feed(self, data)
-            Feed html document to splitter.
+        create(self, chunk, tag_name)
+            Save text of the tag.
+
+        is_full(self, tag_name)
+            Return True if no more texts of the tag are saved.
+
+        remove_tags(self, cleaner)
+            Remove tags from saved texts with HTMLChunksCleaner (for texts which contain html).
 
         clear(self)
-            Reset parser instance.
+            Remove saved texts.
 
     Properties:
-        data: Return list of chunks (html blocks).
-        saved_tags: Return saved tags (which contained by 'tags_to_save' set).
-        chunks_wrapper: Return chunks wrapper.
-        save_chunks_wrapper: Return 'save' chunks wrapper.
+        data: Return saved texts by tags ({'title': ['Example'], 'h1': [...]}).
+        max_per_tag: Return maximum number of texts of every tag.
     """
-    _first_run = False
+    def __init__(self, max_per_tag=0, first_only=frozenset()):
+        self._max_per_tag = max_per_tag
+        self._first_only = first_only
+        self._save_chunks = {}
 
-    def __init__(self, tags_to_save=set(), tags_to_remove=set(), tag_wrapper=None, chunks_wrapper=None,
-                 save_chunks_wrapper=None):
-        self._tags_to_save = tags_to_save
-        self._tags_to_remove = tags_to_remove
+    def create(self, chunk, tag_name):
+        texts = self._save_chunks.get(tag_name)
 
-        # wrappers
-        self._tag_wrapper = tag_wrapper
-        self._chunks = chunks_wrapper
-        self._save_chunks = save_chunks_wrapper
+        if texts is None:
+            texts = self._save_chunks[tag_name] = []
+        elif self.is_full(tag_name):
+            return
 
-        # parameters needed in parsing process
-        self._opened_tags = []
-        self._save = 0
-        self._remove = 0
-        self._temp_chunk = []
-        self._chunk_started = False
+        text = normalize_string(chunk)
 
-        self._temp_save_chuck = []
-        self._save_chunk_started = False
+        if text:
+            texts.append(text)
 
-        super(HTMLSplitter, self).__init__(convert_charrefs=True)
+    def is_full(self, tag_name):
+        texts = self._save_chunks.get(tag_name)
 
-    def feed(self, data):
-        if self._first_run:
-            self.clear()
-        else:
-            self._first_run = True
+        if not texts:
+            return False
 
-        super(HTMLSplitter, self).feed(data)
+        return tag_name in self._first_only or 0 < self._max_per_tag <= len(texts)
 
-    def handle_starttag(self, name, attrs):
-        tag = self._tag_wrapper.create(name, attrs)
+    def remove_tags(self, cleaner):
+        for texts in self._save_chunks.values():
+            cleaned = []
 
-        self._opened_tags.append(tag)
+            for text in texts:
+                cleaner.feed(text)
 
-        if name in self._tags_to_save:
-            self._save += 1
-        if name in self._tags_to_remove:
-            self._remove += 1
+                if cleaner.data:
+                    cleaned.append(cleaner.data)
 
-        if self._remove == 0 and self._chunk_started:
-            self._temp_chunk.append(self._tag_wrapper.starttag_string(tag))
-            tag.writed = True
+            texts[:] = cleaned
 
-        if self._save > 0:
-            self._temp_save_chuck.append(self._tag_wrapper.starttag_string(tag))
-            tag.writed = True
+    def clear(self):
+        self._save_chunks.clear()
 
-            if not self._save_chunk_started and name in self._tags_to_save:
-                tag.is_start_of_save_chunk = True
-                self._save_chunk_started = True
+    @property
+    def max_per_tag(self):
+        return self._max_per_tag
 
-    def handle_endtag(self, name):
-        tag = self._opened_tags.pop(-1)
+    @property
+    def data(self):
+        return self._save_chunks
 
-        if self._remove == 0:
-            if self._temp_chunk:
-                self._temp_chunk.append(self._tag_wrapper.endtag_string(tag))
 
-            if tag.is_start_of_chunk and name == tag.name:
-                self._create_chunk_and_reset()
+class Stats:
+    """Base class for statistics of processing of one document, all values are zero initially.
 
-        if self._save > 0:
-            self._temp_save_chuck.append(self._tag_wrapper.endtag_string(tag))
+    Methods defined here:
+        as_dict(self)
+            Return dictionary with all values.
+    """
+    __slots__ = ()
 
-        if tag.is_start_of_save_chunk and name == tag.name:
-            self._create_save_chunk_and_reset(tag.name)
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
 
-        if name in self._tags_to_save:
-            self._save -= 1
-        if name in self._tags_to_remove:
-            self._remove -= 1
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
 
-    def handle_data(self, data):
-        if not data.isspace():
-            tag = self ._opened_tags[-1]
+    def __repr__(self):
+        values = ', '.join('{0}={1!r}'.format(name, value) for name, value in self.as_dict().items())
 
-            if self._remove == 0:
-                if not self._chunk_started:
-                    tag.is_start_of_chunk = True
-                    self._chunk_started = True
+        return '{0}({1})'.format(type(self).__name__, values)
 
-                if self._chunk_started:
-                    self._add_data_to_chunk(data, tag)
 
-            if self._save > 0:
-                self._temp_save_chuck.append(data)
+class ParserStats(Stats):
+    """Creates statistics of processing of one document by parser.
 
-    def _add_data_to_chunk(self, data, tag):
-        if not tag.writed:
-            self._temp_chunk.append(self._tag_wrapper.starttag_string(tag))
-            tag.writed = True
+    Properties:
+        bytes_in: Size of the document (length of str or bytes which were fed).
+        bytes_out: Length of useful text.
+        tags: Number of start tags in the document.
+        chunks: Number of chunks (html blocks).
+        accepted_chunks: Number of chunks which weight is not less than min_allowed_weight.
+        split_time: Time of splitting the document to chunks in seconds.
+        weights_time: Time of calculating weights of chunks in seconds.
+        remove_tags_time: Time of removing tags from 'save' chunks in seconds (only if parser has
+            save_chunks_cleaner, saved texts of splitters are plain text).
+    """
+    __slots__ = (
+        'bytes_in',
+        'bytes_out',
+        'tags',
+        'chunks',
+        'accepted_chunks',
+        'split_time',
+        'weights_time',
+        'remove_tags_time'
+    )
 
-        self._temp_chunk.append(data)
 
-    def _create_chunk_and_reset(self):
-        self._chunks.create(''.join(self._temp_chunk))
-        self._temp_chunk.clear()
-        self._chunk_started = False
+class CleanerStats(Stats):
+    """Creates statistics of processing of one document by cleaner.
 
-    def _create_save_chunk_and_reset(self, tag_name):
-        self._save_chunks.create(''.join(self._temp_save_chuck), tag_name)
-        self._temp_save_chuck.clear()
-        self._save_chunk_started = False
+    Properties:
+        bytes_in: Length of the document.
+        bytes_out: Length of cleaned document.
+        tags: Number of start tags in the document.
+        feed_time: Time of processing the document in seconds.
+    """
+    __slots__ = (
+        'bytes_in',
+        'bytes_out',
+        'tags',
+        'feed_time'
+    )
 
-    def clear(self):
-        self._chunks.clear()
-        self._save_chunks.clear()
 
-        self._opened_tags.clear()
-        self._temp_chunk.clear()
-        self._temp_save_chuck.clear()
+class DocumentParser(parser.HTMLParser):
+    """Base class for html parsers of this module.
 
-        self._save = 0
-        self._remove = 0
+    Document can be fed at once or by parts (for example, as it is read from a socket or a file).
 
-        self._chunk_started = False
+    Usage:
+        document_parser.feed(html)
+
+        document_parser = SomeParser(incremental=True)
+        for part in parts:
+            document_parser.feed(part)
+        document_parser.close()
+
+    Args:
+        incremental: If it is False, every call of feed processes the whole document, results of
+            the previous call are removed. If it is True, feed can be called many times with parts
+            of the document, close must be called after the last part and reset before the next document.
+        convert_charrefs: If it is True, all character references are
+            automatically converted to the corresponding Unicode characters.
+        backend: Name of tokenizer which splits the document to tags and data ('html.parser' -
+            html.parser.HTMLParser, 'regex' - RegexTokenizer, which is faster, see get_tokenizer).
+            Character references are always converted by other backends than 'html.parser'.
+
+    Methods defined here:
+        feed(self, data)
+            Feed the document (or a part of it in incremental mode).
+
+        push(self, data)
+            Feed a part of the document regardless of the mode.
+
+        close(self)
+            Process buffered data, the document is finished.
+
+        reset(self)
+            Reset this instance, results of the previous document are removed.
+
+        clear(self)
+            Remove results of the previous document.
+
+        skip_content(self, name, keep=(), open_names=())
+            Skip content of the element, which start tag is being handled, without parsing it.
+
+    Properties:
+        incremental: Return True if document can be fed by parts.
+        backend: Return name of the tokenizer.
+        skipped_element: Return tuple (name, keep, open_names) from the last call of skip_content
+            (None if content is not requested to be skipped), it is reset by the tokenizer.
+    """
+    def __init__(self, incremental=False, convert_charrefs=True, backend='html.parser'):
+        self._incremental = incremental
+        self._backend = backend
+
+        # element which content is requested to be skipped by handle_starttag -> (name, keep, open_names)
+        self._skipped_element = None
+
+        # None if the document is parsed by html.parser.HTMLParser itself
+        self._tokenizer = get_tokenizer(backend, self)
+
+        if self._tokenizer is not None and not convert_charrefs:
+            raise ValueError('Character references are always converted by {0!r} backend'.format(backend))
+
+        super(DocumentParser, self).__init__(convert_charrefs=convert_charrefs)
+
+    def feed(self, data):
+        if self._incremental:
+            self.push(data)
+        else:
+            self.reset()
+            self.push(data)
+            self.close()
+
+    def push(self, data):
+        if self._tokenizer is None:
+            super(DocumentParser, self).feed(data)
+        else:
+            self._tokenizer.feed(data)
+
+    def close(self):
+        if self._tokenizer is None:
+            super(DocumentParser, self).close()
+        else:
+            self._tokenizer.close()
+
+    def reset(self):
+        super(DocumentParser, self).reset()
+
+        if self._tokenizer is not None:
+            self._tokenizer.reset()
+
+        self.clear()
+
+    def clear(self):
+        pass
+
+    def skip_content(self, name, keep=(), open_names=()):
+        """Skips content of the element, which start tag is being handled, without parsing it.
+
+        The method must be called from handle_starttag. Content is passed to handle_data as one
+        string (like content of <script>) and the end tag is handled as usual. Content is parsed
+        as usual if the end tag is not fed yet, or if there are comments, <script>, <style>, nested
+        elements with the same name or elements with names from 'keep' before the end tag. Start
+        tags which can close the element or its parents before its end tag (<li> in <li>, <div>
+        in <p>, see IMPLIED_END_TAGS) and end tags of its parents block skipping too.
+
+        Args:
+            name: Name of the element.
+            keep: Names of elements which must not be skipped.
+            open_names: Names of open elements, including the element (collection which supports 'in').
+        """
+        keep = frozenset(keep).union(*(
+            closing_tags for closed_name, closing_tags in CLOSING_START_TAGS.items() if closed_name in open_names
+        ))
+
+        self._skipped_element = (name, keep, open_names)
+
+    def parse_starttag(self, i):
+        self._skipped_element = None
+        end = super(DocumentParser, self).parse_starttag(i)
+
+        if self._skipped_element is not None and end >= 0 and self.cdata_elem is None:
+            if can_skip_content(self.rawdata, end, *self._skipped_element):
+                self.set_cdata_mode(self._skipped_element[0])
+
+        self._skipped_element = None
+
+        return end
+
+    def handle_startendtag(self, name, attrs):
+        self.handle_starttag(name, attrs)
+        self.handle_endtag(name)
+
+        # empty element has no content
+        self._skipped_element = None
+
+    @property
+    def incremental(self):
+        return self._incremental
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def skipped_element(self):
+        return self._skipped_element
+
+    @skipped_element.setter
+    def skipped_element(self, value):
+        self._skipped_element = value
+
+
+class Cleaner(DocumentParser):
+    """Creates object for remove tags from html documents
+
+    Args:
+        remove_without_data: A set of tags which will be removed without their content.
+        remove_with_data: A set of tags which will be removed with content.
+        convert_charrefs: If it is True, all character references are
+            automatically converted to the corresponding Unicode characters.
+        incremental: If it is True, document can be fed by parts (see DocumentParser).
+        collect_stats: If it is True, statistics of every document are collected (see CleanerStats).
+        stats_callback: Function which is called with statistics after every document. Statistics
+            are collected if it is given.
+        skip_removed: If it is True, content of tags from 'remove_with_data' set is skipped without
+            parsing when it is possible (see DocumentParser.skip_content). Tags in the skipped
+            content are not counted in statistics.
+        remove_selectors: Selectors of elements which will be removed with content ('div.sidebar',
+            '#menu', '[role=navigation]', see SelectorMatcher).
+        backend: Name of tokenizer (see DocumentParser).
+
+    Returns:
+        Cleaner object.
+
+    Properties:
+        data: Return cleaned document.
+        stats: Return statistics of the last document (None if statistics are not collected).
+    """
+    def __init__(self, remove_without_data=set(), remove_with_data=set(), convert_charrefs=True,
+                 incremental=False, collect_stats=False, stats_callback=None, skip_removed=False,
+                 remove_selectors=(), backend='html.parser'):
+        self._remove_without_data = remove_without_data
+        self._remove_with_data = remove_with_data
+        self._selectors = get_selector_matcher(frozenset(remove_selectors))
+        self._skip_removed = skip_removed
+
+        # depth of the removed element in the stack of open elements (0 - nothing is removed)
+        self._remove = 0
+        self._tags_count = 0
+
+        # names of open elements and their numbers, elements which end tags are implied are closed
+        # like in HTMLSplitter, so removed elements end where the splitter of the cleaned html ends them
+        self._names = []
+        self._open_counts = {}
+
+        self._data = []
+
+        self._collect_stats = collect_stats or stats_callback is not None
+        self._stats_callback = stats_callback
+        self._stats = None
+
+        super(Cleaner, self).__init__(incremental=incremental, convert_charrefs=convert_charrefs, backend=backend)
+
+    def push(self, data):
+        if self._stats is None:
+            super(Cleaner, self).push(data)
+        else:
+            start = time.perf_counter()
+            super(Cleaner, self).push(data)
+
+            self._stats.feed_time += time.perf_counter() - start
+            self._stats.bytes_in += len(data)
+
+    def close(self):
+        if self._stats is None:
+            super(Cleaner, self).close()
+        else:
+            start = time.perf_counter()
+            super(Cleaner, self).close()
+
+            self._stats.feed_time += time.perf_counter() - start
+            self._stats.tags = self._tags_count
+            self._stats.bytes_out = sum(map(len, self._data))
+
+            if self._stats_callback is not None:
+                self._stats_callback(self._stats)
+
+    def reset(self):
+        super(Cleaner, self).reset()
+
+        if self._collect_stats:
+            self._stats = CleanerStats()
+
+    def handle_starttag(self, name, attrs):
+        self._tags_count += 1
+
+        if self._remove > 0:
+            if name in self._remove_without_data:
+                return
+
+            end = self._get_implied_end(name)
+
+            if end >= self._remove:
+                # the element is in the removed content
+                self._close(end)
+
+                if name not in VOID_ELEMENTS:
+                    self._open(name)
+
+                return
+
+            # the removed element is closed by the element (<li> by the next <li>)
+            self._close(self._remove - 1)
+
+        if name in self._remove_with_data or self._selectors is not None and self._selectors.match(name, attrs):
+            if name not in VOID_ELEMENTS:
+                # removed element is not in the cleaned html, so it doesn't close other elements
+                self._open(name)
+                self._remove = len(self._names)
+
+                if self._skip_removed:
+                    self.skip_content(name, open_names=self._open_counts)
+        elif name not in self._remove_without_data:
+            self._close(self._get_implied_end(name))
+
+            if name not in VOID_ELEMENTS:
+                self._open(name)
+
+            self._data.append(get_starttag_string(name, attrs))
+
+    def handle_endtag(self, name):
+        if self._remove > 0:
+            if name not in self._open_counts:
+                return
+
+            # end tag of an element in the removed content, or of an element which contains the removed one
+            while self._remove > 0:
+                if self._names[-1] == name:
+                    self._close_top()
+                    return
+
+                self._close_top()
+
+        if name in self._open_counts:
+            while self._names[-1] != name:
+                self._close_top()
+
+            self._close_top()
+
+        if name not in self._remove_without_data and name not in self._remove_with_data:
+            self._data.append(get_endtag_string(name))
+
+    def handle_data(self, data):
+        if self._remove == 0:
+            self._data.append(data)
+
+    def _open(self, name):
+        self._names.append(name)
+        self._open_counts[name] = self._open_counts.get(name, 0) + 1
+
+    def _close(self, end):
+        # closes open elements from the top of the stack to the given depth
+        while len(self._names) > end:
+            self._close_top()
+
+    def _close_top(self):
+        name = self._names.pop()
+        count = self._open_counts.pop(name) - 1
+
+        if count:
+            self._open_counts[name] = count
+
+        # the removed element is closed
+        if len(self._names) < self._remove:
+            self._remove = 0
+
+    def _get_implied_end(self, name):
+        if name not in IMPLIED_END_TAGS or IMPLIED_END_TAGS[name][0].isdisjoint(self._open_counts):
+            return len(self._names)
+
+        return get_implied_end(name, self._names, self._open_counts)
+
+    def clear(self):
+        self._remove = 0
+        self._tags_count = 0
+        self._names.clear()
+        self._open_counts.clear()
+        self._data.clear()
+
+    @property
+    def data(self):
+        return ''.join(self._data)
+
+    @property
+    def stats(self):
+        return self._stats
+
+
+class HTMLChunksCleaner(DocumentParser):
+    """Creates object that can remove html tags from chunks
+    and calculate length of links in the chunk if needed
+
+    Usage:
+        cleaner = HTMLChunksCleaner()
+        cleaner.feed(data)
+
+    Args:
+        tag_link: Tag link.
+        need_calculate_length: It identifies the need to calculate length of links
+        backend: Name of tokenizer (see DocumentParser).
+
+    Returns:
+        HTMLChunksCleaner object.
+
+        HTMLChunksCleaner(tag_link='a', need_calculate_length=False) -> html cleaner
+
+    Methods defined here:
+        feed(self, data)
+            Feed data to the cleaner.
+
+        clear(self)
+            Reset this instance.
+
+    Properties:
+        data: Return cleaned data.
+        links_length: Return length of links.
+        tag_link: Return tag link.
+    """
+    def __init__(self, tag_link='a', need_calculate_length=True, backend='html.parser'):
+        self._tag_link = tag_link
+        self._need_calculate_length = need_calculate_length
+
+        self._links_length = 0
+        self._calculate_links_length = 0
+
+        self._data = []
+
+        super(HTMLChunksCleaner, self).__init__(convert_charrefs=True, backend=backend)
+
+    def handle_starttag(self, name, attrs):
+        if self._need_calculate_length and name == self._tag_link:
+            self._calculate_links_length += 1
+
+    def handle_endtag(self, name):
+        if self._need_calculate_length and name == self._tag_link:
+            self._calculate_links_length -= 1
+
+    def handle_data(self, data):
+        if self._need_calculate_length and self._calculate_links_length > 0:
+            self._links_length += len(data)
+
+        self._data.append(data)
+
+    def clear(self):
+        self._links_length = 0
+        self._calculate_links_length = 0
+        self._data.clear()
+
+    @property
+    def data(self):
+        return ''.join(self._data)
+
+    @property
+    def links_length(self):
+        return self._links_length
+
+    @property
+    def tag_link(self):
+        return self._tag_link
+
+    @tag_link.setter
+    def tag_link(self, value):
+        if not isinstance(value, str):
+            raise TypeError('This parameter can only be a str type')
+
+        self._tag_link = value
+
+
+class HTMLSplitter(DocumentParser):
+    """Creates object that can split html document on little blocks.
+
+    Usage:
+        splitter = HTMLSplitter(
+            tags_to_save={'title'},
+            tags_to_remove={'head', 'script', 'style', 'pre', 'code'},
+            tag_wrapper=get_tag_wrapper(...),
+            cunks_wrapper=get_chunks_wrapper(...),
+            save_chunks_wrapper=get_save_chunks_wrapper(...)
+        )
+        splitter.feed(html)
+
+    Args:
+        tags_to_save: A set of tags for saving.
+        tags_to_remove: A set of tags for removing.
+        tag_wrapper: A wrapper for tags.
+        chunks_wrapper: A wrapper for html blocks.
+        save_chunks_wrapper: A wrapper for tags from 'tags_to_save' set. Method is_full (see
+            SaveChunksWrapper) is optional, all texts are collected if the wrapper doesn't have it.
+        tag_link: Tag link. Text of the links is counted while splitting, so chunks
+            don't need to be parsed again to calculate their weights.
+        remove_without_data: A set of tags which will be ignored, their content is processed
+            as if the tags were not in the document (like in Cleaner).
+        remove_with_data: A set of tags which will be ignored with all their content (like in Cleaner).
+        incremental: If it is True, document can be fed by parts (see DocumentParser). Chunks are
+            passed to the chunks wrapper as soon as they are closed.
+        skip_removed: If it is True, content of tags from 'tags_to_remove' (outside of tags for
+            saving) and 'remove_with_data' sets is skipped without parsing when it is possible
+            (see DocumentParser.skip_content). Tags in the skipped content are not counted.
+        remove_selectors: Selectors of elements which will be ignored with all their content
+            ('div.sidebar', '#menu', '[role=navigation]', see SelectorMatcher).
+        backend: Name of tokenizer (see DocumentParser).
+        attributes_to_save: Attributes which values are saved with text of tags ('a[href]',
+            'meta[content]'), they are kept in saved tags by these keys.
+
+    Returns:
+        HTMLSplitter object.
+
+    Methods defined here:
+        feed(self, data)
+            Feed html document to splitter.
+
+        close(self)
+            Process buffered data and create chunks which were not closed in the document.
+
+        clear(self)
+            Reset parser instance.
+
+    Properties:
+        data: Return list of chunks (html blocks).
+        saved_tags: Return saved tags (which contained by 'tags_to_save' set).
+        tags_count: Return number of start tags in the document.
+        chunks_wrapper: Return chunks wrapper.
+        save_chunks_wrapper: Return 'save' chunks wrapper.
+        chunk_filter: Return function which is called with text of every closed chunk, chunk is
+            dropped without passing it to the chunks wrapper if the function returns True (None - all
+            chunks are kept). It can be changed between documents.
+    """
+    def __init__(self, tags_to_save=set(), tags_to_remove=set(), tag_wrapper=None, chunks_wrapper=None,
+                 save_chunks_wrapper=None, tag_link='a', remove_without_data=set(), remove_with_data=set(),
+                 incremental=False, skip_removed=False, remove_selectors=(), backend='html.parser',
+                 attributes_to_save=()):
+        self._tags_to_save = tags_to_save
+        self._tags_to_remove = tags_to_remove
+        self._tag_link = tag_link
+        self._skip_removed = skip_removed
+
+        # Cleaner rules, applied to events before splitting
+        self._remove_without_data = remove_without_data
+        self._remove_with_data = remove_with_data
+        self._filtered_tags = set(remove_without_data) | set(remove_with_data)
+        self._selectors = get_selector_matcher(frozenset(remove_selectors))
+        # depth of the ignored element in the stack of open elements (0 - nothing is ignored), ignored
+        # elements are kept in the stack of names above other open elements, but not in the stack of tags
+        self._drop = 0
+
+        # wrappers
+        self._tag_wrapper = tag_wrapper
+        self._chunks = chunks_wrapper
+        self._save_chunks = save_chunks_wrapper
+
+        # parameters needed in parsing process
+        self._opened_tags = []
+        self._names = []
+        # number of open elements by names (only names of open elements are kept)
+        self._open_counts = {}
+        self._tags_count = 0
+        self._save = 0
+        self._remove = 0
+        self._temp_chunk = []
+        self._chunk_started = False
+
+        # data between two tags, it is handled at once (filtered tags don't split it, like in Cleaner)
+        self._temp_data = []
+
+        # text of the current chunk and length of links in it, they are counted like in HTMLChunksCleaner,
+        # which gets normalized html of the chunk: number of link tags written to the chunk is tracked,
+        # and a space at the end of data is added to the text only if the chunk is continued
+        self._links = 0
+        self._temp_text = []
+        self._links_length = 0
+        self._space = False
+
+        self._temp_save_chuck = []
         self._save_chunk_started = False
 
+        # tags which text is collected (tags are removed when the save chunks wrapper is full)
+        self._collected_tags = set(tags_to_save)
+        # tag name -> tuple of (attribute, key in saved tags)
+        self._attributes_to_save = get_attributes_to_save(frozenset(attributes_to_save))
+
+        # function which is called with text of every closed chunk, chunk is dropped if it returns True
+        self._chunk_filter = None
+
+        super(HTMLSplitter, self).__init__(incremental=incremental, convert_charrefs=True, backend=backend)
+
+    def close(self):
+        super(HTMLSplitter, self).close()
+
+        # ignored elements which are not closed in the document
+        while self._drop > 0:
+            self._close_top()
+
+        if self._temp_data:
+            self._handle_temp_data()
+
+        # the document is finished, so blocks which were not closed by tags are finished too
+        if self._chunk_started:
+            self._create_chunk_and_reset()
+
+        if self._save_chunk_started:
+            self._create_save_chunk_and_reset(self._get_save_chunk_name())
+
+    def _get_save_chunk_name(self):
+        # name of the open element which started the save chunk
+        return next(tag.name for tag in self._opened_tags if tag.is_start_of_save_chunk)
+
+    def handle_starttag(self, name, attrs):
+        if self._drop > 0:
+            if name in self._remove_without_data:
+                return
+
+            implied = IMPLIED_END_TAGS.get(name)
+            end = len(self._names)
+
+            if implied is not None and not implied[0].isdisjoint(self._open_counts):
+                end = get_implied_end(name, self._names, self._open_counts)
+
+            if end >= self._drop:
+                # the element is in the ignored content
+                while len(self._names) > end:
+                    self._close_top()
+
+                if name not in VOID_ELEMENTS:
+                    self._names.append(name)
+                    self._open_counts[name] = self._open_counts.get(name, 0) + 1
+
+                return
+
+            # the ignored element is closed by the element (<li> by the next <li>)
+            while self._drop > 0:
+                self._close_top()
+
+        if name in self._remove_with_data or self._selectors is not None and self._selectors.match(name, attrs):
+            if name not in VOID_ELEMENTS:
+                # ignored element is not in the cleaned html, so it doesn't close other elements
+                self._names.append(name)
+                self._open_counts[name] = self._open_counts.get(name, 0) + 1
+                self._drop = len(self._names)
+
+                if self._skip_removed:
+                    self.skip_content(name, open_names=self._open_counts)
+
+            return
+
+        if name in self._remove_without_data:
+            return
+
+        if self._temp_data:
+            self._handle_temp_data()
+
+        if self._chunk_started and not self._names:
+            self._create_chunk_and_reset()
+
+        if self._attributes_to_save is not None and name in self._attributes_to_save:
+            self._save_attributes(name, attrs)
+
+        implied = IMPLIED_END_TAGS.get(name)
+
+        if implied is not None and not implied[0].isdisjoint(self._open_counts):
+            self._close_implied(name)
+
+        self._tags_count += 1
+
+        self._names.append(name)
+        self._open_counts[name] = self._open_counts.get(name, 0) + 1
+        self._open_tag(name, attrs)
+
+        if name in VOID_ELEMENTS:
+            self._close_top()
+
+            # void element has no content
+            self._skipped_element = None
+
+    def handle_endtag(self, name):
+        if self._drop > 0:
+            if name not in self._open_counts:
+                return
+
+            # end tag of an element in the ignored content, or of an element which contains the ignored one
+            while self._drop > 0:
+                if self._names[-1] == name:
+                    self._close_top()
+                    return
+
+                self._close_top()
+
+        if name in self._filtered_tags:
+            return
+
+        if self._temp_data:
+            self._handle_temp_data()
+
+        if self._chunk_started and not self._names:
+            self._create_chunk_and_reset()
+
+        # end tag without open element is ignored
+        if name not in self._open_counts:
+            return
+
+        # elements which are opened inside the closed one and not closed yet are closed with it
+        while self._names[-1] != name:
+            self._close_top()
+
+        self._close_top()
+
+    def handle_data(self, data):
+        if self._drop == 0:
+            self._temp_data.append(data)
+
+    def _handle_temp_data(self):
+        data = ''.join(self._temp_data)
+        self._temp_data.clear()
+
+        if data.isspace():
+            # spaces between tags are not added to chunks (they separate words of saved texts)
+            if self._save_chunk_started:
+                self._temp_save_chuck.append(data)
+        elif not self._names:
+            self._add_data_outside_of_tags(data)
+        else:
+            tag = self._opened_tags[-1]
+
+            if self._remove == 0:
+                if not self._chunk_started:
+                    tag.is_start_of_chunk = True
+                    self._chunk_started = True
+
+                if self._chunk_started:
+                    self._add_data_to_chunk(data, tag)
+
+            if self._save_chunk_started:
+                self._temp_save_chuck.append(data)
+
+    def _open_tag(self, name, attrs):
+        tag = self._tag_wrapper.create(name, attrs)
+
+        self._opened_tags.append(tag)
+
+        if name in self._tags_to_save:
+            self._save += 1
+        if name in self._tags_to_remove:
+            self._remove += 1
+
+            if self._skip_removed and self._remove == 1 and self._save == 0:
+                self.skip_content(name, self._get_kept_tags(), self._open_counts)
+
+        if self._remove == 0 and self._chunk_started:
+            self._write_tag(self._tag_wrapper.starttag_string(tag), name, 1)
+            tag.writed = True
+
+        if self._save > 0:
+            # chunks which start inside saved elements don't include their start tags
+            tag.writed = True
+
+            if not self._save_chunk_started and name in self._collected_tags:
+                tag.is_start_of_save_chunk = True
+                self._save_chunk_started = True
+
+    def _close_top(self):
+        name = self._names.pop()
+        count = self._open_counts.pop(name) - 1
+
+        if count:
+            self._open_counts[name] = count
+
+        if self._drop > 0:
+            # elements of the ignored content have no tags
+            if len(self._names) < self._drop:
+                self._drop = 0
+
+            return
+
+        tag = self._opened_tags.pop()
+        endtag = name not in VOID_ELEMENTS
+
+        if self._remove == 0:
+            if self._temp_chunk and endtag:
+                self._write_tag(self._tag_wrapper.endtag_string(tag), name, -1)
+
+            if tag.is_start_of_chunk:
+                self._create_chunk_and_reset()
+
+        if tag.is_start_of_save_chunk:
+            self._create_save_chunk_and_reset(name)
+
+        if name in self._tags_to_save:
+            self._save -= 1
+        if name in self._tags_to_remove:
+            self._remove -= 1
+
+    def _close_implied(self, name):
+        """Closes open elements which can't contain the element with given name (<p> in <p>, <li> in <li>, ...)."""
+        end = get_implied_end(name, self._names, self._open_counts)
+
+        while len(self._names) > end:
+            self._close_top()
+
+    def _add_data_outside_of_tags(self, data):
+        # text before the first tag or after the last end tag is a chunk by itself, it is created
+        # on the next tag or when the document is closed (the text can be passed by parts)
+        self._add_text(data)
+        self._temp_chunk.append(data)
+        self._chunk_started = True
+
+    def _add_data_to_chunk(self, data, tag):
+        if not tag.writed:
+            self._write_tag(self._tag_wrapper.starttag_string(tag), tag.name, 1)
+            tag.writed = True
+
+        self._add_text(data)
+        self._temp_chunk.append(data)
+
+    def _add_text(self, data):
+        # spaces are collapsed, but the space between data and a tag is kept (it is not at the edge
+        # of the normalized html), it must be called before data is added to html of the chunk
+        text = ' '.join(data.split())
+
+        if self._space or data[0].isspace() and self._is_chunk_written():
+            text = ' ' + text
+
+        self._temp_text.append(text)
+        self._space = data[-1].isspace()
+
+        if self._links > 0:
+            self._links_length += len(text)
+
+    def _is_chunk_written(self):
+        return bool(self._temp_chunk)
+
+    def _write_tag(self, string, name, links):
+        # links is 1 for start tags and -1 for end tags
+        if self._space:
+            self._temp_text.append(' ')
+            self._space = False
+
+            if self._links > 0:
+                self._links_length += 1
+
+        self._temp_chunk.append(string)
+
+        if name == self._tag_link:
+            self._links += links
+
+    def _create_chunk_and_reset(self):
+        text = ''.join(self._temp_text)
+
+        if self._chunk_filter is None or not self._chunk_filter(text):
+            self._chunks.create(''.join(self._temp_chunk), text=text, links_length=self._links_length)
+
+        self._temp_chunk.clear()
+        self._temp_text.clear()
+        self._links = 0
+        self._links_length = 0
+        self._space = False
+        self._chunk_started = False
+
+    def _create_save_chunk_and_reset(self, tag_name):
+        self._save_chunks.create(''.join(self._temp_save_chuck), tag_name)
+        self._temp_save_chuck.clear()
+        self._save_chunk_started = False
+
+        # wrappers without method is_full keep all texts
+        is_full = getattr(self._save_chunks, 'is_full', None)
+
+        # text of the tag is not collected any more, its elements are handled as other elements
+        if is_full is not None and is_full(tag_name):
+            self._collected_tags.discard(tag_name)
+
+    def _save_attributes(self, name, attrs):
+        values = dict(attrs)
+
+        for attribute, key in self._attributes_to_save[name]:
+            value = values.get(attribute)
+
+            if value is not None:
+                self._save_chunks.create(value, key)
+
+    def _get_kept_tags(self):
+        # elements which must not be skipped: their text or attributes are saved
+        if self._attributes_to_save is None:
+            return self._collected_tags
+
+        return self._collected_tags.union(self._attributes_to_save)
+
+    def clear(self):
+        self._chunks.clear()
+        self._save_chunks.clear()
+
+        self._opened_tags.clear()
+        self._names.clear()
+        self._open_counts.clear()
+        self._temp_chunk.clear()
+        self._temp_data.clear()
+        self._temp_text.clear()
+        self._temp_save_chuck.clear()
+
+        self._tags_count = 0
+        self._save = 0
+        self._remove = 0
+        self._drop = 0
+        self._links = 0
+        self._links_length = 0
+        self._space = False
+
+        self._chunk_started = False
+        self._save_chunk_started = False
+
+        self._collected_tags.clear()
+        self._collected_tags.update(self._tags_to_save)
+
     @property
     def data(self):
         return self._chunks.data
 
-    @property
-    def saved_tags(self):
-        return self._save_chunks.data
+    @property
+    def tags_count(self):
+        return self._tags_count
+
+    @property
+    def saved_tags(self):
+        return self._save_chunks.data
+
+    @property
+    def chunks_wrapper(self):
+        return self._chunks
+
+    @property
+    def save_chunks_wrapper(self):
+        return self._save_chunks
+
+    @property
+    def chunk_filter(self):
+        return self._chunk_filter
+
+    @chunk_filter.setter
+    def chunk_filter(self, value):
+        self._chunk_filter = value
+
+
+class FastHTMLSplitter(HTMLSplitter):
+    """Creates splitter which produces the same chunks as HTMLSplitter with less work per tag.
+
+    Open tags are kept in two stacks (names and flags) instead of Tag objects, tag strings are
+    created once for every tag name and then taken from cache. Html of a chunk is not built,
+    only its length without excess spaces is counted (which is enough for calculating weights):
+    it is the length of the text of the chunk plus lengths of its tags. Attributes of tags are
+    not kept, so the splitter is used only with save_attrs=False.
+
+    Args:
+        tags_to_save: A set of tags for saving.
+        tags_to_remove: A set of tags for removing.
+        chunks_wrapper: A wrapper for html blocks.
+        save_chunks_wrapper: A wrapper for tags from 'tags_to_save' set.
+        tag_link: Tag link.
+        remove_without_data: The same as in HTMLSplitter.
+        remove_with_data: The same as in HTMLSplitter.
+        incremental: If it is True, document can be fed by parts (see DocumentParser).
+        skip_removed: The same as in HTMLSplitter.
+        remove_selectors: The same as in HTMLSplitter.
+        backend: The same as in HTMLSplitter.
+        attributes_to_save: The same as in HTMLSplitter.
+
+    Returns:
+        FastHTMLSplitter object.
+    """
+    # flags of open tags
+    WRITTEN = 1
+    START_OF_CHUNK = 2
+    START_OF_SAVE_CHUNK = 4
+
+    def __init__(self, tags_to_save=set(), tags_to_remove=set(), chunks_wrapper=None, save_chunks_wrapper=None,
+                 tag_link='a', remove_without_data=set(), remove_with_data=set(), incremental=False,
+                 skip_removed=False, remove_selectors=(), backend='html.parser', attributes_to_save=()):
+        self._flags = bytearray()
+
+        # length of tags written to the current chunk, tag strings have no spaces
+        self._tags_length = 0
+
+        # tag strings by tag names
+        self._starttags = {}
+        self._endtags = {}
+
+        super(FastHTMLSplitter, self).__init__(
+            tags_to_save=tags_to_save,
+            tags_to_remove=tags_to_remove,
+            chunks_wrapper=chunks_wrapper,
+            save_chunks_wrapper=save_chunks_wrapper,
+            tag_link=tag_link,
+            remove_without_data=remove_without_data,
+            remove_with_data=remove_with_data,
+            incremental=incremental,
+            skip_removed=skip_removed,
+            remove_selectors=remove_selectors,
+            backend=backend,
+            attributes_to_save=attributes_to_save
+        )
+
+    def _get_save_chunk_name(self):
+        index = next(index for index, flags in enumerate(self._flags) if flags & self.START_OF_SAVE_CHUNK)
+
+        return self._names[index]
+
+    def _handle_temp_data(self):
+        data = ''.join(self._temp_data)
+        self._temp_data.clear()
+
+        if data.isspace():
+            if self._save_chunk_started:
+                self._temp_save_chuck.append(data)
+
+            return
+
+        if not self._names:
+            self._add_data_outside_of_tags(data)
+            return
+
+        if self._remove == 0:
+            if not self._chunk_started:
+                self._flags[-1] |= self.START_OF_CHUNK
+                self._chunk_started = True
+
+            if not self._flags[-1] & self.WRITTEN:
+                name = self._names[-1]
+                self._write_tag(self._starttags[name], name, 1)
+                self._flags[-1] |= self.WRITTEN
+
+            self._add_text(data)
+
+        if self._save_chunk_started:
+            self._temp_save_chuck.append(data)
+
+    def _add_data_outside_of_tags(self, data):
+        self._add_text(data)
+        self._chunk_started = True
+
+    def _is_chunk_written(self):
+        return self._tags_length > 0 or len(self._temp_text) > 0
+
+    def _write_tag(self, string, name, links):
+        if self._space:
+            self._temp_text.append(' ')
+            self._space = False
+
+            if self._links > 0:
+                self._links_length += 1
+
+        self._tags_length += len(string)
+
+        if name == self._tag_link:
+            self._links += links
+
+    def _open_tag(self, name, attrs):
+        flags = 0
+
+        if name in self._tags_to_save:
+            self._save += 1
+        if name in self._tags_to_remove:
+            self._remove += 1
+
+            if self._skip_removed and self._remove == 1 and self._save == 0:
+                self.skip_content(name, self._get_kept_tags(), self._open_counts)
+
+        starttag = self._starttags.get(name)
+
+        if starttag is None:
+            starttag = self._starttags[name] = get_starttag_string(name, attrs, False)
+
+        if self._remove == 0 and self._chunk_started:
+            self._write_tag(starttag, name, 1)
+            flags = self.WRITTEN
+
+        if self._save > 0:
+            # chunks which start inside saved elements don't include their start tags
+            flags = self.WRITTEN
+
+            if not self._save_chunk_started and name in self._collected_tags:
+                flags |= self.START_OF_SAVE_CHUNK
+                self._save_chunk_started = True
+
+        self._flags.append(flags)
+
+    def _close_top(self):
+        name = self._names.pop()
+        count = self._open_counts.pop(name) - 1
+
+        if count:
+            self._open_counts[name] = count
+
+        if self._drop > 0:
+            if len(self._names) < self._drop:
+                self._drop = 0
+
+            return
+
+        flags = self._flags.pop()
+        endtag = self._endtags.get(name)
+
+        if endtag is None:
+            # void elements are written without end tags
+            endtag = self._endtags[name] = '' if name in VOID_ELEMENTS else get_endtag_string(name)
+
+        if self._remove == 0:
+            if self._chunk_started and endtag:
+                self._write_tag(endtag, name, -1)
+
+            if flags & self.START_OF_CHUNK:
+                self._create_chunk_and_reset()
+
+        if flags & self.START_OF_SAVE_CHUNK:
+            self._create_save_chunk_and_reset(name)
+
+        if name in self._tags_to_save:
+            self._save -= 1
+        if name in self._tags_to_remove:
+            self._remove -= 1
+
+    def _create_chunk_and_reset(self):
+        text = ''.join(self._temp_text)
+
+        if self._chunk_filter is None or not self._chunk_filter(text):
+            self._chunks.create(
+                '',
+                text=text,
+                links_length=self._links_length,
+                length_with_tags=len(text) + self._tags_length
+            )
+
+        self._tags_length = 0
+        self._temp_text.clear()
+        self._links = 0
+        self._links_length = 0
+        self._space = False
+        self._chunk_started = False
 
-    @property
-    def chunks_wrapper(self):
-        return self._chunks
+    def clear(self):
+        super(FastHTMLSplitter, self).clear()
 
-    @property
-    def save_chunks_wrapper(self):
-        return self._save_chunks
+        self._flags.clear()
+        self._tags_length = 0
 
 
 class Parser:
@@ -596,49 +1977,383 @@ class Parser:
 
     Args:
         splitter: HTMLSplitter object.
-        chunks_cleaner: HTMLChunksCleaner object with need_calculate_length=True.
-        save_chunks_cleaner: HTMLChunksCleaner object with need_calculate_length=False.
-        punctuation: Punctuation marks.
+        chunks_cleaner: HTMLChunksCleaner object with need_calculate_length=True. It is used only
+            for chunks which text was not extracted by the splitter.
+        save_chunks_cleaner: HTMLChunksCleaner object with need_calculate_length=False, which
+            removes tags from saved texts (None - splitter saves plain text).
+        punctuation: Punctuation marks (string) or PunctuationCounter object.
         min_allowed_weight: Minimum allowed weight for chunk (html block). It needed for
             filtering chunks with useful information.
+        incremental: If it is True, document can be fed by parts, weights of chunks are calculated
+            as soon as they are closed. Method close must be called after the last part and
+            method reset before the next document.
+        encoding: Encoding of documents fed as bytes. If it is None, encoding is detected from
+            byte order mark or <meta charset> (utf-8 by default). Byte order mark has priority
+            over this parameter.
+        collect_stats: If it is True, statistics of every document are collected (see ParserStats).
+        stats_callback: Function which is called with statistics after every document. Statistics
+            are collected if it is given.
+        punctuation_categories: Unicode categories of characters which are counted as punctuation
+            marks too ({'Po', 'Pd'}, {'P'} - all punctuation).
+        boilerplate_index: BoilerplateIndex object. Chunks which are repeated on pages of the same
+            host are dropped if url of the document is given.
 
     Methods defined here:
-        feed(self, data)
-            Feed html document to parser.
+        feed(self, data, encoding=None, url=None)
+            Feed html document (or a part of it in incremental mode) to parser.
+
+        feed_file(self, file, encoding=None, url=None)
+            Feed html document from file.
+
+        feed_buffer(self, buffer, encoding=None, start=0, end=None, url=None)
+            Feed html document from buffer (bytes, mmap).
+
+        close(self)
+            Finish the document fed by parts.
+
+        reset(self)
+            Remove results of the previous document.
+
+        iter_chunks(self, source)
+            Yield (text, weight) of chunks as soon as they are closed.
+
+        iter_text(self, source)
+            Yield useful text of chunks as soon as they are closed.
+
+        write_data(self, file)
+            Write useful text to file-like object.
 
     Returns:
         Parser object.
 
     Properties:
-        data: Return useful text.
+        data: Return useful text, it is joined when it is read the first time after changes.
         saved_tags: Return saved tags and text contained in these tags ({'title': ['Test title', ...]}).
+        result: Return tuple (data, saved_tags), saved tags are copied and they are not changed
+            by the next document.
+        stats: Return statistics of the last document (None if statistics are not collected).
+        boilerplate_index: Return BoilerplateIndex object (None if boilerplate chunks are not dropped).
     """
+    # size of parts which documents are split to by iter_chunks
+    part_size = 65536
+
     def __init__(self, splitter=None, chunks_cleaner=None, save_chunks_cleaner=None,
-                 punctuation='.,!?:;', min_allowed_weight=0.0):
+                 punctuation='.,!?:;', min_allowed_weight=0.0, incremental=False, encoding=None,
+                 collect_stats=False, stats_callback=None, punctuation_categories=(), boilerplate_index=None):
         self._splitter = splitter
         self._chunks_cleaner = chunks_cleaner
         self._save_chunks_cleaner = save_chunks_cleaner
-        self._punctuation = punctuation
         self._min_allowed_weight = min_allowed_weight
+        self._incremental = incremental
+
+        # punctuation marks are counted by one counter for all chunks of all documents
+        if isinstance(punctuation, PunctuationCounter):
+            self._punctuation = punctuation
+        else:
+            self._punctuation = get_punctuation_counter(punctuation, frozenset(punctuation_categories))
+
+        # decoder is created when encoding of the document is detected
+        self._encoding = encoding
+        self._document_encoding = encoding
+        self._decoder = None
+        self._head = b''
+
+        self._collect_stats = collect_stats or stats_callback is not None
+        self._stats_callback = stats_callback
+        self._stats = ParserStats() if self._collect_stats else None
+
+        # useful text is joined once, when it is read the first time after changes
+        self._data = None
+
+        # filter of boilerplate chunks of the current document
+        self._boilerplate_index = boilerplate_index
+        self._page_filter = None
+
+    def feed(self, data, encoding=None, url=None):
+        """Feeds html document (or a part of it in incremental mode) to parser.
+
+        Args:
+            data: Html document (str or bytes).
+            encoding: Encoding of the document fed as bytes, it is used instead of encoding
+                of the parser (for example, charset from Content-Type header).
+            url: Url of the document, it is used for dropping boilerplate chunks of the site
+                (in incremental mode it is enough to pass it with the first part).
+        """
+        if not self._incremental:
+            self.reset()
+
+        if encoding is not None:
+            self._document_encoding = encoding
+
+        if url is not None:
+            self._set_url(url)
+
+        self._push(data)
+
+        if self._incremental:
+            self._calculate_weights()
+        else:
+            self.close()
+
+    def feed_file(self, file, encoding=None, url=None):
+        """Reads html document from file by parts and feeds it to parser.
+
+        Regular files are memory-mapped, so they are not read to memory at once.
+        The whole document is processed in any mode of parser.
+
+        Args:
+            file: Path to file or binary file object.
+            encoding: Encoding of the document (detected if it is None).
+            url: Url of the document (see feed).
+        """
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, 'rb') as file_object:
+                return self.feed_file(file_object, encoding, url)
+
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # empty files, pipes and file-like objects without descriptor can't be mapped
+            buffer = None
+
+        if buffer is not None:
+            with buffer:
+                return self.feed_buffer(buffer, encoding, url=url)
+
+        self.reset()
+
+        if encoding is not None:
+            self._document_encoding = encoding
+
+        if url is not None:
+            self._set_url(url)
+
+        for part in iter(functools.partial(file.read, self.part_size), b''):
+            self._push(part)
+
+        self.close()
+
+    def feed_buffer(self, buffer, encoding=None, start=0, end=None, url=None):
+        """Feeds html document from buffer (bytes, mmap) to parser by parts.
+
+        The whole document is processed in any mode of parser.
+
+        Args:
+            buffer: Object which supports slicing and len (bytes, bytearray, mmap).
+            encoding: Encoding of the document (detected if it is None).
+            start: Start of the document in buffer.
+            end: End of the document in buffer (end of buffer by default).
+            url: Url of the document (see feed).
+        """
+        self.reset()
+
+        if encoding is not None:
+            self._document_encoding = encoding
+
+        if url is not None:
+            self._set_url(url)
+
+        if end is None:
+            end = len(buffer)
+
+        for index in range(start, end, self.part_size):
+            self._push(bytes(buffer[index:min(index + self.part_size, end)]))
+
+        self.close()
+
+    def close(self):
+        tail = self._decode(b'', final=True)
+
+        if tail:
+            self._measure('split_time', self._splitter.push, tail)
+
+        self._measure('split_time', self._splitter.close)
+        self._calculate_weights()
 
-    def feed(self, html_document):
-        self._splitter.feed(html_document)
-        self._splitter.chunks_wrapper.calculate_weights(self._chunks_cleaner, self._punctuation)
-        self._splitter.save_chunks_wrapper.remove_tags(self._save_chunks_cleaner)
+        if self._page_filter is not None:
+            self._page_filter.finish()
+        if self._save_chunks_cleaner is not None:
+            self._measure(
+                'remove_tags_time', self._splitter.save_chunks_wrapper.remove_tags, self._save_chunks_cleaner
+            )
+
+        if self._stats is not None:
+            self._stats.tags = self._splitter.tags_count
+
+            if self._stats_callback is not None:
+                self._stats_callback(self._stats)
+
+    def reset(self):
+        self._splitter.reset()
+        self._splitter.chunk_filter = self._page_filter = None
+
+        self._document_encoding = self._encoding
+        self._decoder = None
+        self._head = b''
+        self._data = None
+
+        if self._collect_stats:
+            self._stats = ParserStats()
+
+    def iter_chunks(self, source):
+        """Extracts chunks from html document and yields them as soon as they are closed.
+
+        Chunks are removed from the parser after they are yielded, so memory does not grow with
+        the number of chunks and 'data' property is empty after the iteration. Saved tags are
+        available after the iteration.
+
+        Args:
+            source: Html document (str or bytes) or iterable with parts of the document.
+
+        Yields:
+            Tuples (text, weight) for all chunks of the document.
+        """
+        self.reset()
+
+        if isinstance(source, (str, bytes)):
+            source = split_document(source, self.part_size)
+
+        for part in source:
+            self._push(part)
+
+            yield from self._pop_calculated_chunks()
+
+        self.close()
+
+        yield from self._pop_calculated_chunks()
+
+    def iter_text(self, source):
+        """Extracts useful text from html document and yields it as soon as chunks are closed.
+
+        Args:
+            source: Html document (str or bytes) or iterable with parts of the document.
+
+        Yields:
+            Text of chunks which weight is not less than min_allowed_weight.
+        """
+        for text, weight in self.iter_chunks(source):
+            if weight >= self._min_allowed_weight:
+                yield text
+
+    def _set_url(self, url):
+        if self._boilerplate_index is not None:
+            self._page_filter = self._boilerplate_index.get_filter(get_host(url))
+            self._splitter.chunk_filter = self._page_filter
+
+    def _push(self, data):
+        self._data = None
+
+        if self._stats is not None:
+            self._stats.bytes_in += len(data)
+
+        if isinstance(data, bytes):
+            data = self._decode(data)
+
+        self._measure('split_time', self._splitter.push, data)
+
+    def _decode(self, data, final=False):
+        if self._decoder is None:
+            # start of the document is kept until there are enough bytes for detecting encoding
+            self._head += data
+
+            if not self._head or len(self._head) < PRESCAN_SIZE and not final:
+                return ''
+
+            encoding = detect_encoding(self._head, hint=self._document_encoding)
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+            data, self._head = self._head, b''
+
+        return self._decoder.decode(data, final)
+
+    def _calculate_weights(self):
+        chunks_wrapper = self._splitter.chunks_wrapper
+        self._data = None
+
+        if self._stats is None:
+            chunks_wrapper.calculate_weights(self._chunks_cleaner, self._punctuation)
+            return
+
+        calculated = chunks_wrapper.calculated
+        self._measure('weights_time', chunks_wrapper.calculate_weights, self._chunks_cleaner, self._punctuation)
+
+        # useful text is counted as chunks are accepted, it is not joined (and chunks can be popped by iter_chunks)
+        count, length = chunks_wrapper.measure_useful_text(self._min_allowed_weight, calculated)
+
+        if count:
+            # texts of chunks are joined with spaces
+            self._stats.bytes_out += length + count - (self._stats.accepted_chunks == 0)
+            self._stats.accepted_chunks += count
+
+        self._stats.chunks += chunks_wrapper.calculated - calculated
+
+    def _measure(self, timer, function, *args):
+        if self._stats is None:
+            function(*args)
+            return
+
+        start = time.perf_counter()
+        function(*args)
+
+        setattr(self._stats, timer, getattr(self._stats, timer) + time.perf_counter() - start)
+
+    def _pop_calculated_chunks(self):
+        chunks_wrapper = self._splitter.chunks_wrapper
+        self._calculate_weights()
+
+        chunks = chunks_wrapper.pop_calculated()
+        self._data = None
+
+        for chunk in chunks:
+            yield chunk.chunk.strip(), chunk.weight
+
+    def write_data(self, file):
+        """Writes useful text to file-like object without joining it to one string.
+
+        Args:
+            file: Text file object (for example, io.StringIO or file opened with 'w' mode).
+
+        Returns:
+            Number of written characters.
+        """
+        if self._data is not None:
+            return file.write(self._data)
+
+        count = 0
+        separator = ''
+
+        for text in self._splitter.chunks_wrapper.iter_useful_text(self._min_allowed_weight):
+            count += file.write(separator)
+            count += file.write(text)
+            separator = ' '
+
+        return count
 
     @property
     def data(self):
-        useful_chunks = (
-            chunk.chunk.strip() for chunk in self._splitter.data
-            if chunk.weight >= self._min_allowed_weight
-        )
+        if self._data is None:
+            self._data = ' '.join(self._splitter.chunks_wrapper.iter_useful_text(self._min_allowed_weight))
 
-        return ' '.join(useful_chunks)
+        return self._data
 
     @property
     def saved_tags(self):
         return self._splitter.saved_tags
 
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def boilerplate_index(self):
+        return self._boilerplate_index
+
+    @property
+    def result(self):
+        saved_tags = {tag: list(texts) for tag, texts in self.saved_tags.items()}
+
+        return self.data, saved_tags
+
 
 def normalize_string(string):
     """Removes excess spaces from string.
@@ -652,6 +2367,85 @@ def normalize_string(string):
     return ' '.join(string.split())
 
 
+def normalized_length(string):
+    """Returns length of string without excess spaces, the same as len(normalize_string(string)),
+    but without creating the normalized string.
+    """
+    words = string.split()
+
+    return sum(map(len, words)) + len(words) - 1 if words else 0
+
+
+def get_implied_end(name, names, open_counts):
+    """Returns depth which open elements are closed to by start tag of the element (<p> in <p>, <li> in <li>, ...).
+
+    Args:
+        name: Name of the element from IMPLIED_END_TAGS.
+        names: List with names of open elements.
+        open_counts: Dictionary with numbers of open elements by names.
+
+    Returns:
+        Number of open elements which are not closed (len(names) if nothing is closed).
+    """
+    closed, boundaries = IMPLIED_END_TAGS[name]
+    remaining = sum(open_counts.get(closed_name, 0) for closed_name in closed)
+    end = index = len(names)
+
+    while remaining:
+        index -= 1
+
+        if names[index] in closed:
+            end = index
+            remaining -= 1
+        elif names[index] in boundaries:
+            break
+
+    return end
+
+
+@functools.lru_cache(maxsize=32)
+def get_attributes_to_save(attributes):
+    """Returns attributes to save by tag names.
+
+    Args:
+        attributes: Frozenset with attributes to save ('a[href]', 'meta[content]').
+
+    Returns:
+        Dictionary {tag name: ((attribute, key in saved tags), ...)} (None if there are no attributes).
+
+    Raises:
+        ValueError: Attribute is not in format 'tag[attribute]'.
+    """
+    if not attributes:
+        return None
+
+    attributes_to_save = {}
+
+    for key in sorted(attributes):
+        match = ATTRIBUTE_TO_SAVE.fullmatch(key.strip())
+
+        if match is None:
+            raise ValueError('Attribute to save must be given as tag[attribute]: {0!r}'.format(key))
+
+        name, attribute = match.group(1).lower(), match.group(2).lower()
+        attributes_to_save.setdefault(name, []).append((attribute, key))
+
+    return {name: tuple(values) for name, values in attributes_to_save.items()}
+
+
+def split_document(document, part_size):
+    """Splits document to parts.
+
+    Args:
+        document: Html document (str or bytes).
+        part_size: Maximum size of part.
+
+    Returns:
+        Generator of parts.
+    """
+    return (document[index:index + part_size] for index in range(0, len(document), part_size))
+
+
 def get_starttag_string(name, attrs, save_attrs=True):
     """Returns string representation of start tag.
 
@@ -687,121 +2481,105 @@ def get_tag_wrapper(save_attrs, tag_class):
     Returns
         Wrapper for tags.
     """
-    class Wrapper:
-        def __init__(self):
-            self._tag = tag_class
-            self._save_attrs = save_attrs
-
-        def starttag_string(self, tag):
-            return tag.starttag_string(save_attrs=self._save_attrs)
+    return TagWrapper(save_attrs, tag_class)
 
-        def endtag_string(self, tag):
-            return tag.endtag_string()
 
-        def create(self, name, attrs):
-            return self._tag(name, attrs)
-
-    return Wrapper()
-
-
-def get_html_chunks_cleaner(tag_link):
+def get_html_chunks_cleaner(tag_link, backend='html.parser'):
     """Creates and returns HTMLChunksCleaner instance for removing tags from chunks and calculating length of links.
 
     Args:
         tag_link: Tag link.
+        backend: Name of tokenizer ('html.parser' or 'regex').
 
     Returns:
         HTMLChunksCleaner instance.
     """
-    return HTMLChunksCleaner(tag_link=tag_link)
+    return HTMLChunksCleaner(tag_link=tag_link, backend=backend)
+
 
+def get_html_cleaner(remove_without_content=set(), remove_with_content=set(), convert_charrefs=True,
+                     incremental=False, collect_stats=False, stats_callback=None, skip_removed=False,
+                     remove_selectors=frozenset(), backend='html.parser'):
+    """Creates and returns Cleaner instance for removing tags from html documents.
 
-def get_html_cleaner(remove_without_content=set(), remove_with_content=set(), convert_charrefs=True):
+    Args:
+        remove_without_content: A set of tags which will be removed without their content.
+        remove_with_content: A set of tags which will be removed with their content.
+        convert_charrefs: If it is True, all character references will be automatically converted
+            to the corresponding Unicode characters.
+        incremental: If it is True, document can be fed by parts, method close must be called
+            after the last part.
+        collect_stats: If it is True, statistics of every document are collected (see CleanerStats).
+        stats_callback: Function which is called with statistics (CleanerStats object) after every document.
+        skip_removed: If it is True, content of tags from 'remove_with_content' set is skipped without
+            parsing when it is possible.
+        remove_selectors: Selectors of elements which will be removed with their content
+            ('div.sidebar', '#menu', '[role=navigation]').
+        backend: Name of tokenizer ('html.parser' or 'regex', which is faster and gives the same
+            result, but always converts character references).
+
+    Returns:
+        Cleaner instance.
+    """
     return Cleaner(
         remove_without_data=remove_without_content,
         remove_with_data=remove_with_content,
-        convert_charrefs=convert_charrefs
+        convert_charrefs=convert_charrefs,
+        incremental=incremental,
+        collect_stats=collect_stats,
+        stats_callback=stats_callback,
+        skip_removed=skip_removed,
+        remove_selectors=remove_selectors,
+        backend=backend
     )
 
 
-def get_save_html_chunks_cleaner():
+def get_save_html_chunks_cleaner(backend='html.parser'):
     """Creates and returns HTMLChunksCleaner instance for removing tags from chunks.
 
+    Args:
+        backend: Name of tokenizer ('html.parser' or 'regex').
+
     Returns:
         HTMLChunksCleaner instance.
     """
-    return HTMLChunksCleaner(need_calculate_length=False)
+    return HTMLChunksCleaner(need_calculate_length=False, backend=backend)
 
 
-def get_chunks_wrapper(chunk_class):
+def get_chunks_wrapper(chunk_class, vectorized=False, columnar=False):
     """Creates and returns wrapper for html chunks.
 
     Args:
-        chunk_class: Chunk class.
+        chunk_class: Chunk class (it is not used by columnar wrapper).
+        vectorized: If it is True, weights of chunks are calculated at once (see ChunksWrapper).
+        columnar: If it is True, chunks are kept in arrays instead of Chunk objects
+            (see ColumnarChunksWrapper), their weights are always calculated at once.
 
     Returns:
         Wrapper for html chunks.
     """
-    class Wrapper:
-        def __init__(self):
-            self._chunk_class = chunk_class
-            self._chunks = []
-
-        def create(self, chunk):
-            self._chunks.append(self._chunk_class(chunk=normalize_string(chunk)))
-
-        def clear(self):
-            self._chunks.clear()
-
-        def calculate_weights(self, cleaner, punctuation):
-            for chunk in self._chunks:
-                chunk.make_calculations(cleaner, punctuation)
-
-        @property
-        def data(self):
-            return self._chunks
+    if columnar:
+        return ColumnarChunksWrapper()
 
-    return Wrapper()
+    return ChunksWrapper(chunk_class, vectorized)
 
 
-def get_save_chunks_wrapper():
-    """Creates and returns wrapper for 'save' chunks."""
-    class Wrapper:
-        def __init__(self):
-            self._save_chunks = {}
+def get_save_chunks_wrapper(max_per_tag=0, first_only=frozenset()):
+    """Creates and returns wrapper for 'save' chunks.
 
-        def create(self, chunk, tag_name):
-            if tag_name not in self._save_chunks:
-                self._save_chunks.update({tag_name: [normalize_string(chunk)]})
-            else:
-                self._save_chunks[tag_name].append(normalize_string(chunk))
-
-        def remove_tags(self, cleaner):
-            for tag in self._save_chunks:
-                index = 0
-                last_index = len(self._save_chunks[tag])
-
-                while index < last_index:
-                    cleaner.feed(self._save_chunks[tag][index])
-
-                    if not cleaner.data:
-                        self._save_chunks[tag].pop(index)
-                        last_index -= 1
-                    else:
-                        self._save_chunks[tag][index] = cleaner.data
-                        index += 1
-
-        def clear(self):
-            self._save_chunks.clear()
-
-        @property
-        def data(self):
-            return self._save_chunks
+    Args:
+        max_per_tag: Maximum number of texts of every saved tag (0 - unlimited).
+        first_only: Saved tags which only the first text is kept for ({'title'}).
 
-    return Wrapper()
+    Returns:
+        SaveChunksWrapper instance.
+    """
+    return SaveChunksWrapper(max_per_tag, first_only)
 
 
-def get_html_splitter(tags_to_save, tags_to_remove, tag_wrapper, chunks_wrapper, save_chunks_wrapper):
+def get_html_splitter(tags_to_save, tags_to_remove, tag_wrapper, chunks_wrapper, save_chunks_wrapper,
+                      tag_link='a', remove_without_content=set(), remove_with_content=set(), skip_removed=False,
+                      remove_selectors=frozenset(), backend='html.parser', attributes_to_save=frozenset()):
     """Creates and returns HTMLSplitter instance.
 
     Args:
@@ -811,6 +2589,13 @@ def get_html_splitter(tags_to_save, tags_to_remove, tag_wrapper, chunks_wrapper,
         tag_wrapper: A wrapper for tag objects.
         chunks_wrapper: A wrapper for html chunk objects.
         save_chunks_wrapper: A wrapper for data of tags from 'tags_to_save' set.
+        tag_link: Tag link ('a' default).
+        remove_without_content: A set of tags which will be removed without their content.
+        remove_with_content: A set of tags which will be removed with their content.
+        skip_removed: If it is True, content of removed tags is skipped without parsing when it is possible.
+        remove_selectors: Selectors of elements which will be removed with their content.
+        backend: Name of tokenizer ('html.parser' or 'regex').
+        attributes_to_save: Attributes which values are saved ('a[href]', 'meta[content]').
 
     Returns:
         HTMLSplitter instance with given attributes.
@@ -820,7 +2605,52 @@ def get_html_splitter(tags_to_save, tags_to_remove, tag_wrapper, chunks_wrapper,
         tags_to_save=tags_to_save,
         tag_wrapper=tag_wrapper,
         chunks_wrapper=chunks_wrapper,
-        save_chunks_wrapper=save_chunks_wrapper
+        save_chunks_wrapper=save_chunks_wrapper,
+        tag_link=tag_link,
+        remove_without_data=remove_without_content,
+        remove_with_data=remove_with_content,
+        skip_removed=skip_removed,
+        remove_selectors=remove_selectors,
+        backend=backend,
+        attributes_to_save=attributes_to_save
+    )
+
+    return html_splitter
+
+
+def get_fast_html_splitter(tags_to_save, tags_to_remove, chunks_wrapper, save_chunks_wrapper, tag_link='a',
+                           remove_without_content=set(), remove_with_content=set(), skip_removed=False,
+                           remove_selectors=frozenset(), backend='html.parser', attributes_to_save=frozenset()):
+    """Creates and returns FastHTMLSplitter instance.
+
+    Args:
+        tags_to_save: A set of tags for saving.
+        tags_to_remove: A set of tags for removing.
+        chunks_wrapper: A wrapper for html chunk objects.
+        save_chunks_wrapper: A wrapper for data of tags from 'tags_to_save' set.
+        tag_link: Tag link ('a' default).
+        remove_without_content: A set of tags which will be removed without their content.
+        remove_with_content: A set of tags which will be removed with their content.
+        skip_removed: If it is True, content of removed tags is skipped without parsing when it is possible.
+        remove_selectors: Selectors of elements which will be removed with their content.
+        backend: Name of tokenizer ('html.parser' or 'regex').
+        attributes_to_save: Attributes which values are saved ('a[href]', 'meta[content]').
+
+    Returns:
+        FastHTMLSplitter instance with given attributes.
+    """
+    html_splitter = FastHTMLSplitter(
+        tags_to_remove=tags_to_remove,
+        tags_to_save=tags_to_save,
+        chunks_wrapper=chunks_wrapper,
+        save_chunks_wrapper=save_chunks_wrapper,
+        tag_link=tag_link,
+        remove_without_data=remove_without_content,
+        remove_with_data=remove_with_content,
+        skip_removed=skip_removed,
+        remove_selectors=remove_selectors,
+        backend=backend,
+        attributes_to_save=attributes_to_save
     )
 
     return html_splitter
@@ -828,7 +2658,12 @@ def get_html_splitter(tags_to_save, tags_to_remove, tag_wrapper, chunks_wrapper,
 
 def get_parser(tags_to_save, tags_to_remove, punctuation='.,!?:;', min_allowed_weight=0.0, save_attrs=False,
                tag_class=Tag, tag_link='a', chunk_class=Chunk, tag_wrapper=None, chunks_wrapper=None,
-               save_chunks_wrapper=None, splitter=None, chunks_cleaner=None, save_chunks_cleaner=None):
+               save_chunks_wrapper=None, splitter=None, chunks_cleaner=None, save_chunks_cleaner=None,
+               remove_without_content=set(), remove_with_content=set(), incremental=False, encoding=None,
+               collect_stats=False, stats_callback=None, vectorized=False, columnar=False,
+               punctuation_categories=frozenset(), fast=False, skip_removed=False, boilerplate_pages=0,
+               boilerplate_index=None, remove_selectors=frozenset(), backend='html.parser', max_per_tag=0,
+               attributes_to_save=frozenset(), first_only=frozenset()):
     """Creates and returns parser which can extract useful text from html documents.
 
     Usage:
@@ -849,42 +2684,237 @@ def get_parser(tags_to_save, tags_to_remove, punctuation='.,!?:;', min_allowed_w
         save_chunks_wrapper: Wrapper for 'save' chunks.
         splitter: HTMLSplitter instance. Which can split html document to chunks (little blocks with html).
         chunks_cleaner: HTMLChunksCleaner instance. Which can remove tags from chunks and calculate length of links.
-        save_chunks_cleaner: HTMLChunksCleaner instance. Which can remove tags from chunks.
+        save_chunks_cleaner: HTMLChunksCleaner instance. Which can remove tags from saved texts
+            (splitters of this module save plain text, so it is needed only for custom splitters).
+        remove_without_content: A set of tags which will be removed without their content
+            before splitting (the same as in get_html_cleaner).
+        remove_with_content: A set of tags which will be removed with their content
+            before splitting (the same as in get_html_cleaner).
+        incremental: If it is True, document can be fed by parts, method close must be called
+            after the last part and method reset before the next document.
+        encoding: Encoding of documents fed as bytes. If it is None, encoding is detected from
+            byte order mark or <meta charset> (utf-8 by default).
+        collect_stats: If it is True, statistics of every document are collected (see ParserStats).
+        stats_callback: Function which is called with statistics (ParserStats object) after every document.
+        vectorized: If it is True, weights of all chunks of the document are calculated at once
+            with NumPy (or without it, if NumPy is not installed).
+        columnar: If it is True, chunks are kept in arrays instead of Chunk objects, which
+            saves memory for documents with many small blocks.
+        punctuation_categories: Unicode categories of characters which are counted as punctuation
+            marks too ({'Po', 'Pd'}, {'P'} - all punctuation).
+        fast: If it is True, FastHTMLSplitter is used instead of HTMLSplitter (tag_class
+            and tag_wrapper are not used). It can't be used with save_attrs=True.
+        skip_removed: If it is True, content of removed tags is skipped without parsing when it
+            is possible (see HTMLSplitter).
+        boilerplate_pages: If it is not zero, parser creates BoilerplateIndex, and chunks which were
+            seen on this number of pages of the same host are dropped (url of documents must be given).
+        boilerplate_index: BoilerplateIndex object, it can be shared by many parsers.
+        remove_selectors: Selectors of elements which will be removed with their content before
+            splitting ('div.sidebar', '#menu', '[role=navigation]', see SelectorMatcher).
+        backend: Name of tokenizer which is used by the splitter and cleaners of chunks created by
+            this function ('html.parser' - html.parser.HTMLParser, 'regex' - RegexTokenizer, which
+            gives the same results faster).
+        max_per_tag: Maximum number of saved texts of every tag (0 - unlimited), text of the tag
+            is not collected after that.
+        attributes_to_save: Attributes which values are saved in the same pass ('a[href]',
+            'meta[content]'), they are kept in saved tags by these keys.
+        first_only: Saved tags which only the first text is kept for, text of the tag is not
+            collected after that ({'title'} - <title> elements of svg images are not saved).
 
     Returns:
         Parser object.
 
     """
+    if fast and save_attrs:
+        raise ValueError('Fast splitter does not keep attributes of tags, save_attrs must be False')
+
     if splitter is None:
         if tag_wrapper is None:
             tag_wrapper = get_tag_wrapper(save_attrs, tag_class)
 
         if chunks_wrapper is None:
-            chunks_wrapper = get_chunks_wrapper(chunk_class)
+            chunks_wrapper = get_chunks_wrapper(chunk_class, vectorized, columnar)
 
         if save_chunks_wrapper is None:
-            save_chunks_wrapper = get_save_chunks_wrapper()
-
-        splitter = get_html_splitter(
-            tags_to_save=tags_to_save,
-            tags_to_remove=tags_to_remove,
-            tag_wrapper=tag_wrapper,
-            chunks_wrapper=chunks_wrapper,
-            save_chunks_wrapper=save_chunks_wrapper
-        )
+            save_chunks_wrapper = get_save_chunks_wrapper(max_per_tag, first_only)
+
+        if fast:
+            splitter = get_fast_html_splitter(
+                tags_to_save=tags_to_save,
+                tags_to_remove=tags_to_remove,
+                chunks_wrapper=chunks_wrapper,
+                save_chunks_wrapper=save_chunks_wrapper,
+                tag_link=tag_link,
+                remove_without_content=remove_without_content,
+                remove_with_content=remove_with_content,
+                skip_removed=skip_removed,
+                remove_selectors=remove_selectors,
+                backend=backend,
+                attributes_to_save=attributes_to_save
+            )
+        else:
+            splitter = get_html_splitter(
+                tags_to_save=tags_to_save,
+                tags_to_remove=tags_to_remove,
+                tag_wrapper=tag_wrapper,
+                chunks_wrapper=chunks_wrapper,
+                save_chunks_wrapper=save_chunks_wrapper,
+                tag_link=tag_link,
+                remove_without_content=remove_without_content,
+                remove_with_content=remove_with_content,
+                skip_removed=skip_removed,
+                remove_selectors=remove_selectors,
+                backend=backend,
+                attributes_to_save=attributes_to_save
+            )
 
     if chunks_cleaner is None:
-        chunks_cleaner = get_html_chunks_cleaner(tag_link)
+        chunks_cleaner = get_html_chunks_cleaner(tag_link, backend)
 
-    if save_chunks_cleaner is None:
-        save_chunks_cleaner = get_save_html_chunks_cleaner()
+    if boilerplate_index is None and boilerplate_pages:
+        boilerplate_index = BoilerplateIndex(min_pages=boilerplate_pages)
 
     parser = Parser(
         splitter=splitter,
         chunks_cleaner=chunks_cleaner,
         save_chunks_cleaner=save_chunks_cleaner,
         punctuation=punctuation,
-        min_allowed_weight=min_allowed_weight
+        min_allowed_weight=min_allowed_weight,
+        incremental=incremental,
+        encoding=encoding,
+        collect_stats=collect_stats,
+        stats_callback=stats_callback,
+        punctuation_categories=punctuation_categories,
+        boilerplate_index=boilerplate_index
     )
 
     return parser
+
+
+def get_extractor(remove_without_content=set(), remove_with_content=set(), tags_to_save=set(),
+                  tags_to_remove=set(), **kwargs):
+    """Creates and returns parser which removes tags like html cleaner and extracts useful text
+    in one pass over html document.
+
+    Usage:
+        extractor = get_extractor(
+            remove_without_content={'b', 's', 'span'},
+            remove_with_content={'style', 'script'},
+            tags_to_save={'title'},
+            tags_to_remove={'head'}
+        )
+        extractor.feed(html)
+
+    It gives the same result as feeding 'cleaner.data' of get_html_cleaner(...) to get_parser(...),
+    but the document is parsed only once and cleaned html is never built.
+
+    Args:
+        remove_without_content: A set of tags which will be removed without their content.
+        remove_with_content: A set of tags which will be removed with their content.
+        tags_to_save: A set of tags for saving.
+        tags_to_remove: A set of tags for removing.
+        kwargs: Other parameters of get_parser function.
+
+    Returns:
+        Parser object.
+    """
+    return get_parser(
+        tags_to_save=tags_to_save,
+        tags_to_remove=tags_to_remove,
+        remove_without_content=remove_without_content,
+        remove_with_content=remove_with_content,
+        **kwargs
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class ExtractorConfig:
+    """Creates immutable configuration of parser.
+
+    Configuration can be pickled, copied, compared, hashed and shared between threads and processes,
+    method build creates a new parser with this configuration.
+
+    Usage:
+        config = ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'script', 'style'})
+        parser = config.build()
+
+    Args:
+        tags_to_save: A set of tags for saving.
+        tags_to_remove: A set of tags for removing.
+        punctuation: Punctuation marks.
+        min_allowed_weight: Minimum allowed weight for chunk (html block).
+        save_attrs: If parameter is true, attributes of tag will be save, default False.
+        tag_class: Tag class.
+        tag_link: Tag link ('a' default).
+        chunk_class: Chunk class.
+        remove_without_content: A set of tags which will be removed without their content.
+        remove_with_content: A set of tags which will be removed with their content.
+        incremental: If it is True, documents can be fed by parts.
+        encoding: Encoding of documents fed as bytes (detected if it is None).
+        collect_stats: If it is True, parser collects statistics of every document.
+        vectorized: If it is True, weights of chunks are calculated at once (with NumPy if it is installed).
+        columnar: If it is True, chunks are kept in arrays instead of Chunk objects.
+        punctuation_categories: Unicode categories of characters which are counted as punctuation marks too.
+        fast: If it is True, FastHTMLSplitter is used.
+        skip_removed: If it is True, content of removed tags is skipped without parsing when it is possible.
+        boilerplate_pages: If it is not zero, every parser drops chunks which were seen on this number of
+            pages of the same host (see BoilerplateIndex).
+        remove_selectors: Selectors of elements which will be removed with their content.
+        backend: Name of tokenizer ('html.parser' or 'regex').
+        max_per_tag: Maximum number of saved texts of every tag (0 - unlimited).
+        attributes_to_save: Attributes which values are saved ('a[href]', 'meta[content]').
+        first_only: Saved tags which only the first text is kept for ({'title'}).
+
+    Returns:
+        ExtractorConfig object.
+
+    Methods defined here:
+        build(self)
+            Create and return new parser with this configuration.
+
+        as_dict(self)
+            Return parameters of get_parser function.
+
+        replace(self, **changes)
+            Return new configuration with changed parameters.
+    """
+    tags_to_save: frozenset = frozenset()
+    tags_to_remove: frozenset = frozenset()
+    punctuation: str = '.,!?:;'
+    min_allowed_weight: float = 0.0
+    save_attrs: bool = False
+    tag_class: type = Tag
+    tag_link: str = 'a'
+    chunk_class: type = Chunk
+    remove_without_content: frozenset = frozenset()
+    remove_with_content: frozenset = frozenset()
+    incremental: bool = False
+    encoding: str = None
+    collect_stats: bool = False
+    vectorized: bool = False
+    columnar: bool = False
+    punctuation_categories: frozenset = frozenset()
+    fast: bool = False
+    skip_removed: bool = False
+    boilerplate_pages: int = 0
+    remove_selectors: frozenset = frozenset()
+    backend: str = 'html.parser'
+    max_per_tag: int = 0
+    attributes_to_save: frozenset = frozenset()
+    first_only: frozenset = frozenset()
+
+    def __post_init__(self):
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+
+            if field.type is frozenset and not isinstance(value, frozenset):
+                object.__setattr__(self, field.name, frozenset(value))
+
+    def build(self):
+        return get_parser(**self.as_dict())
+
+    def as_dict(self):
+        return {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
@@ -0,0 +1,124 @@
+import contextlib
+import queue
+import threading
+
+
+__all__ = [
+    'ParserPool'
+]
+
+
+class ParserPool:
+    """Creates thread-safe pool of parsers for processing documents in many threads.
+
+    Parser (and its splitter, cleaners and wrappers) keeps state of the current document, so one
+    parser must not be used by several threads at the same time. ExtractorConfig is immutable
+    and can be shared between threads. Methods of ParserPool can be called from any thread.
+
+    Usage:
+        pool = ParserPool(config, size=8)
+
+        with pool.parser() as parser:
+            parser.feed(html)
+            data = parser.data
+
+    Args:
+        config: ExtractorConfig object, which is used for creating parsers.
+        size: Number of parsers in the pool, they are created at once.
+        block: If it is True and all parsers are in use, checkout waits until some parser is
+            returned to the pool. If it is False, the current thread gets its own parser, which
+            is created once and is used by this thread every time the pool is exhausted.
+        timeout: Maximum time of waiting for a parser in seconds (None - wait forever). If
+            the time is over, queue.Empty is raised.
+
+    Returns:
+        ParserPool object.
+
+    Methods defined here:
+        checkout(self)
+            Take parser from the pool.
+
+        checkin(self, parser)
+            Reset parser and return it to the pool.
+
+        parser(self)
+            Context manager, which takes parser from the pool and returns it back.
+
+        extract(self, html_document)
+            Extract useful text and saved tags from html document.
+    """
+    def __init__(self, config, size=4, block=False, timeout=None):
+        self._config = config
+        self._size = size
+        self._block = block
+        self._timeout = timeout
+
+        self._parsers = queue.LifoQueue()
+        self._local = threading.local()
+
+        for _ in range(size):
+            self._parsers.put(config.build())
+
+    def checkout(self):
+        try:
+            return self._parsers.get(block=self._block, timeout=self._timeout)
+        except queue.Empty:
+            if self._block:
+                raise
+
+        local_parser = getattr(self._local, 'parser', None)
+
+        if local_parser is None:
+            local_parser = self._local.parser = self._config.build()
+            self._local.in_use = False
+
+        if self._local.in_use:
+            # nested checkout in the thread which uses its own parser already
+            return self._config.build()
+
+        self._local.in_use = True
+
+        return local_parser
+
+    def checkin(self, parser):
+        parser.reset()
+
+        if parser is getattr(self._local, 'parser', None):
+            self._local.in_use = False
+        elif self._parsers.qsize() < self._size:
+            self._parsers.put(parser)
+
+    @contextlib.contextmanager
+    def parser(self):
+        parser = self.checkout()
+
+        try:
+            yield parser
+        finally:
+            self.checkin(parser)
+
+    def extract(self, html_document):
+        """Extracts useful text and saved tags from html document.
+
+        Args:
+            html_document: Html document (str or bytes).
+
+        Returns:
+            Tuple (data, saved_tags).
+        """
+        with self.parser() as parser:
+            parser.feed(html_document)
+
+            # incremental parser gets the whole document as one part (it is reset by checkin)
+            if self._config.incremental:
+                parser.close()
+
+            return parser.result
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def size(self):
+        return self._size
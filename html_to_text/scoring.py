@@ -0,0 +1,185 @@
+import functools
+import sys
+import unicodedata
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = [
+    'calculate_weight',
+    'calculate_weights',
+    'get_punctuation_counter',
+    'PunctuationCounter'
+]
+
+
+class PunctuationCounter:
+    """Creates object which counts punctuation marks in text.
+
+    A few marks are counted with str.count (every call is a fast scan in C). Large sets of marks
+    (for example, Unicode categories) are counted in one scan of the text, which checks every
+    character, so the time does not depend on the number of marks. Create the counter once
+    (for example, with get_punctuation_counter) and use it for all chunks.
+
+    Usage:
+        counter = PunctuationCounter('.,!?', categories={'Pd', 'Po'})
+        counter.count('Text, text... – text!')
+
+    Args:
+        punctuation: Punctuation marks.
+        categories: Unicode categories of characters which are counted as punctuation marks too.
+            One letter means all categories which start with it ('P' - all punctuation).
+
+    Returns:
+        PunctuationCounter object.
+
+    Methods defined here:
+        count(self, text)
+            Return number of punctuation marks in text.
+
+    Properties:
+        marks: Return frozenset with all punctuation marks.
+    """
+    __slots__ = (
+        '_marks',
+        '_separate_marks'
+    )
+
+    # maximum number of marks which are counted with str.count
+    max_separate_marks = 32
+
+    def __init__(self, punctuation='', categories=()):
+        self._marks = frozenset(punctuation) | get_category_characters(frozenset(categories))
+        self._separate_marks = None
+
+        if len(self._marks) <= self.max_separate_marks:
+            self._separate_marks = ''.join(sorted(self._marks))
+
+    def count(self, text):
+        if self._separate_marks is not None:
+            return sum(map(text.count, self._separate_marks))
+
+        return sum(map(self._marks.__contains__, text))
+
+    @property
+    def marks(self):
+        return self._marks
+
+
+@functools.lru_cache(maxsize=32)
+def get_punctuation_counter(punctuation, categories=frozenset()):
+    """Returns PunctuationCounter for punctuation marks and Unicode categories.
+
+    Counters are cached, so the same counter is returned for the same arguments.
+
+    Args:
+        punctuation: Punctuation marks.
+        categories: Frozenset with Unicode categories (see PunctuationCounter).
+
+    Returns:
+        PunctuationCounter object.
+    """
+    return PunctuationCounter(punctuation, categories)
+
+
+@functools.lru_cache(maxsize=32)
+def get_category_characters(categories):
+    """Returns frozenset with all characters of Unicode categories.
+
+    Args:
+        categories: Frozenset with Unicode categories ('Po', 'Pd', ... or 'P' for all categories
+            which start with 'P').
+    """
+    if not categories:
+        return frozenset()
+
+    characters = set()
+
+    # all characters are checked, it takes a fraction of a second once for every set of categories
+    for character in map(chr, range(sys.maxunicode + 1)):
+        category = unicodedata.category(character)
+
+        if category in categories or category[0] in categories:
+            characters.add(character)
+
+    return frozenset(characters)
+
+
+def count_punctuation_marks(text, punctuation):
+    """Returns number of punctuation marks in text.
+
+    Args:
+        text: String.
+        punctuation: Punctuation marks (string) or PunctuationCounter object.
+    """
+    if not isinstance(punctuation, PunctuationCounter):
+        punctuation = get_punctuation_counter(punctuation)
+
+    return punctuation.count(text)
+
+
+def calculate_weight(length_with_tags, length_without_tags, links_length, count_of_punctuation_marks):
+    """Calculates weight of one chunk (html block).
+
+    The greater the weight, the greater the likelihood that the block contains useful text.
+    Chunks without punctuation marks have zero weight.
+
+    Args:
+        length_with_tags: Length of the chunk with html tags.
+        length_without_tags: Length of text of the chunk.
+        links_length: Length of text of links in the chunk.
+        count_of_punctuation_marks: Number of punctuation marks in text of the chunk.
+
+    Returns:
+        Weight of the chunk (float).
+    """
+    if count_of_punctuation_marks == 0:
+        return 0.0
+
+    text_density = length_without_tags / length_with_tags
+    links_density = links_length / max(length_without_tags, 1)
+
+    weight = (text_density + count_of_punctuation_marks / 100) + (1 - links_density)
+    weight += 1 - count_of_punctuation_marks / length_without_tags
+
+    return weight
+
+
+def calculate_weights(lengths_with_tags, lengths_without_tags, links_lengths, counts_of_punctuation_marks):
+    """Calculates weights of many chunks at once.
+
+    Weights are calculated with one vectorized NumPy operation if NumPy is installed, and with
+    calculate_weight for every chunk in another case. Features of chunks of many documents can be
+    concatenated and scored together.
+
+    Args:
+        lengths_with_tags: Sequence with lengths of chunks with html tags.
+        lengths_without_tags: Sequence with lengths of text of chunks.
+        links_lengths: Sequence with lengths of text of links in chunks.
+        counts_of_punctuation_marks: Sequence with numbers of punctuation marks in text of chunks.
+
+    Returns:
+        List with weights of chunks (floats).
+    """
+    if numpy is None or not len(lengths_with_tags):
+        return list(map(
+            calculate_weight, lengths_with_tags, lengths_without_tags, links_lengths, counts_of_punctuation_marks
+        ))
+
+    length_with_tags = numpy.asarray(lengths_with_tags, dtype=numpy.float64)
+    length_without_tags = numpy.asarray(lengths_without_tags, dtype=numpy.float64)
+    links_length = numpy.asarray(links_lengths, dtype=numpy.float64)
+    punctuation = numpy.asarray(counts_of_punctuation_marks, dtype=numpy.float64)
+
+    has_punctuation = punctuation > 0
+    # chunks without punctuation marks get zero weight, so their lengths only must not be zero
+    text_length = numpy.where(has_punctuation, length_without_tags, 1.0)
+
+    weights = length_without_tags / numpy.maximum(length_with_tags, 1.0) + punctuation / 100
+    weights += 1 - links_length / numpy.maximum(length_without_tags, 1.0)
+    weights += 1 - punctuation / text_length
+
+    return numpy.where(has_punctuation, weights, 0.0).tolist()
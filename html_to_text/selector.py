@@ -0,0 +1,172 @@
+import functools
+import re
+
+
+__all__ = [
+    'get_selector_matcher',
+    'SelectorMatcher'
+]
+
+
+# tag name (or *) and conditions: .class, #id, [attribute], [attribute=value]
+SELECTOR = re.compile(
+    r'([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+|\[\s*[\w-]+\s*(?:=\s*(?:"[^"]*"|\'[^\']*\'|[^\]\s]*)\s*)?\])*)'
+)
+
+CONDITION = re.compile(r'([.#])([\w-]+)|\[\s*([\w-]+)\s*(=\s*("[^"]*"|\'[^\']*\'|[^\]\s]*)\s*)?\]')
+
+
+class SelectorMatcher:
+    """Creates object which checks whether elements match simple selectors.
+
+    Supported selectors: tag name ('nav'), class ('.sidebar'), id ('#menu'), attribute ('[hidden]')
+    and attribute with value ('[role=navigation]') or their combinations ('div.sidebar.left',
+    'a[rel="nofollow"]'). Names of tags and attributes are case-insensitive, values are not.
+    Selectors are compiled once into lists of conditions by tag names, so an element is checked
+    only against selectors of its tag (and selectors without tag name).
+
+    Usage:
+        matcher = SelectorMatcher({'nav', 'div.sidebar', '#comments', '[aria-hidden=true]'})
+        matcher.match('div', [('class', 'left sidebar')])
+
+    Args:
+        selectors: Iterable with selectors.
+
+    Returns:
+        SelectorMatcher object.
+
+    Methods defined here:
+        match(self, name, attrs)
+            Return True if element with name and attributes (list of tuples (name, value),
+            as they are passed to HTMLParser.handle_starttag) matches any selector.
+
+    Properties:
+        selectors: Return frozenset with selectors.
+    """
+    __slots__ = (
+        '_selectors',
+        '_names',
+        '_conditions',
+        '_any_conditions'
+    )
+
+    def __init__(self, selectors):
+        self._selectors = frozenset(selectors)
+
+        # tags which match without conditions
+        self._names = set()
+        # tag name -> list of tuples of conditions (attribute, value, is_token)
+        self._conditions = {}
+        self._any_conditions = []
+
+        for selector in self._selectors:
+            name, conditions = parse_selector(selector)
+
+            if not conditions:
+                self._names.add(name)
+            elif name is None:
+                self._any_conditions.append(conditions)
+            else:
+                self._conditions.setdefault(name, []).append(conditions)
+
+        self._names = frozenset(self._names)
+
+    def match(self, name, attrs):
+        if name in self._names:
+            return True
+
+        # all other selectors have conditions on attributes
+        if not attrs:
+            return False
+
+        conditions = self._conditions.get(name)
+
+        if conditions is None:
+            if not self._any_conditions:
+                return False
+
+            conditions = self._any_conditions
+        elif self._any_conditions:
+            conditions = conditions + self._any_conditions
+
+        values = dict(attrs)
+
+        return any(_match_conditions(selector, values) for selector in conditions)
+
+    @property
+    def selectors(self):
+        return self._selectors
+
+
+@functools.lru_cache(maxsize=32)
+def get_selector_matcher(selectors):
+    """Returns SelectorMatcher for frozenset with selectors (None if there are no selectors).
+
+    Matchers are cached, so selectors are compiled once for all parsers with the same selectors.
+    """
+    if not selectors:
+        return None
+
+    return SelectorMatcher(selectors)
+
+
+def parse_selector(selector):
+    """Parses simple selector.
+
+    Args:
+        selector: Selector ('div.sidebar', '#menu', '[role=navigation]', ...).
+
+    Returns:
+        Tuple (name, conditions): name of tag in lower case (None if selector is for any tag) and
+        tuple of conditions (attribute, value, is_token). Value is None if the attribute only must
+        be present, is_token is True if value must be one of words of the attribute (class).
+
+    Raises:
+        ValueError: Selector is empty or is not supported.
+    """
+    match = SELECTOR.fullmatch(selector.strip())
+
+    if match is None or not match.group(0):
+        raise ValueError('Unsupported selector: {0!r}'.format(selector))
+
+    name, conditions = match.groups()
+    name = None if name in (None, '*') else name.lower()
+
+    parsed = []
+
+    for prefix, word, attribute, assignment, value in CONDITION.findall(conditions):
+        if prefix == '.':
+            parsed.append(('class', word, True))
+        elif prefix == '#':
+            parsed.append(('id', word, False))
+        elif not assignment:
+            parsed.append((attribute.lower(), None, False))
+        else:
+            if value[:1] in ('"', "'"):
+                value = value[1:-1]
+
+            parsed.append((attribute.lower(), value, False))
+
+    if name is None and not parsed:
+        raise ValueError('Selector matches all tags: {0!r}'.format(selector))
+
+    return name, tuple(parsed)
+
+
+def _match_conditions(conditions, values):
+    for attribute, value, is_token in conditions:
+        actual = values.get(attribute, False)
+
+        if actual is False:
+            return False
+
+        if value is None:
+            continue
+
+        if is_token:
+            if actual is None or value not in actual.split():
+                return False
+        elif actual != value:
+            return False
+
+    return True
@@ -0,0 +1,495 @@
+import abc
+import functools
+import re
+
+from html import unescape
+
+
+__all__ = [
+    'get_tokenizer',
+    'RegexTokenizer'
+]
+
+
+# elements which content is not parsed (html.parser.HTMLParser.CDATA_CONTENT_ELEMENTS)
+RAW_TEXT_ELEMENTS = frozenset({'script', 'style'})
+
+ASCII_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# end of incomplete start tag: attribute name or value, or '/' of '/>' can be continued by the next part
+INCOMPLETE_STARTTAG_END = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ=/')
+
+# patterns below are the same as in html.parser, so all backends split documents in the same way
+TAGFIND = re.compile(r'([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*')
+
+ATTRFIND = re.compile(
+    r'((?<=[\'"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*'
+    r'(\'[^\']*\'|"[^"]*"|(?![\'"])[^>\s]*))?(?:\s|/(?!>))*'
+)
+
+LOCATE_STARTTAG_END = re.compile(r"""
+  <[a-zA-Z][^\t\n\r\f />\x00]*       # tag name
+  (?:[\s/]*                          # optional whitespace before attribute name
+    (?:(?<=['"\s/])[^\s/>][^\s/=>]*  # attribute name
+      (?:\s*=+\s*                    # value indicator
+        (?:'[^']*'                   # LITA-enclosed value
+          |"[^"]*"                   # LIT-enclosed value
+          |(?!['"])[^>\s]*           # bare value
+         )
+        \s*                          # possibly followed by a space
+       )?(?:\s|/(?!>))*
+     )*
+   )?
+  \s*                                # trailing whitespace
+""", re.VERBOSE)
+
+# start tag without attributes, the most frequent one, is handled without searching for attributes
+SIMPLE_STARTTAG = re.compile(r'<([a-zA-Z][^\t\n\r\f />\x00]*)>')
+
+ENDTAGFIND = re.compile(r'</\s*([a-zA-Z][-.a-zA-Z0-9:_]*)\s*>')
+
+# names of all end tags which can be found by html.parser (and some other strings)
+ENDTAG_NAME = re.compile(r'</\s*([a-zA-Z][^\t\n\r\f />\x00]*)')
+
+# start of a tag, an end tag, a bogus comment or a processing instruction for html.parser
+TAG_OPEN = re.compile(r'<[a-zA-Z/?]')
+
+COMMENT_CLOSE = re.compile(r'--\s*>')
+
+DECLARATION_NAME = re.compile(r'[a-zA-Z][-_.a-zA-Z0-9]*\s*')
+
+MARKED_SECTION_CLOSE = re.compile(r']\s*]\s*>')
+
+MS_MARKED_SECTION_CLOSE = re.compile(r']\s*>')
+
+# character reference can be continued by the next part if there is no space or ';' after '&'
+REFERENCE_END = re.compile(r'[\s;]')
+
+
+class Tokenizer(abc.ABC):
+    """Base class for tokenizers which are used instead of html.parser.HTMLParser.
+
+    Tokenizer splits html document to a stream of events and passes them to the handler (the same
+    methods are called by html.parser): handle_starttag(name, attrs), handle_startendtag(name, attrs),
+    handle_endtag(name) and handle_data(data). Names of tags and attributes are in lower case,
+    character references in data and values of attributes are converted. After handle_starttag
+    tokenizer checks property skipped_element of the handler (see DocumentParser.skip_content),
+    it must be reset to None by tokenizer if the content is skipped or not.
+
+    Args:
+        handler: Object which handles events (DocumentParser).
+
+    Returns:
+        Tokenizer object.
+
+    Subclasses must define methods feed, close and reset, incomplete tokenizers can't be created.
+
+    Methods defined here:
+        feed(self, data)
+            Tokenize a part of the document, incomplete tokens are kept until the next part.
+
+        close(self)
+            Tokenize buffered data, the document is finished.
+
+        reset(self)
+            Remove buffered data.
+    """
+    def __init__(self, handler):
+        self._handler = handler
+
+    @abc.abstractmethod
+    def feed(self, data):
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+    @property
+    def handler(self):
+        return self._handler
+
+
+class RegexTokenizer(Tokenizer):
+    """Creates tokenizer which finds tags by regular expressions without tracking line numbers.
+
+    It uses the same patterns and recovers from errors in the same way as html.parser, so results
+    of parsers are the same, but events are produced with less work for every token (html.parser
+    counts lines and columns of every token, checks every character reference separately and
+    calls a method for every comment and declaration, which are ignored by parsers of this
+    package). Comments, declarations and processing instructions are skipped.
+
+    Usage:
+        splitter = get_html_splitter(tags_to_save={'title'}, backend='regex')
+
+    Args:
+        handler: Object which handles events (DocumentParser).
+
+    Returns:
+        RegexTokenizer object.
+    """
+    def __init__(self, handler):
+        super(RegexTokenizer, self).__init__(handler)
+
+        self._rawdata = ''
+        # element which content is raw text and pattern of its end tag
+        self._raw_name = None
+        self._raw_end = None
+
+    def feed(self, data):
+        self._rawdata += data
+        self._tokenize(False)
+
+    def close(self):
+        self._tokenize(True)
+
+    def reset(self):
+        self._rawdata = ''
+        self._raw_name = None
+        self._raw_end = None
+
+    def _tokenize(self, end):
+        rawdata = self._rawdata
+        handler = self._handler
+        handle_data = handler.handle_data
+
+        i = 0
+        n = len(rawdata)
+
+        while i < n:
+            if self._raw_end is not None:
+                match = self._raw_end.search(rawdata, i)
+
+                # content without the end tag is kept until the end tag is fed (and lost at the end)
+                if match is None:
+                    break
+
+                j = match.start()
+                if i < j:
+                    handle_data(rawdata[i:j])
+
+                handler.handle_endtag(self._raw_name)
+                self._raw_name = self._raw_end = None
+                i = match.end()
+                continue
+
+            j = rawdata.find('<', i)
+
+            if j < 0:
+                if not end:
+                    ampersand = rawdata.rfind('&', max(i, n - 34))
+
+                    if ampersand >= 0 and not REFERENCE_END.search(rawdata, ampersand):
+                        break
+
+                j = n
+
+            if i < j:
+                handle_data(unescape(rawdata[i:j]))
+
+            i = j
+
+            if i == n:
+                break
+
+            char = rawdata[i + 1:i + 2]
+
+            if char in ASCII_LETTERS:
+                k = self._parse_starttag(rawdata, i)
+            elif char == '/':
+                k = self._parse_endtag(rawdata, i)
+            elif char == '?':
+                k = _find_end(rawdata, '>', i + 2)
+            elif char == '!':
+                k = _parse_declaration(rawdata, i)
+            elif i + 1 < n:
+                handle_data('<')
+                k = i + 1
+            else:
+                break
+
+            if k < 0:
+                if not end:
+                    break
+
+                k = rawdata.find('>', i + 1)
+
+                if k < 0:
+                    k = rawdata.find('<', i + 1)
+
+                    if k < 0:
+                        k = i + 1
+                else:
+                    k += 1
+
+                handle_data(unescape(rawdata[i:k]))
+
+            i = k
+
+        if end and i < n and self._raw_end is None:
+            handle_data(unescape(rawdata[i:n]))
+            i = n
+
+        self._rawdata = rawdata[i:]
+
+    def _parse_starttag(self, rawdata, i):
+        match = SIMPLE_STARTTAG.match(rawdata, i)
+
+        if match is not None:
+            return self._handle_starttag(rawdata, match.group(1).lower(), [], match.end())
+
+        endpos = LOCATE_STARTTAG_END.match(rawdata, i).end()
+        next_char = rawdata[endpos:endpos + 1]
+
+        if next_char == '>':
+            endpos += 1
+        elif next_char == '/':
+            if not rawdata.startswith('/>', endpos):
+                return -1
+
+            endpos += 2
+        elif not next_char or next_char in INCOMPLETE_STARTTAG_END:
+            return -1
+        elif endpos == i:
+            endpos = i + 1
+
+        match = TAGFIND.match(rawdata, i + 1)
+        name = match.group(1).lower()
+        k = match.end()
+
+        attrs = []
+
+        while k < endpos:
+            match = ATTRFIND.match(rawdata, k)
+
+            if match is None:
+                break
+
+            attr_name, rest, value = match.group(1, 2, 3)
+
+            if not rest:
+                value = None
+            elif value[:1] == '\'' == value[-1:] or value[:1] == '"' == value[-1:]:
+                value = value[1:-1]
+
+            if value:
+                value = unescape(value)
+
+            attrs.append((attr_name.lower(), value))
+            k = match.end()
+
+        tag_end = rawdata[k:endpos].strip()
+
+        if tag_end not in ('>', '/>'):
+            self._handler.handle_data(rawdata[i:endpos])
+            return endpos
+
+        if tag_end == '/>':
+            self._handler.handle_startendtag(name, attrs)
+            return endpos
+
+        return self._handle_starttag(rawdata, name, attrs, endpos)
+
+    def _handle_starttag(self, rawdata, name, attrs, endpos):
+        handler = self._handler
+        handler.handle_starttag(name, attrs)
+
+        skipped_element = handler.skipped_element
+
+        if skipped_element is not None:
+            handler.skipped_element = None
+
+        if name in RAW_TEXT_ELEMENTS:
+            self._raw_name = name
+            self._raw_end = _get_raw_end(name)
+        elif skipped_element is not None and can_skip_content(rawdata, endpos, *skipped_element):
+            self._raw_name = skipped_element[0]
+            self._raw_end = _get_raw_end(self._raw_name)
+
+        return endpos
+
+    def _parse_endtag(self, rawdata, i):
+        gtpos = rawdata.find('>', i + 1)
+
+        if gtpos < 0:
+            return -1
+
+        match = ENDTAGFIND.match(rawdata, i)
+
+        if match is not None:
+            self._handler.handle_endtag(match.group(1).lower())
+            return gtpos + 1
+
+        match = TAGFIND.match(rawdata, i + 2)
+
+        if match is None:
+            # '</>' and bogus comment
+            return i + 3 if rawdata.startswith('</>', i) else gtpos + 1
+
+        self._handler.handle_endtag(match.group(1).lower())
+
+        return rawdata.find('>', match.end()) + 1
+
+
+BACKENDS = {
+    'html.parser': None,
+    'regex': RegexTokenizer
+}
+
+
+def get_tokenizer(backend, handler):
+    """Returns tokenizer of the backend for the handler.
+
+    Args:
+        backend: Name of the backend from BACKENDS ('html.parser' - html.parser.HTMLParser, which
+            handler is derived from, 'regex' - RegexTokenizer).
+        handler: Object which handles events (DocumentParser).
+
+    Returns:
+        Tokenizer object (None for 'html.parser').
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+    try:
+        tokenizer_class = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            'Unknown backend: {0!r} (available: {1})'.format(backend, ', '.join(sorted(BACKENDS)))
+        ) from None
+
+    if tokenizer_class is None:
+        return None
+
+    return tokenizer_class(handler)
+
+
+@functools.lru_cache(maxsize=128)
+def get_skip_patterns(name, keep):
+    """Returns patterns for skipping content of the element (see DocumentParser.skip_content).
+
+    Args:
+        name: Name of the element.
+        keep: Frozenset with names of elements which must not be skipped.
+
+    Returns:
+        Tuple (pattern of tags which block skipping, pattern of the end tag).
+    """
+    names = '|'.join(re.escape(tag) for tag in sorted({name, 'script', 'style'} | keep))
+
+    return (
+        re.compile(r'<(?:!|/?\s*(?:{0})(?![\w-]))'.format(names), re.IGNORECASE),
+        _get_raw_end(name)
+    )
+
+
+def can_skip_content(rawdata, start, name, keep, open_names):
+    """Checks that content of the element can be skipped to its end tag (see DocumentParser.skip_content).
+
+    Args:
+        rawdata: Html document.
+        start: Position after the start tag of the element.
+        name: Name of the element.
+        keep: Frozenset with names of elements which must not be skipped.
+        open_names: Names of open elements, their end tags close the element before its own end tag.
+
+    Returns:
+        True if the end tag of the element is fed and the content before it can be skipped.
+    """
+    blocks, endtag = get_skip_patterns(name, keep)
+
+    # the first tag which blocks skipping must be the end tag of the element
+    match = blocks.search(rawdata, start)
+
+    if match is None or not endtag.match(rawdata, match.start()):
+        return False
+
+    end = match.start()
+
+    # the end tag is found as text, so it can be a part of a tag before it (a quoted attribute value
+    # or a tag which is not closed): tags before it are found like in html.parser, and content
+    # is tokenized as usual if one of them is not closed before the end tag
+    position = start
+
+    while True:
+        tag = TAG_OPEN.search(rawdata, position, end)
+
+        if tag is None:
+            break
+
+        tag_end = _find_tag_end(rawdata, tag.start())
+
+        if tag_end < 0 or tag_end > end:
+            return False
+
+        position = tag_end
+
+    return not any(
+        endtag_name.lower() in open_names for endtag_name in ENDTAG_NAME.findall(rawdata, start, end)
+    )
+
+
+def _find_tag_end(rawdata, i):
+    # position after the tag which starts at i or -1 if it is not a whole tag
+    if rawdata[i + 1] in '/?':
+        # end tags, bogus comments and processing instructions end with the first '>'
+        return _find_end(rawdata, '>', i)
+
+    j = LOCATE_STARTTAG_END.match(rawdata, i).end()
+
+    if rawdata.startswith('>', j):
+        return j + 1
+    if rawdata.startswith('/>', j):
+        return j + 2
+
+    return -1
+
+
+@functools.lru_cache(maxsize=128)
+def _get_raw_end(name):
+    # the same pattern as the end of content of <script> in html.parser
+    return re.compile(r'</\s*{0}\s*>'.format(re.escape(name)), re.IGNORECASE)
+
+
+def _find_end(rawdata, end, start):
+    # position after the end or -1 if it is not fed yet
+    position = rawdata.find(end, start)
+
+    return position + len(end) if position >= 0 else -1
+
+
+def _parse_declaration(rawdata, i):
+    if rawdata.startswith('<!--', i):
+        match = COMMENT_CLOSE.search(rawdata, i + 4)
+
+        return -1 if match is None else match.end()
+
+    if rawdata.startswith('<![', i):
+        match = DECLARATION_NAME.match(rawdata, i + 3)
+
+        if match is not None:
+            if match.end() == len(rawdata):
+                return -1
+
+            section = match.group().strip().lower()
+
+            if section in ('temp', 'cdata', 'ignore', 'include', 'rcdata'):
+                match = MARKED_SECTION_CLOSE.search(rawdata, i + 3)
+
+                return -1 if match is None else match.end()
+
+            if section in ('if', 'else', 'endif'):
+                match = MS_MARKED_SECTION_CLOSE.search(rawdata, i + 3)
+
+                return -1 if match is None else match.end()
+        elif i + 3 == len(rawdata):
+            return -1
+    elif rawdata[i:i + 9].lower() == '<!doctype':
+        return _find_end(rawdata, '>', i + 9)
+
+    # bogus comment
+    return _find_end(rawdata, '>', i + 2)
@@ -8,5 +8,8 @@ setup(
     author='emludei',
     author_email='incontrol64@yandex.ru',
     license='Apache License 2.0',
-    packages=['html_to_text']
+    packages=['html_to_text'],
+    entry_points={
+        'console_scripts': ['html-to-text=html_to_text.cli:main']
+    }
 )
\ No newline at end of file
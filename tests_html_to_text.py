@@ -1,8 +1,26 @@
+import asyncio
+import copy
+import codecs
+import gzip
+import io
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+import zlib
 
 from collections import namedtuple
 
-from html_to_text import parser
+from concurrent import futures
+
+from unittest import mock
+
+from html_to_text import aio, batch, cache, charset, cli, files, parser, pool, scoring, selector, tokenizer
 
 
 class TestTag(unittest.TestCase):
@@ -116,6 +134,128 @@ class TestChunk(unittest.TestCase):
 
         self.assertEqual(chunk.weight, weight)
 
+    def test_make_calculations_with_extracted_text(self):
+        chunk = parser.Chunk(self.chunk, text=self.useful_text)
+        chunk.make_calculations(None, self.punctuation)
+
+        expected = parser.Chunk(self.chunk)
+        expected.make_calculations(self.cleaner, self.punctuation)
+
+        self.assertEqual(chunk.chunk, self.useful_text)
+        self.assertEqual(chunk.weight, expected.weight)
+
+    def test_chunk_class(self):
+        class HTMLChunk(parser.Chunk):
+            def __init__(self, chunk=''):
+                super(HTMLChunk, self).__init__(chunk)
+
+        html = '<div><p>Some text, <a href="#">a link</a>.</p><p>Text</p></div>'
+
+        html_parser = parser.get_parser(set(), set())
+        html_parser.feed(html)
+
+        for fast in (False, True):
+            chunk_parser = parser.get_parser(set(), set(), chunk_class=HTMLChunk, fast=fast)
+            chunk_parser.feed(html)
+
+            self.assertIsInstance(chunk_parser._splitter.data[0], HTMLChunk)
+            self.assertEqual(
+                [(chunk.chunk, chunk.features) for chunk in chunk_parser._splitter.data],
+                [(chunk.chunk, chunk.features) for chunk in html_parser._splitter.data]
+            )
+
+    def test_vectorized_weights(self):
+        chunks = [
+            self.chunk,
+            '<p>Text without punctuation</p>',
+            '<div>Text, <a href="/">link</a>. More text!</div>',
+            '<p>' + 'Long text. ' * 50 + '</p>'
+        ]
+        wrappers = [parser.ChunksWrapper(vectorized=vectorized) for vectorized in (False, True)]
+
+        for chunks_wrapper in wrappers:
+            for chunk in chunks:
+                chunks_wrapper.create(chunk)
+
+            chunks_wrapper.calculate_weights(self.cleaner, self.punctuation)
+
+        weights, vectorized_weights = ([chunk.weight for chunk in wrapper.data] for wrapper in wrappers)
+
+        self.assertEqual(weights[1], 0)
+
+        for weight, vectorized_weight in zip(weights, vectorized_weights):
+            self.assertAlmostEqual(weight, vectorized_weight)
+
+        features = zip(*(chunk.features for chunk in wrappers[0].data))
+
+        for weight, calculated_weight in zip(weights, scoring.calculate_weights(*features)):
+            self.assertAlmostEqual(weight, calculated_weight)
+
+    @unittest.skipIf(scoring.numpy is None, 'NumPy is not installed')
+    def test_numpy_weights(self):
+        # lengths with tags, lengths without tags, lengths of links and numbers of punctuation marks
+        features = [
+            (46, 32, 13, 2),
+            (30, 24, 0, 0),
+            (0, 0, 0, 0),
+            (48, 29, 4, 3),
+            (570, 550, 0, 50),
+            (12, 5, 5, 5)
+        ]
+        columns = [list(column) for column in zip(*features)]
+
+        weights = scoring.calculate_weights(*columns)
+
+        with mock.patch.object(scoring, 'numpy', None):
+            self.assertEqual(scoring.calculate_weights(*columns), [scoring.calculate_weight(*row) for row in features])
+
+        for weight, expected_weight in zip(weights, (scoring.calculate_weight(*row) for row in features)):
+            self.assertAlmostEqual(weight, expected_weight)
+
+    def test_punctuation_counter(self):
+        text = 'Текст, text… – «text»! 文本。'
+        counter = scoring.get_punctuation_counter(self.punctuation)
+
+        self.assertIs(counter, scoring.get_punctuation_counter(self.punctuation))
+        self.assertEqual(counter.count(text), 2)
+        self.assertEqual(scoring.count_punctuation_marks(self.chunk, counter), 2)
+
+        self.assertEqual(scoring.PunctuationCounter(self.punctuation, {'Pd'}).count(text), 3)
+        self.assertEqual(scoring.PunctuationCounter('', {'P'}).count(text), 7)
+
+        html_parser = parser.get_parser(set(), set(), punctuation='', punctuation_categories={'Po'})
+        html_parser.feed('<p>文本。文本</p>')
+
+        self.assertEqual(html_parser.data, '文本。文本')
+
+    def test_columnar_chunks_wrapper(self):
+        chunks = [self.chunk, '<p>Text without punctuation</p>', '<div>Text, <a href="/">link</a>. More!</div>']
+
+        chunks_wrapper = parser.ChunksWrapper()
+        columnar_wrapper = parser.get_chunks_wrapper(parser.Chunk, columnar=True)
+
+        for chunk in chunks:
+            chunks_wrapper.create(chunk)
+            columnar_wrapper.create(chunk)
+
+        columnar_wrapper.create('<p>Extracted text.</p>', text=' Extracted  text. ')
+
+        self.assertEqual(len(columnar_wrapper.data), 0)
+
+        chunks_wrapper.calculate_weights(self.cleaner, self.punctuation)
+        columnar_wrapper.calculate_weights(self.cleaner, self.punctuation)
+
+        self.assertEqual(columnar_wrapper.calculated, 4)
+        self.assertEqual(columnar_wrapper.data[-1].chunk, 'Extracted text.')
+
+        for chunk, record in zip(chunks_wrapper.data, columnar_wrapper.data[:3]):
+            self.assertEqual(chunk.chunk, record.chunk)
+            self.assertEqual(chunk.length_of_links, record.length_of_links)
+            self.assertAlmostEqual(chunk.weight, record.weight)
+
+        self.assertEqual(len(columnar_wrapper.pop_calculated()), 4)
+        self.assertEqual(len(columnar_wrapper.data), 0)
+
 
 class TestCleaner(unittest.TestCase):
     def test_feed(self):
@@ -131,6 +271,56 @@ class TestCleaner(unittest.TestCase):
 
         self.assertEqual(cleaner.data, cleaned_html)
 
+    def test_remove_selectors(self):
+        html = (
+            '<div><div class="left sidebar">Menu<div>item</div></div><nav id="menu">Links</nav>'
+            '<p class="sidebar-text">Text<img src="#"> <span aria-hidden="true">icon</span></p></div>'
+        )
+        selectors = {'div.sidebar', '#menu', 'span[aria-hidden="true"]', 'img'}
+
+        cleaner = parser.get_html_cleaner(remove_selectors=selectors)
+        cleaner.feed(html)
+
+        self.assertEqual(cleaner.data, '<div><p class="sidebar-text">Text </p></div>')
+
+        for options in ({}, {'fast': True}, {'skip_removed': True}):
+            html_parser = parser.get_parser(set(), set(), remove_selectors=selectors, **options)
+            html_parser.feed(html)
+
+            self.assertEqual(html_parser.data, 'Text')
+
+        matcher = selector.SelectorMatcher({'a[rel=nofollow]', '[hidden]'})
+
+        self.assertTrue(matcher.match('a', [('href', '#'), ('rel', 'nofollow')]))
+        self.assertTrue(matcher.match('p', [('hidden', None)]))
+        self.assertFalse(matcher.match('a', [('rel', 'next')]))
+        self.assertRaises(ValueError, selector.SelectorMatcher, {'div > p'})
+
+    def test_remove_not_closed_elements(self):
+        documents = [
+            # <li> and <p> are closed by the next element, which can't be nested in them
+            ('<ul><li class="sponsored">Buy now, cheap!<li>Real item, text.</ul><p>Article text, here.</p>',
+             '<ul><li>Real item, text.</ul><p>Article text, here.</p>'),
+            ('<div><p class="ad">Buy now, cheap!<div>Real item, text.</div></div><p>Article text, here.</p>',
+             '<div><div>Real item, text.</div></div><p>Article text, here.</p>'),
+            # end tag of the parent closes the removed element with elements opened inside it
+            ('<div><p>Real item, text.<span class="ad">Buy <i>now</div><p>Article text, here.</p>',
+             '<div><p>Real item, text.</div><p>Article text, here.</p>')
+        ]
+        selectors = {'li.sponsored', 'p.ad', 'span.ad'}
+
+        for html, cleaned_html in documents:
+            cleaner = parser.get_html_cleaner(remove_selectors=selectors)
+            cleaner.feed(html)
+
+            self.assertEqual(cleaner.data, cleaned_html)
+
+            for options in ({}, {'fast': True}, {'backend': 'regex'}):
+                html_parser = parser.get_parser(set(), set(), remove_selectors=selectors, **options)
+                html_parser.feed(html)
+
+                self.assertEqual(html_parser.data, 'Real item, text. Article text, here.')
+
 
 class TestHTMLChunksCleaner(unittest.TestCase):
     def setUp(self):
@@ -202,8 +392,8 @@ class TestHTMLSplitter(unittest.TestCase):
         html = '<div>asdasd<h1>Test <b>h1</b></h1>asdsad<h2>Test h2</h2>asdasd</div>'
 
         saved_tags = {
-            'h1': ['<h1>Test <b>h1</b></h1>'],
-            'h2': ['<h2>Test h2</h2>']
+            'h1': ['Test h1'],
+            'h2': ['Test h2']
         }
 
         splitter = parser.HTMLSplitter(
@@ -218,6 +408,1140 @@ class TestHTMLSplitter(unittest.TestCase):
 
         self.assertEqual(splitter.saved_tags, saved_tags)
 
+    def test_save_chunks_wrapper_without_is_full(self):
+        class SaveChunksWrapper:
+            def __init__(self):
+                self.data = []
+
+            def create(self, chunk, tag_name):
+                self.data.append((tag_name, chunk))
+
+            def clear(self):
+                self.data.clear()
+
+        for fast in (False, True):
+            html_parser = parser.get_parser(
+                {'h1'}, set(), fast=fast, save_chunks_wrapper=SaveChunksWrapper()
+            )
+            html_parser.feed('<div><h1>One</h1><h1>Two</h1></div>')
+
+            self.assertEqual(html_parser.saved_tags, [('h1', 'One'), ('h1', 'Two')])
+
+    def test_saving_limits_and_attributes(self):
+        html = (
+            '<html><head><title>Title</title><meta name="description" content="Some  description">'
+            '<script>var a;</script></head><body><svg><title>Icon</title></svg>'
+            '<ul><li><a href="/1">One &lt;1&gt;</a></li><li> </li><li><a href="/2">Two</a></li>'
+            '<li><a href="/3">Three</a></li></ul></body></html>'
+        )
+
+        for fast in (False, True):
+            html_parser = parser.get_parser(
+                {'title', 'li'}, {'head', 'script'}, fast=fast, skip_removed=True, max_per_tag=2,
+                attributes_to_save={'meta[content]', 'a[href]'}, first_only=parser.FIRST_ONLY_TAGS
+            )
+            html_parser.feed(html)
+
+            self.assertEqual(html_parser.saved_tags, {
+                'title': ['Title'],
+                'li': ['One <1>', 'Two'],
+                'meta[content]': ['Some description'],
+                'a[href]': ['/1', '/2']
+            })
+
+            unlimited_parser = parser.get_parser({'title', 'li'}, {'head', 'script'}, fast=fast)
+            unlimited_parser.feed(html)
+
+            self.assertEqual(unlimited_parser.saved_tags['li'], ['One <1>', 'Two', 'Three'])
+            self.assertEqual(unlimited_parser.saved_tags['title'], ['Title', 'Icon'])
+            self.assertEqual(unlimited_parser.data, html_parser.data)
+
+        with self.assertRaises(ValueError):
+            parser.get_parser({'title'}, set(), attributes_to_save={'href'})
+
+    def test_text_and_links_length(self):
+        html = '<div><p>Some <b>text</b> and <a href="#">a link</a>.</p><p><a href="#">link</a></p></div>'
+
+        splitter = parser.HTMLSplitter(
+            tag_wrapper=parser.get_tag_wrapper(False, parser.Tag),
+            chunks_wrapper=parser.get_chunks_wrapper(parser.Chunk),
+            save_chunks_wrapper=parser.get_save_chunks_wrapper()
+        )
+
+        splitter.feed(html)
+        splitter.chunks_wrapper.calculate_weights(None, '.')
+
+        self.assertEqual([chunk.chunk for chunk in splitter.data], ['Some text and a link.', 'link'])
+        self.assertEqual([chunk.length_of_links for chunk in splitter.data], [6, 4])
+
+    def test_weights_of_spaced_markup(self):
+        html = (
+            '<div><p> Some <a href="#"> spaced link </a> text, here. </p>'
+            '<p>Text <b>bold</b> <i> and </i>\n<a href="#">a <b>link</b></a> .</p></div>'
+        )
+        # weights of chunks which html is cleaned by HTMLChunksCleaner
+        chunks = [
+            '<p> Some <a> spaced link </a> text, here. </p>',
+            '<p>Text <b>bold</b><i> and </i><a>a <b>link</b></a> .</p>'
+        ]
+        features = []
+
+        for chunk in chunks:
+            chunk = parser.Chunk(chunk)
+            chunk.make_calculations(parser.get_html_chunks_cleaner('a'), '.,!?:;')
+            features.append((chunk.features, chunk.weight))
+
+        for options in ({}, {'fast': True}, {'columnar': True}, {'incremental': True}):
+            html_parser = parser.get_parser(set(), set(), min_allowed_weight=2.2, **options)
+
+            if options.get('incremental'):
+                for index in range(0, len(html), 5):
+                    html_parser.feed(html[index:index + 5])
+
+                html_parser.close()
+            else:
+                html_parser.feed(html)
+
+            self.assertEqual(
+                [(tuple(chunk[2:6]) if options.get('columnar') else chunk.features, chunk.weight)
+                 for chunk in html_parser._splitter.data],
+                features
+            )
+            self.assertEqual(html_parser.data, 'Some spaced link text, here.')
+
+    def test_malformed_nesting(self):
+        html = (
+            'Text before.</b><div><p>One<br>two<p>Three <img src="#"><a href="#">link<a href="#">link</a>'
+            '<ul><li>Item<li>Item <i>text</ul><table><tr><td>Cell<td>Cell<tr><td>Cell</table></div>'
+        )
+
+        chunks = [
+            'Text before.',
+            '<p>One<br>two</p>',
+            '<p>Three <img><a>link</a><a>link</a></p>',
+            '<li>Item</li>',
+            '<li>Item <i>text</i></li>',
+            '<td>Cell</td>',
+            '<td>Cell</td>',
+            '<td>Cell</td>'
+        ]
+
+        splitter = parser.HTMLSplitter(
+            tag_wrapper=parser.get_tag_wrapper(False, parser.Tag),
+            chunks_wrapper=parser.get_chunks_wrapper(parser.Chunk),
+            save_chunks_wrapper=parser.get_save_chunks_wrapper()
+        )
+        fast_splitter = parser.get_fast_html_splitter(
+            set(), set(), parser.get_chunks_wrapper(parser.Chunk), parser.get_save_chunks_wrapper()
+        )
+
+        splitter.feed(html)
+        fast_splitter.feed(html)
+
+        self.assertEqual([chunk.chunk for chunk in splitter.data], chunks)
+
+        splitter.chunks_wrapper.calculate_weights(None, '.')
+        fast_splitter.chunks_wrapper.calculate_weights(None, '.')
+
+        self.assertEqual(
+            [(chunk.chunk, chunk.features) for chunk in fast_splitter.data],
+            [(chunk.chunk, chunk.features) for chunk in splitter.data]
+        )
+
+    def test_fast_splitter(self):
+        html = (
+            '<html><head><title> Test  title </title></head><body>\n'
+            '<div> <p>Some <b>text</b>  and\n<a href="#">a  link</a> .</p>\n<p> <i> </i>text </p>'
+            '<h1>Header <span>text</span></h1></div></body></html>'
+        )
+        splitters = [
+            parser.get_html_splitter(
+                {'title', 'h1'}, {'head'}, parser.get_tag_wrapper(False, parser.Tag),
+                parser.get_chunks_wrapper(parser.Chunk), parser.get_save_chunks_wrapper()
+            ),
+            parser.get_fast_html_splitter(
+                {'title', 'h1'}, {'head'}, parser.get_chunks_wrapper(parser.Chunk), parser.get_save_chunks_wrapper()
+            )
+        ]
+
+        for splitter in splitters:
+            splitter.feed(html)
+            splitter.chunks_wrapper.calculate_weights(None, '.')
+
+        html_splitter, fast_splitter = splitters
+
+        self.assertEqual(fast_splitter.saved_tags, html_splitter.saved_tags)
+        self.assertEqual(fast_splitter.tags_count, html_splitter.tags_count)
+        self.assertEqual(
+            [(chunk.chunk, chunk.features) for chunk in fast_splitter.data],
+            [(chunk.chunk, chunk.features) for chunk in html_splitter.data]
+        )
+        self.assertRaises(ValueError, parser.get_parser, set(), set(), save_attrs=True, fast=True)
+
+    def test_skip_removed(self):
+        html = (
+            '<html><head><title>Title</title></head><body><p>One, two.</p>'
+            '<pre>code <span>a</span><span>b</span></pre><nav><nav>x</nav></nav>'
+            '<pre><!-- </pre> --> comment</pre><pre>not closed'
+        )
+        kwargs = {'tags_to_save': {'title'}, 'tags_to_remove': {'head', 'pre', 'nav'}, 'collect_stats': True}
+
+        html_parser = parser.get_parser(**kwargs)
+        html_parser.feed(html)
+
+        for options in ({}, {'fast': True}, {'incremental': True}):
+            skip_parser = parser.get_parser(**kwargs, **options, skip_removed=True)
+            skip_parser.feed(html)
+
+            if options.get('incremental'):
+                skip_parser.close()
+
+            self.assertEqual(skip_parser.data, html_parser.data)
+            self.assertEqual(skip_parser.saved_tags, {'title': ['Title']})
+            # only two <span> tags are skipped, <head> and nested <nav> are parsed
+            self.assertEqual(skip_parser.stats.tags, html_parser.stats.tags - 2)
+
+        cleaner = parser.get_html_cleaner(remove_with_content={'pre'}, skip_removed=True)
+        cleaner.feed('<div>text<pre>code <span>a</span></pre><pre/>text</div>')
+
+        self.assertEqual(cleaner.data, '<div>texttext</div>')
+
+    def test_skip_removed_malformed(self):
+        documents = [
+            '<div><p>Removed, p.<div>Kept div text, yes.</div></p><span>Tail, text.</span></div>',
+            '<ul><li>Removed, li.<li>Kept item, text.</li></ul>',
+            '<div><p>Removed <b>text</div>Kept text, yes.</p>',
+            '<select><option>Kept, option.<nav><span>Removed<option>Kept, too.</nav></select>',
+            '<table><tr><td>Removed, cell.<tr><td>Kept, cell.</td></tr></table>',
+            # end tags in attribute values and in tags which are not closed
+            '<nav>menu <b title="</nav>">x</b> rest</nav>tail text, yes.',
+            '<svg><g a="</svg>"/>z</svg>outside, text.',
+            '<div class="sidebar">side <x </div>after, text. ok!',
+            '<div id="menu">menu <b title=\'</div>\'>x</b></div>tail, text.',
+            '<p>Removed <b title="</p>">text</b> too.</p>Kept text, yes.'
+        ]
+        tags = ['div', 'p', 'li', 'ul', 'span', 'b', 'td', 'tr', 'table', 'dd', 'option', 'select', 'nav', 'br']
+        words = ['Text, here.', 'word', ' ', 'more text.']
+        rand = random.Random(0)
+
+        for _ in range(300):
+            document = []
+
+            for _ in range(30):
+                tag = rand.choice(tags)
+                document.append(rand.choice(('<{0}>', '<{0} class="ad">', '</{0}>', rand.choice(words))).format(tag))
+
+            documents.append(''.join(document))
+
+        kwargs = {
+            'tags_to_save': {'dd'},
+            'tags_to_remove': {'p', 'li', 'td', 'option'},
+            'remove_with_content': {'nav', 'svg'},
+            'remove_selectors': {'div.ad', 'span.ad', '.sidebar', '#menu'}
+        }
+
+        for document in documents:
+            for options in ({}, {'fast': True}, {'backend': 'regex'}):
+                html_parser = parser.get_extractor(**kwargs, **options)
+                html_parser.feed(document)
+
+                skip_parser = parser.get_extractor(**kwargs, **options, skip_removed=True)
+                skip_parser.feed(document)
+
+                self.assertEqual(skip_parser.result, html_parser.result, (options, document))
+
+            cleaner = parser.get_html_cleaner(remove_with_content={'p', 'li', 'nav', 'svg'})
+            cleaner.feed(document)
+
+            skip_cleaner = parser.get_html_cleaner(remove_with_content={'p', 'li', 'nav', 'svg'}, skip_removed=True)
+            skip_cleaner.feed(document)
+
+            self.assertEqual(skip_cleaner.data, cleaner.data, document)
+
+    def test_text_outside_of_tags(self):
+        parts = ['Hello wor', 'ld, a < b', ' is text.<p>Para', 'graph.</p>After ', 'the paragraph.']
+
+        for fast in (False, True):
+            html_parser = parser.get_parser(set(), set(), fast=fast)
+            html_parser.feed(''.join(parts))
+
+            incremental_parser = parser.get_parser(set(), set(), fast=fast, incremental=True)
+
+            for part in parts:
+                incremental_parser.feed(part)
+
+            incremental_parser.close()
+
+            chunks = ['Hello world, a < b is text.', 'Paragraph.', 'After the paragraph.']
+
+            self.assertEqual([chunk.chunk for chunk in html_parser._splitter.data], chunks)
+            self.assertEqual(
+                [(chunk.chunk, chunk.features) for chunk in incremental_parser._splitter.data],
+                [(chunk.chunk, chunk.features) for chunk in html_parser._splitter.data]
+            )
+
+
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        self.html = (
+            '<html><head><title>Example</title><script>var a = "<p>script</p>";</script></head>'
+            '<body><div><h1>This is h1 example.</h1>'
+            '<p><b>This</b> is <b><s>some</s> text</b> information. This is some <span>text</span> '
+            'information.</p><p>Some text<style>p {color: red;}</style>, and more text.</p></div>'
+            '<ul><li><a href="#">page 1</a></li><li><a href="#">page 2</a></li></ul></body></html>'
+        )
+        self.parser_kwargs = {
+            'tags_to_save': {'title', 'h1'},
+            'tags_to_remove': {'h1', 'script', 'style'},
+            'min_allowed_weight': 2.3
+        }
+        self.cleaner_kwargs = {
+            'remove_without_content': {'b', 's', 'span'},
+            'remove_with_content': {'style', 'script'}
+        }
+
+    def test_extractor(self):
+        cleaner = parser.get_html_cleaner(**self.cleaner_kwargs)
+        cleaner.feed(self.html)
+
+        html_parser = parser.get_parser(**self.parser_kwargs)
+        html_parser.feed(cleaner.data)
+
+        extractor = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs)
+        extractor.feed(self.html)
+
+        self.assertEqual(extractor.data, html_parser.data)
+        self.assertEqual(extractor.saved_tags, html_parser.saved_tags)
+        self.assertIn('This is some text information.', extractor.data)
+        self.assertNotIn('page', extractor.data)
+
+    def test_columnar_and_vectorized(self):
+        html_parser = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs)
+        chunks = list(html_parser.iter_chunks(self.html))
+        html_parser.feed(self.html)
+
+        for options in ({'vectorized': True}, {'columnar': True}, {'columnar': True, 'incremental': True}):
+            extractor = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs, **options)
+
+            self.assertEqual(list(extractor.iter_chunks(self.html)), chunks)
+
+            extractor.reset()
+            extractor.feed(self.html)
+
+            if options.get('incremental'):
+                extractor.close()
+
+            self.assertEqual(extractor.data, html_parser.data)
+
+    def test_data(self):
+        for options in ({}, {'columnar': True}):
+            html_parser = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs, **options)
+            html_parser.feed(self.html)
+
+            file = io.StringIO()
+            count = html_parser.write_data(file)
+
+            self.assertEqual(file.getvalue(), html_parser.data)
+            self.assertEqual(count, len(html_parser.data))
+            self.assertIs(html_parser.data, html_parser.data)
+
+            html_parser.feed('<p>Another document.</p>')
+
+            self.assertEqual(html_parser.data, 'Another document.')
+
+    def test_incremental_feed(self):
+        html_parser = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs)
+        html_parser.feed(self.html)
+
+        incremental_parser = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs, incremental=True)
+        data = self.html.replace('Example', 'Пример').encode('utf-8')
+
+        for index in range(0, len(data), 7):
+            incremental_parser.feed(data[index:index + 7])
+
+        incremental_parser.close()
+
+        self.assertEqual(incremental_parser.data, html_parser.data)
+        self.assertEqual(incremental_parser.saved_tags['title'], ['Пример'])
+
+        incremental_parser.reset()
+
+        self.assertEqual(incremental_parser.data, '')
+
+    def test_iter_chunks(self):
+        html_parser = parser.get_extractor(**self.cleaner_kwargs, **self.parser_kwargs)
+        html_parser.feed(self.html)
+
+        chunks = [(chunk.chunk, chunk.weight) for chunk in html_parser._splitter.data]
+        saved_tags = html_parser.saved_tags.copy()
+
+        html_parser.part_size = 10
+
+        self.assertEqual(list(html_parser.iter_chunks(self.html)), chunks)
+        self.assertEqual(html_parser.saved_tags, saved_tags)
+        self.assertFalse(html_parser._splitter.data)
+
+        parts = (self.html[index:index + 5] for index in range(0, len(self.html), 5))
+        text = ' '.join(html_parser.iter_text(parts))
+
+        html_parser.feed(self.html)
+
+        self.assertEqual(text, html_parser.data)
+
+    def test_stats(self):
+        statistics = []
+
+        html_parser = parser.get_extractor(
+            **self.cleaner_kwargs, **self.parser_kwargs, stats_callback=statistics.append
+        )
+        html_parser.feed(self.html)
+        html_parser.feed(self.html)
+
+        self.assertEqual(len(statistics), 2)
+        self.assertIs(html_parser.stats, statistics[-1])
+
+        stats = html_parser.stats
+
+        self.assertEqual(stats.bytes_in, len(self.html))
+        self.assertEqual(stats.bytes_out, len(html_parser.data))
+        self.assertEqual(stats.tags, 13)
+        self.assertEqual(stats.chunks, len(html_parser._splitter.data))
+        self.assertEqual(stats.accepted_chunks, 2)
+        self.assertGreater(stats.split_time, 0)
+
+        self.assertIsNone(parser.get_parser(set(), set()).stats)
+
+        # useful text is counted as chunks are accepted, so chunks which are yielded and removed are counted too
+        for columnar in (False, True):
+            html_parser = parser.get_extractor(
+                **self.cleaner_kwargs, **self.parser_kwargs, collect_stats=True, columnar=columnar
+            )
+            text = ' '.join(html_parser.iter_text(self.html))
+
+            self.assertEqual(html_parser.stats.bytes_out, len(text))
+            self.assertEqual(html_parser.stats.accepted_chunks, stats.accepted_chunks)
+            self.assertEqual(html_parser.stats.chunks, stats.chunks)
+
+            html_parser.feed(self.html)
+
+            self.assertEqual(html_parser.stats.as_dict()['bytes_out'], len(html_parser.data))
+
+        cleaner = parser.get_html_cleaner(**self.cleaner_kwargs, collect_stats=True)
+        cleaner.feed(self.html)
+
+        self.assertEqual(cleaner.stats.bytes_out, len(cleaner.data))
+        self.assertEqual(cleaner.stats.tags, 19)
+
+    def test_not_closed_document(self):
+        html_parser = parser.get_parser(set(), set())
+        html_parser.feed('<div><p>First paragraph.</p><p>Not closed paragraph')
+
+        self.assertEqual(html_parser.data, 'First paragraph. Not closed paragraph')
+
+        # saved elements are finished by close of both splitters
+        for fast in (False, True):
+            html_parser = parser.get_parser({'h1'}, set(), fast=fast)
+            html_parser.feed('<div><h1>Not closed <b>header')
+
+            self.assertEqual(html_parser.result, ('Not closed header', {'h1': ['Not closed header']}))
+
+
+class TestBackends(unittest.TestCase):
+    """Every backend must give the same results as html.parser."""
+    def setUp(self):
+        self.documents = [
+            '<html><head><title>Example &amp; title</title><script>if (a < b) {}</script></head>'
+            '<body><nav class="menu"><a href="/">Home</a></nav><div><h1>This is h1 example.</h1>'
+            '<p>This is <b>some</b> text &copy; information&#x2e; This is some text, information.</p>'
+            '<p>Some text<style>p {color: red;}</style>, and more text.</p></div></body></html>',
+            '<!DOCTYPE html><!-- comment --><?xml version="1.0"?><![CDATA[x]]><P CLASS=a>Upper case.</P>',
+            '<div <p>broken start tag</div> a < b <3 </> </ x> <br/><img src="a&amp;b" alt=\'q\' checked>',
+            '<div><p>one<p>two<ul><li>a<li>b</ul></div><table><tr><td>cell<td>cell</table>',
+            '<p>Not closed <b',
+            '<p>Text &amp',
+            '<title>Title</title><p>Text.</p><script>not closed',
+            '<p>Text.</p><!-- not closed comment'
+        ]
+        self.parser_kwargs = {
+            'tags_to_save': {'title', 'h1'},
+            'tags_to_remove': {'head', 'h1', 'script', 'style'},
+            'min_allowed_weight': 2.3
+        }
+
+    def test_parser(self):
+        for options in ({}, {'fast': True}, {'skip_removed': True, 'remove_selectors': {'nav.menu'}}):
+            for document in self.documents:
+                expected = parser.get_parser(**self.parser_kwargs, **options)
+                expected.feed(document)
+
+                for backend in tokenizer.BACKENDS:
+                    html_parser = parser.get_parser(**self.parser_kwargs, **options, backend=backend)
+                    html_parser.feed(document)
+
+                    self.assertEqual(html_parser.result, expected.result, (backend, options, document))
+
+                    incremental_parser = parser.get_parser(
+                        **self.parser_kwargs, **options, backend=backend, incremental=True
+                    )
+
+                    for index in range(0, len(document), 3):
+                        incremental_parser.feed(document[index:index + 3])
+
+                    incremental_parser.close()
+
+                    self.assertEqual(incremental_parser.result, expected.result, (backend, options, document))
+
+    def test_cleaner(self):
+        for document in self.documents:
+            expected = parser.get_html_cleaner({'b', 'span'}, {'script', 'style'})
+            expected.feed(document)
+
+            for backend in tokenizer.BACKENDS:
+                cleaner = parser.get_html_cleaner({'b', 'span'}, {'script', 'style'}, backend=backend)
+                cleaner.feed(document)
+
+                self.assertEqual(cleaner.data, expected.data, (backend, document))
+
+    def test_get_tokenizer(self):
+        cleaner = parser.get_html_cleaner(backend='regex')
+
+        self.assertIsInstance(tokenizer.get_tokenizer('regex', cleaner), tokenizer.RegexTokenizer)
+        self.assertIsNone(tokenizer.get_tokenizer('html.parser', cleaner))
+        self.assertEqual(cleaner.backend, 'regex')
+
+        with self.assertRaises(ValueError):
+            parser.get_parser(set(), set(), backend='unknown')
+
+        with self.assertRaises(ValueError):
+            parser.get_html_cleaner(convert_charrefs=False, backend='regex')
+
+        class IncompleteTokenizer(tokenizer.Tokenizer):
+            def feed(self, data):
+                pass
+
+        # tokenizer without close and reset fails when it is created, not at the end of the document
+        with self.assertRaises(TypeError):
+            IncompleteTokenizer(cleaner)
+
+
+class TestBoilerplateIndex(unittest.TestCase):
+    def setUp(self):
+        self.page = (
+            '<html><body><div><a href="/">Home</a>, <a href="/news">News</a>.</div>'
+            '<p>Text of page {0}, some text.</p><div>Copyright, all rights reserved.</div></body></html>'
+        )
+
+    def test_feed_with_url(self):
+        for options in ({}, {'fast': True}):
+            index = parser.BoilerplateIndex(min_pages=2)
+            html_parser = parser.get_parser(set(), set(), boilerplate_index=index, **options)
+            page = self.page.format(0)
+
+            for number in range(3):
+                # the same page fed again is counted once
+                html_parser.feed(page, url='http://example.com/0')
+
+            expected_parser = parser.get_parser(set(), set())
+            expected_parser.feed(page)
+
+            self.assertEqual(html_parser.data, expected_parser.data)
+
+            html_parser.feed(self.page.format(1), url='http://example.com/1')
+            html_parser.feed(self.page.format(2), url='http://example.com/2')
+
+            self.assertEqual(html_parser.data, 'Text of page 2, some text.')
+            self.assertTrue(index.is_boilerplate('example.com', 'Copyright,  all rights reserved.'))
+
+            html_parser.feed(self.page.format(3), url='http://example.org/3')
+            html_parser.feed(self.page.format(3))
+
+            self.assertIn('Copyright', html_parser.data)
+
+    def test_eviction(self):
+        index = parser.BoilerplateIndex(min_pages=1, max_hosts=2, max_fingerprints=2)
+
+        for host in ('a', 'b', 'c'):
+            for text in ('one', 'two', 'three'):
+                page_filter = index.get_filter(host)
+                page_filter(text)
+                page_filter.finish()
+
+        self.assertEqual(len(index), 2)
+        self.assertFalse(index.is_boilerplate('a', 'one'))
+        self.assertFalse(index.is_boilerplate('c', 'one'))
+        self.assertTrue(index.get_filter('c')('three'))
+
+    def test_pickle(self):
+        html_parser = parser.get_parser(set(), set(), boilerplate_pages=2)
+
+        for number in range(2):
+            html_parser.feed(self.page.format(number), url='http://example.com/{0}'.format(number))
+
+        copied_parser = pickle.loads(pickle.dumps(html_parser))
+        copied_parser.feed(self.page.format(2), url='http://example.com/2')
+
+        self.assertEqual(copied_parser.data, 'Text of page 2, some text.')
+        self.assertIsNot(copied_parser.boilerplate_index._lock, html_parser.boilerplate_index._lock)
+
+    def test_pickle_to_other_process(self):
+        page = self.page.format(0)
+        expected_parser = parser.get_parser(set(), set())
+        expected_parser.feed(page)
+
+        build = (
+            'import pickle, sys\n'
+            'from html_to_text import parser\n'
+            'index = parser.BoilerplateIndex(min_pages=2)\n'
+            'parser.get_parser(set(), set(), boilerplate_index=index).feed(sys.argv[1], url="http://example.com/0")\n'
+            'sys.stdout.buffer.write(pickle.dumps(index))\n'
+        )
+        # the page is fetched again by a process with other hash randomization
+        refetch = (
+            'import pickle, sys\n'
+            'from html_to_text import parser\n'
+            'index = pickle.loads(sys.stdin.buffer.read())\n'
+            'html_parser = parser.get_parser(set(), set(), boilerplate_index=index)\n'
+            'for number in range(2):\n'
+            '    html_parser.feed(sys.argv[1], url="http://example.com/0")\n'
+            '    print(html_parser.data)\n'
+        )
+        directory = os.path.dirname(os.path.abspath(__file__))
+        index = subprocess.run(
+            [sys.executable, '-c', build, page], cwd=directory, env=dict(os.environ, PYTHONHASHSEED='1'),
+            stdout=subprocess.PIPE, check=True
+        ).stdout
+        output = subprocess.run(
+            [sys.executable, '-c', refetch, page], cwd=directory, env=dict(os.environ, PYTHONHASHSEED='2'),
+            input=index, stdout=subprocess.PIPE, check=True
+        ).stdout
+
+        self.assertEqual(output.decode('utf-8').splitlines(), [expected_parser.data] * 2)
+
+
+class TestExtractorConfig(unittest.TestCase):
+    def setUp(self):
+        self.html = '<html><head><title>Title</title></head><body><p>Some text, and more text.</p></body></html>'
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+
+    def test_config(self):
+        self.assertEqual(self.config.tags_to_save, frozenset({'title'}))
+        self.assertEqual(pickle.loads(pickle.dumps(self.config)), self.config)
+        self.assertEqual(copy.copy(self.config), self.config)
+        self.assertEqual(hash(self.config.replace()), hash(self.config))
+        self.assertNotEqual(self.config.replace(min_allowed_weight=1.0), self.config)
+
+    def test_build(self):
+        html_parser = self.config.build()
+        html_parser.feed(self.html)
+
+        copied_parser = pickle.loads(pickle.dumps(html_parser))
+
+        self.assertEqual(copied_parser.data, 'Some text, and more text.')
+        self.assertEqual(copied_parser.saved_tags, {'title': ['Title']})
+
+
+class TestCharset(unittest.TestCase):
+    def test_detect_encoding(self):
+        html = '<html><head><meta charset="windows-1251"><title>Заголовок</title></head></html>'
+
+        self.assertEqual(charset.detect_encoding(html.encode('cp1251')), 'cp1251')
+        self.assertEqual(charset.detect_encoding(html.encode('cp1251'), hint='koi8-r'), 'koi8-r')
+        self.assertEqual(charset.detect_encoding(html.encode('cp1251'), hint='unknown'), 'cp1251')
+        self.assertEqual(charset.detect_encoding(codecs.BOM_UTF8 + html.encode('utf-8'), hint='koi8-r'), 'utf-8-sig')
+        self.assertEqual(
+            charset.detect_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">'),
+            'cp1252'
+        )
+        self.assertEqual(charset.detect_encoding(b'<p>text</p>'), 'utf-8')
+
+    def test_feed_bytes(self):
+        html = (
+            '<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1251">'
+            '<title>Заголовок</title></head><body><p>Текст документа.</p></body></html>'
+        )
+        config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+        result = ('Текст документа.', {'title': ['Заголовок']})
+
+        html_parser = config.build()
+        html_parser.feed(html.encode('cp1251'))
+
+        self.assertEqual(html_parser.result, result)
+
+        html_parser.feed(html.replace('windows-1251', 'utf-8').encode('koi8-r'), encoding='koi8-r')
+
+        self.assertEqual(html_parser.result, result)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'document.html')
+
+            with open(path, 'wb') as file:
+                file.write(codecs.BOM_UTF16_LE + html.encode('utf-16-le'))
+
+            self.assertEqual(files.extract_file(path, config), result)
+
+
+class TestFiles(unittest.TestCase):
+    def setUp(self):
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        # files are found in nested directories in sorted order, encoding is detected for every file
+        self.files = [
+            (
+                os.path.join('pages', 'a.html'),
+                '<head><title>Utf-8</title></head><p>Текст, text.</p>'.encode('utf-8'),
+                ('Текст, text.', {'title': ['Utf-8']})
+            ),
+            (
+                os.path.join('pages', 'b.html'),
+                '<head><meta charset="windows-1251"><title>Cp1251</title></head>'
+                '<p>Текст, text.</p>'.encode('cp1251'),
+                ('Текст, text.', {'title': ['Cp1251']})
+            ),
+            (
+                os.path.join('pages', 'nested', 'c.html'),
+                codecs.BOM_UTF16_LE + '<p>Utf-16.</p>'.encode('utf-16-le'),
+                ('Utf-16.', {})
+            )
+        ]
+
+        os.makedirs(os.path.join(self.directory.name, 'pages', 'nested'))
+
+        for path, content, _ in self.files:
+            with open(os.path.join(self.directory.name, path), 'wb') as file:
+                file.write(content)
+
+    def get_page(self, number):
+        return '<html><head><title>Page {0}</title></head><body><p>Text of page {0}.</p></body></html>'.format(number)
+
+    def get_warc_record(self, url, payload, content_type='application/http; msgtype=response'):
+        return (
+            'WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: {0}\r\nContent-Type: {1}\r\n'
+            'Content-Length: {2}\r\n\r\n'
+        ).format(url, content_type, len(payload)).encode('ascii') + payload + b'\r\n\r\n'
+
+    def test_iter_paths(self):
+        expected = [
+            {'path': os.path.join(self.directory.name, path), 'url': None, 'data': data, 'saved_tags': saved_tags}
+            for path, _, (data, saved_tags) in self.files
+        ]
+
+        for workers in (1, 2):
+            results = list(files.iter_paths([self.directory.name], self.config, workers=workers, chunksize=1))
+            self.assertEqual(results, expected)
+
+        missing = os.path.join(self.directory.name, 'missing.html')
+        results = list(files.iter_paths([missing], self.config, workers=1))
+
+        self.assertEqual(results[0]['path'], missing)
+        self.assertIn('error', results[0])
+
+        sink = io.StringIO()
+
+        self.assertEqual(files.extract_paths([self.directory.name], sink, 'tsv', config=self.config, workers=1), 3)
+        self.assertEqual(
+            sink.getvalue().splitlines()[0],
+            '{0}\t\tТекст, text.\t{{"title": ["Utf-8"]}}'.format(expected[0]['path'])
+        )
+
+    def test_warc(self):
+        chunked = self.get_page(1).encode('utf-8')
+        chunked = b'%x\r\n%s\r\n%x\r\n%s\r\n0\r\n\r\n' % (10, chunked[:10], len(chunked) - 10, chunked[10:])
+
+        warc = b''.join((
+            self.get_warc_record('http://example.com/0', (
+                'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=windows-1251\r\n\r\n' +
+                self.get_page(0).replace('Text', 'Текст')
+            ).encode('cp1251')),
+            self.get_warc_record('http://example.com/image', b'HTTP/1.1 200 OK\r\nContent-Type: image/png\r\n\r\nPNG'),
+            self.get_warc_record(
+                'http://example.com/1',
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nTransfer-Encoding: chunked\r\n\r\n' + chunked
+            ),
+            self.get_warc_record('http://example.com/2', self.get_page(2).encode('utf-8'), 'text/html'),
+        ))
+
+        path = os.path.join(self.directory.name, 'archive.warc')
+
+        with open(path, 'wb') as file:
+            file.write(warc)
+
+        with gzip.open(path + '.gz', 'wb') as file:
+            file.write(warc)
+
+        sink = io.StringIO()
+        files.extract_paths([path, path + '.gz'], sink, config=self.config, workers=1, warc=True)
+        results = [json.loads(line) for line in sink.getvalue().splitlines()]
+
+        self.assertEqual(
+            [(result['url'], result['data']) for result in results[:3]],
+            [
+                ('http://example.com/0', 'Текст of page 0.'),
+                ('http://example.com/1', 'Text of page 1.'),
+                ('http://example.com/2', 'Text of page 2.')
+            ]
+        )
+        self.assertEqual(
+            [dict(result, path=path) for result in results[3:]],
+            results[:3]
+        )
+
+    def test_warc_gz_stream(self):
+        page = '<html><body><p>Text of page {0}.</p></body></html>'
+        deflate = zlib.compressobj(wbits=-15)
+        records = [
+            self.get_warc_record('http://example.com/0', (
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Encoding: gzip\r\n\r\n' +
+                gzip.compress(page.format(0).encode('utf-8'))
+            )),
+            self.get_warc_record('http://example.com/1', (
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Encoding: br\r\n\r\n\x1b\x00'
+            )),
+            self.get_warc_record('http://example.com/2', (
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Encoding: deflate\r\n\r\n' +
+                deflate.compress(page.format(2).encode('utf-8')) + deflate.flush()
+            )),
+            self.get_warc_record('http://example.com/3', page.format(3).encode('utf-8'), 'text/html')
+        ]
+
+        path = os.path.join(self.directory.name, 'archive.warc.gz')
+
+        # the last record is cut, so the archive can't be decompressed to the end
+        with open(path, 'wb') as file:
+            file.write(b''.join(gzip.compress(record) for record in records)[:-20])
+
+        config = parser.ExtractorConfig()
+        results = files.iter_paths([path], config, workers=1, warc=True)
+
+        self.assertEqual(next(results)['data'], 'Text of page 0.')
+        self.assertEqual(next(results)['data'], 'Text of page 2.')
+        self.assertEqual(next(results)['path'], path)
+        self.assertRaises(StopIteration, next, results)
+
+        results = list(files.iter_paths([path], config, workers=2, chunksize=1, warc=True))
+
+        self.assertEqual([result['url'] for result in results], ['http://example.com/0', 'http://example.com/2', None])
+        self.assertIn('error', results[-1])
+
+
+class TestCli(unittest.TestCase):
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for number in range(2):
+                with open(os.path.join(directory, 'page{0}.html'.format(number)), 'w') as file:
+                    file.write('<html><head><title>Page</title></head><body><p>Text, text.</p></body></html>')
+
+            output = os.path.join(directory, 'results.jsonl')
+            status = cli.main([
+                '--save', 'title', '--remove', 'head', '--min-weight', '0.5', '-j', '2', '-o', output,
+                os.path.join(directory, 'page0.html'), os.path.join(directory, 'page1.html')
+            ])
+
+            with open(output, encoding='utf-8') as file:
+                results = [json.loads(line) for line in file]
+
+            self.assertEqual(status, 0)
+            self.assertEqual(len(results), 2)
+
+            for result in results:
+                self.assertEqual(result['data'], 'Text, text.')
+                self.assertEqual(result['saved_tags'], {'title': ['Page']})
+                self.assertIn('split_time', result['stats'])
+
+            status = cli.main(['--no-stats', '-o', output, os.path.join(directory, 'missing.html')])
+
+            with open(output, encoding='utf-8') as file:
+                self.assertIn('error', json.loads(file.read()))
+
+            self.assertEqual(status, 1)
+
+    def test_list_options_before_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'page.html')
+
+            with open(path, 'w') as file:
+                file.write('<title>Page</title><h1>Header</h1><nav>Menu</nav><p>Text, text.</p>')
+
+            arguments = cli.get_argument_parser().parse_args(['--save', 'title,h1', '--remove', 'nav', path])
+
+            self.assertEqual(arguments.save, ['title', 'h1'])
+            self.assertEqual(arguments.remove, ['nav'])
+            self.assertEqual(arguments.paths, [path])
+
+            output = os.path.join(directory, 'results.jsonl')
+            status = cli.main(['-o', output, '--save', 'title', '--save', 'h1', '--remove', 'title,nav,h1', path])
+
+            with open(output, encoding='utf-8') as file:
+                result = json.loads(file.read())
+
+            self.assertEqual(status, 0)
+            self.assertEqual(result['data'], 'Text, text.')
+            self.assertEqual(result['saved_tags'], {'title': ['Page'], 'h1': ['Header']})
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+
+        # results are found by documents, not by their text: documents have the same text
+        # (and the same title) with different markup
+        self.documents = [
+            '<head><title>Same</title></head><p>Same text.</p>',
+            '<head><title>Same</title></head><div>Same text.</div>',
+            '<head><title>Other</title></head><p>Same text.</p>'
+        ]
+
+    def test_cache_key(self):
+        key = cache.get_cache_key(self.documents[0], self.config)
+
+        self.assertEqual(key, cache.get_cache_key(self.documents[0], self.config.replace(collect_stats=True)))
+        self.assertNotEqual(key, cache.get_cache_key(self.documents[1], self.config))
+        self.assertNotEqual(key, cache.get_cache_key(self.documents[0], self.config.replace(min_allowed_weight=1)))
+        self.assertNotEqual(key, cache.get_cache_key(self.documents[0].encode(), self.config))
+
+    def test_cached_parser(self):
+        html_parser = self.config.build()
+        cached_parser = cache.CachedParser(self.config, cache.ExtractionCache(maxsize=2))
+
+        for document in self.documents + self.documents[::-1]:
+            html_parser.feed(document)
+            cached_parser.feed(document)
+
+            self.assertEqual(cached_parser.result, html_parser.result)
+
+        stats = cached_parser.cache.stats
+
+        # the first document is evicted before it is fed again
+        self.assertFalse(cached_parser.hit)
+        self.assertEqual((stats.hits, stats.misses, stats.evictions), (2, 4, 2))
+        self.assertEqual(len(cached_parser.cache), 2)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            extraction_cache = cache.ExtractionCache(path=path)
+            cache.CachedParser(self.config, extraction_cache).feed(self.documents[0])
+            extraction_cache.close()
+
+            extraction_cache = cache.ExtractionCache(path=path)
+            cached_parser = cache.CachedParser(self.config, extraction_cache)
+            cached_parser.feed(self.documents[0])
+            extraction_cache.close()
+
+            self.assertTrue(cached_parser.hit)
+            self.assertEqual(cached_parser.result, ('Same text.', {'title': ['Same']}))
+            self.assertEqual(extraction_cache.stats.disk_hits, 1)
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+
+        # str and bytes in different encodings, empty documents and not closed elements, which
+        # must not be kept by the parser of a worker for the next document
+        self.documents = [
+            '<head><title>First</title></head><div><p>Not closed paragraph',
+            '<p>Second page.</p>'.encode('utf-8'),
+            '<meta charset="windows-1251"><p>Третья страница.</p>'.encode('cp1251'),
+            '',
+            '<head><title>Fifth</title></head><ul><li>One<li>Two</ul>'
+        ] * 2
+        self.results = [
+            ('Not closed paragraph', {'title': ['First']}),
+            ('Second page.', {}),
+            ('Третья страница.', {}),
+            ('', {}),
+            ('One Two', {'title': ['Fifth']})
+        ] * 2
+
+    def test_parse_many(self):
+        for workers in (1, 2):
+            results = list(batch.parse_many(self.documents, self.config, workers=workers, chunksize=3))
+            self.assertEqual(results, self.results)
+
+        results = batch.parse_many(self.documents, workers=2, ordered=False, **self.config.as_dict())
+        self.assertEqual(sorted(results), list(enumerate(self.results)))
+
+        # every document is parsed separately by incremental parser too
+        config = self.config.replace(incremental=True)
+        self.assertEqual(list(batch.parse_many(self.documents, config, workers=1)), self.results)
+
+    def test_interleaved_generators(self):
+        documents = ['<h1>Header {0}</h1><p>Text of page {0}.</p>'.format(number) for number in range(4)]
+        save_results = batch.parse_many(documents, workers=1, tags_to_save={'h1'}, tags_to_remove={'h1'})
+        remove_results = batch.parse_many(documents, workers=1, tags_to_remove={'h1', 'p'}, ordered=False)
+
+        # every generator parses its documents with its own configuration
+        for number, (save_result, remove_result) in enumerate(zip(save_results, remove_results)):
+            self.assertEqual(save_result, ('Text of page {0}.'.format(number), {'h1': ['Header {0}'.format(number)]}))
+            self.assertEqual(remove_result, (number, ('', {})))
+
+
+class TestParserPool(unittest.TestCase):
+    def setUp(self):
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+
+        # elements of every second document are not closed, they must not be kept by the parser
+        # when it is returned to the pool
+        self.documents = [
+            '<head><title>Page {0}</title></head><div><p>Text of page {0}.{1}'.format(
+                number, '</p></div>' if number % 2 else ''
+            )
+            for number in range(50)
+        ]
+        self.results = [
+            ('Text of page {0}.'.format(number), {'title': ['Page {0}'.format(number)]})
+            for number in range(50)
+        ]
+
+    def test_extract_in_threads(self):
+        parser_pool = pool.ParserPool(self.config, size=2)
+        results = {}
+
+        def extract(numbers):
+            for number in numbers:
+                results[number] = parser_pool.extract(self.documents[number])
+
+        threads = [threading.Thread(target=extract, args=(range(start, 50, 5),)) for start in range(5)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([results[number] for number in range(50)], self.results)
+
+    def test_checkout(self):
+        parser_pool = pool.ParserPool(self.config, size=1)
+
+        with parser_pool.parser() as first_parser:
+            with parser_pool.parser() as second_parser:
+                with parser_pool.parser() as third_parser:
+                    self.assertEqual(len({id(first_parser), id(second_parser), id(third_parser)}), 3)
+
+        self.assertEqual(parser_pool._parsers.qsize(), 1)
+
+        with parser_pool.parser() as html_parser:
+            self.assertIsNot(html_parser, second_parser)
+
+        blocking_pool = pool.ParserPool(self.config, size=1, block=True, timeout=0.01)
+
+        with blocking_pool.parser():
+            self.assertRaises(pool.queue.Empty, blocking_pool.checkout)
+
+    def test_incremental_config(self):
+        parser_pool = pool.ParserPool(self.config.replace(incremental=True), size=1)
+
+        for number in range(2):
+            # the last paragraph is finished only when the document is closed
+            self.assertEqual(
+                parser_pool.extract(self.documents[number]),
+                self.results[number]
+            )
+
+
+class TestAsyncExtractor(unittest.TestCase):
+    def setUp(self):
+        self.config = parser.ExtractorConfig(tags_to_save={'title'}, tags_to_remove={'head'})
+
+        # characters of two bytes are split between parts of streams
+        self.documents = [
+            '<head><title>Страница {0}</title></head><p>Текст страницы {0}.</p>'.format(number)
+            for number in range(10)
+        ]
+        self.results = [
+            ('Текст страницы {0}.'.format(number), {'title': ['Страница {0}'.format(number)]})
+            for number in range(10)
+        ]
+
+    def test_extract(self):
+        async def extract_all(extractor):
+            return await asyncio.gather(*(extractor.extract(document) for document in self.documents))
+
+        with futures.ThreadPoolExecutor(2) as executor:
+            extractor = aio.AsyncExtractor(self.config, executor=executor, max_concurrency=3)
+            self.assertEqual(asyncio.run(extract_all(extractor)), self.results)
+
+        with futures.ProcessPoolExecutor(2) as executor:
+            extractor = aio.AsyncExtractor(self.config, executor=executor)
+            self.assertEqual(asyncio.run(extract_all(extractor)), self.results)
+
+        self.assertEqual(asyncio.run(aio.extract(self.documents[0], self.config)), self.results[0])
+
+        async def extract_one_by_one(config, executor):
+            return [await aio.extract(document, config, executor) for document in self.documents[:2]]
+
+        # both documents are parsed by the parser of one thread
+        with futures.ThreadPoolExecutor(1) as executor:
+            config = self.config.replace(incremental=True)
+            self.assertEqual(asyncio.run(extract_one_by_one(config, executor)), self.results[:2])
+
+    def test_extract_stream(self):
+        async def stream(document):
+            document = document.encode('utf-8')
+
+            for index in range(0, len(document), 7):
+                await asyncio.sleep(0)
+                yield document[index:index + 7]
+
+        async def extract_all(extractor):
+            return await asyncio.gather(*(extractor.extract_stream(stream(document)) for document in self.documents))
+
+        extractor = aio.AsyncExtractor(self.config, max_concurrency=2)
+        self.assertEqual(asyncio.run(extract_all(extractor)), self.results)
+
+        with futures.ProcessPoolExecutor(2) as executor:
+            extractor = aio.AsyncExtractor(self.config, executor=executor)
+            self.assertEqual(asyncio.run(extract_all(extractor)), self.results)
+
+    def test_extract_stream_cancelled(self):
+        started = threading.Event()
+        finish = threading.Event()
+        feed = parser.Parser.feed
+
+        def slow_feed(parser, html_document, *args, **kwargs):
+            started.set()
+            finish.wait(5)
+
+            return feed(parser, html_document, *args, **kwargs)
+
+        async def stream(*parts):
+            for part in parts:
+                yield part
+
+        async def cancel_and_extract(extractor):
+            task = asyncio.ensure_future(extractor.extract_stream(stream('<p>Removed, text.', '</p>')))
+
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # the first part is still fed to the parser of the cancelled document
+            finish.set()
+
+            return await extractor.extract_stream(stream('<p>Text, ', 'text.</p>'))
+
+        with futures.ThreadPoolExecutor(1) as executor:
+            extractor = aio.AsyncExtractor(parser.ExtractorConfig(), executor=executor, max_concurrency=1)
+
+            with mock.patch.object(parser.Parser, 'feed', slow_feed):
+                self.assertEqual(asyncio.run(cancel_and_extract(extractor)), ('Text, text.', {}))
+
+    def test_local_parsers(self):
+        configs = [
+            parser.ExtractorConfig(min_allowed_weight=number / 100) for number in range(aio.MAX_LOCAL_PARSERS + 2)
+        ]
+
+        for config in configs:
+            self.assertEqual(aio._extract(config, '<p>Text, text.</p>'), ('Text, text.', {}))
+
+        self.assertEqual(list(aio._local.parsers), configs[2:])
+
 
 class TestFunctions(unittest.TestCase):
     def test_normalize_string(self):